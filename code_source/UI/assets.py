@@ -0,0 +1,86 @@
+"""
+Gestionnaire des images de l'interface (fond, anneaux des places, icônes).
+
+- Chaque image n'est décodée qu'au premier usage, puis gardée en mémoire :
+  le fond et les anneaux partagés entre l'accueil, le canvas et la barre d'outils
+  ne sont plus chargés plusieurs fois.
+- Les images redimensionnées (fond plein écran) sont écrites une fois pour toutes
+  dans un cache disque : aux lancements suivants le PNG à la bonne taille est lu
+  directement par Tk, sans importer PIL ni refaire le redimensionnement.
+
+PIL n'est importé que s'il faut produire une nouvelle version redimensionnée.
+Sans PIL, l'image d'origine est utilisée telle quelle.
+"""
+
+import os
+import tkinter as tk
+
+
+ASSET_DIR = os.path.dirname(__file__)
+
+# Dossier du cache disque (modifiable avec la variable d'environnement PETRI_ASSET_CACHE)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "petri_editor")
+
+
+class AssetManager:
+    def __init__(self, asset_dir=ASSET_DIR, cache_dir=None):
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir or os.environ.get("PETRI_ASSET_CACHE", DEFAULT_CACHE_DIR)
+        self.images = {}   # (nom, taille ou None) -> PhotoImage (références gardées contre le GC)
+
+    def path(self, filename):
+        return os.path.join(self.asset_dir, filename)
+
+    def photo(self, filename):
+        """Image telle quelle (chargée au premier appel)."""
+        key = (filename, None)
+        if key not in self.images:
+            self.images[key] = tk.PhotoImage(file=self.path(filename))
+        return self.images[key]
+
+    def scaled(self, filename, width, height):
+        """Image redimensionnée à width x height, via le cache disque."""
+        key = (filename, (width, height))
+        if key not in self.images:
+            cached = self._cached_path(filename, width, height)
+            if not os.path.exists(cached) and not self._build_scaled(filename, width, height, cached):
+                # Pas de PIL (ou cache non inscriptible) : image d'origine
+                return self.photo(filename)
+            self.images[key] = tk.PhotoImage(file=cached)
+        return self.images[key]
+
+    #Nom du fichier en cache : dépend de la taille demandée et de la version du fichier source.
+    def _cached_path(self, filename, width, height):
+        stat = os.stat(self.path(filename))
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(
+            self.cache_dir, f"{stem}_{width}x{height}_{stat.st_mtime_ns:x}_{stat.st_size:x}.png"
+        )
+
+    def _build_scaled(self, filename, width, height, cached):
+        try:
+            from PIL import Image
+        except ImportError:
+            return False
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with Image.open(self.path(filename)) as img:
+                resized = img.resize((width, height))
+            # Écriture atomique : un autre lancement ne lit jamais un PNG à moitié écrit
+            tmp = f"{cached}.{os.getpid()}.tmp"
+            resized.save(tmp, format="PNG")
+            os.replace(tmp, cached)
+        except OSError:
+            return False
+        return True
+
+
+_assets = None
+
+
+#Gestionnaire partagé par toute l'application (créé au premier appel).
+def get_assets():
+    global _assets
+    if _assets is None:
+        _assets = AssetManager()
+    return _assets
@@ -7,45 +7,50 @@ Pour l'instant :
 - dessine des arcs (flèches) en reliant deux éléments,
 - permet d'effacer un élément.
 
+Les positions des nœuds et les segments des arcs sont rangés dans un index
+spatial (UI/spatial_index.py) : le clic, la gomme et l'édition d'un arc
+retrouvent l'élément visé sans parcourir tout le dessin.
+
 """
 
 import tkinter as tk
 from tkinter import simpledialog
-import os
+import math
+import time
 from backend.petri import Place, Transition, Arc  # pour créer les objets backend
+from backend.petri import Simulation
+from UI.spatial_index import SpatialIndex
+from UI.assets import get_assets
+
+
+# Géométrie des nœuds (utilisée pour le dessin et le hit-testing)
+PLACE_RADIUS = 20
+TRANS_HALF_WIDTH = 5
+TRANS_HALF_HEIGHT = 25
+HIT_TOLERANCE = 4      # marge (en pixels) acceptée autour d'un nœud ou d'un arc
+
+# Images possibles pour les places (anneaux de couleur), utilisées à tour de rôle
+PLACE_IMAGES = [
+    "pl_vert.png",
+    "pl_jaune.png",
+    "pl_rouge.png",
+    "pl_marron.png",
+    "pl_orange.png",
+    "pl_bleu.png",
+    "pl_violet.png",
+]
 
 
 class PetriCanvas(tk.Canvas):
     def __init__(self, master, model):
         super().__init__(master, width=800, height=600, bg="white")
 
-        # Images possibles pour les places (anneaux de couleur)
-        script_dir = os.path.dirname(__file__)
-        self.place_images = []
-        for filename in [
-            "pl_vert.png",
-            "pl_jaune.png",
-            "pl_rouge.png",
-            "pl_marron.png",
-            "pl_orange.png",
-            "pl_bleu.png",
-            "pl_violet.png",
-        ]:
-            path = os.path.join(script_dir, filename)
-            self.place_images.append(tk.PhotoImage(file=path))
-
+        # Images chargées à la demande et partagées (UI/assets.py)
+        self.assets = get_assets()
         self.next_place_img_index = 0
 
-
-        # Image de fond façon billard (réduite)
-        base_image = tk.PhotoImage(file="code_source/UI/FondBillard.png")
-        # Réduction de l'image ( on elargie puis on divise pour avoir un ration de 1.5)
-        #enlarged = base_image.zoom(3, 3)
-        #self.bg_image = enlarged.subsample(2, 2)
-
-        # Taille fixe ( ce qu'on utilise actuellement)
-        self.bg_image = tk.PhotoImage(file="code_source/UI/FondBillard.png")
-
+        # Image de fond façon billard (taille fixe)
+        self.bg_image = self.assets.photo("FondBillard.png")
         self.bg_item = self.create_image(0, 0, image=self.bg_image, anchor="nw", tags=("background",))
 
 
@@ -71,11 +76,30 @@ class PetriCanvas(tk.Canvas):
                 
         self.transition_rects = {}   # item rectangle
 
+        # Index spatial des nœuds et des arcs
+        self.node_index = SpatialIndex()
+        self.arc_index = SpatialIndex()
+        self.node_geom = {}       # ID logique -> (x, y, "place" | "transition")
+        self.arc_coords = {}      # (src_id, tgt_id) -> (x1, y1, x2, y2) du segment
+        self.item_to_arc = {}     # id de la ligne ou du texte -> (src_id, tgt_id)
+        self.node_arcs = {}       # ID logique -> set des (src_id, tgt_id) incidents
+
 
 
         # État pour la simulation continue
         self.simulating = False      # True si le mode auto est en cours
         self.sim_delay = 500         # délai en ms entre deux tirs
+        self.sim_policy = "first"    # first / random / round_robin / priority
+
+        # Mode turbo : plusieurs tirs par image, redessin limité à max_fps
+        self.turbo = False
+        self.firings_per_frame = 1000
+        self.max_fps = 30
+        self.simulation = None       # objet Simulation du backend en cours
+        self.sim_started_at = 0.0
+        self.sim_stats_item = self.create_text(
+            10, 10, text="", anchor="nw", fill="white", font=("Arial", 10, "bold")
+        )
 
 
         self.bind("<Button-1>", self.on_click)
@@ -115,6 +139,86 @@ class PetriCanvas(tk.Canvas):
         return str(n)
 
 
+    # Index spatial : enregistrement et recherche des éléments
+
+    def _register_node(self, node_id, x, y, kind):
+        self.node_geom[node_id] = (x, y, kind)
+        self.node_arcs.setdefault(node_id, set())
+        if kind == "place":
+            hw, hh = PLACE_RADIUS, PLACE_RADIUS
+        else:
+            hw, hh = TRANS_HALF_WIDTH, TRANS_HALF_HEIGHT
+        self.node_index.insert(node_id, x - hw, y - hh, x + hw, y + hh)
+
+    def _unregister_node(self, node_id):
+        self.node_index.remove(node_id)
+        self.node_geom.pop(node_id, None)
+        self.node_arcs.pop(node_id, None)
+
+    def _register_arc(self, key, coords, line_id):
+        src_id, tgt_id = key
+        self.arc_items[key] = line_id
+        self.arc_coords[key] = coords
+        self.item_to_arc[line_id] = key
+        self.node_arcs.setdefault(src_id, set()).add(key)
+        self.node_arcs.setdefault(tgt_id, set()).add(key)
+        self.arc_index.insert(key, *coords)
+
+    def _unregister_arc(self, key):
+        """Supprime les items graphiques d'un arc et le retire des index."""
+        src_id, tgt_id = key
+        line_id = self.arc_items.pop(key, None)
+        if line_id is not None:
+            self.item_to_arc.pop(line_id, None)
+            self.delete(line_id)
+        text_id = self.arc_text_items.pop(key, None)
+        if text_id is not None:
+            self.item_to_arc.pop(text_id, None)
+            self.delete(text_id)
+        self.arc_coords.pop(key, None)
+        self.arc_index.remove(key)
+        self.node_arcs.get(src_id, set()).discard(key)
+        self.node_arcs.get(tgt_id, set()).discard(key)
+
+    def node_at(self, x, y):
+        """Renvoie l'ID logique du nœud (place ou transition) sous le point, ou None."""
+        best_id = None
+        best_dist = None
+        for node_id in self.node_index.query(x, y, HIT_TOLERANCE):
+            nx, ny, kind = self.node_geom[node_id]
+            if kind == "place":
+                dist = max(math.hypot(x - nx, y - ny) - PLACE_RADIUS, 0)
+            else:
+                dx = max(abs(x - nx) - TRANS_HALF_WIDTH, 0)
+                dy = max(abs(y - ny) - TRANS_HALF_HEIGHT, 0)
+                dist = math.hypot(dx, dy)
+            # à distance égale (nœuds superposés), on garde le centre le plus proche
+            center = math.hypot(x - nx, y - ny)
+            if dist <= HIT_TOLERANCE and (best_dist is None or (dist, center) < best_dist):
+                best_id = node_id
+                best_dist = (dist, center)
+        return best_id
+
+    def arc_at(self, x, y):
+        """Renvoie la clé (src_id, tgt_id) de l'arc le plus proche du point, ou None."""
+        best_key = None
+        best_dist = None
+        for key in self.arc_index.query(x, y, HIT_TOLERANCE):
+            x1, y1, x2, y2 = self.arc_coords[key]
+            dx = x2 - x1
+            dy = y2 - y1
+            length2 = dx * dx + dy * dy
+            if length2 == 0:
+                u = 0.0
+            else:
+                u = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length2))
+            dist = math.hypot(x - (x1 + u * dx), y - (y1 + u * dy))
+            if dist <= HIT_TOLERANCE and (best_dist is None or dist < best_dist):
+                best_key = key
+                best_dist = dist
+        return best_key
+
+
 
     def create_place(self, x, y):
         tokens = simpledialog.askinteger(
@@ -145,10 +249,10 @@ class PetriCanvas(tk.Canvas):
         place_obj = Place(id=place_id, name=place_id, initial_tokens=tokens)
         self.model.add_place(place_obj)
 
-        r = 20  # position du texte
+        r = PLACE_RADIUS  # position du texte
         # Image de la place (anneau de couleur), centrée en (x, y)
-        img = self.place_images[self.next_place_img_index]
-        self.next_place_img_index = (self.next_place_img_index + 1) % len(self.place_images)
+        img = self.assets.photo(PLACE_IMAGES[self.next_place_img_index])
+        self.next_place_img_index = (self.next_place_img_index + 1) % len(PLACE_IMAGES)
         place_item = self.create_image(x, y, image=img)
 
         # Nom de la place au-dessus de l'image
@@ -167,6 +271,7 @@ class PetriCanvas(tk.Canvas):
         self.item_to_id[name_item] = place_id
         self.item_to_id[tokens_item] = place_id
         self.id_to_items[place_id] = {place_item, name_item, tokens_item}
+        self._register_node(place_id, x, y, "place")
 
     def create_transition(self, x, y):
 
@@ -192,7 +297,11 @@ class PetriCanvas(tk.Canvas):
         self.model.add_transition(trans_obj)
 
         # Dessin graphique
-        trans_item = self.create_rectangle(x-5, y-25, x+5, y+25, fill="black")
+        trans_item = self.create_rectangle(
+            x - TRANS_HALF_WIDTH, y - TRANS_HALF_HEIGHT,
+            x + TRANS_HALF_WIDTH, y + TRANS_HALF_HEIGHT,
+            fill="black",
+        )
         text_item = self.create_text(x, y-35, text=trans_id)  # texte au-dessus
         
 
@@ -200,6 +309,7 @@ class PetriCanvas(tk.Canvas):
         self.item_to_id[trans_item] = trans_id
         self.item_to_id[text_item] = trans_id
         self.id_to_items[trans_id] = {trans_item, text_item}
+        self._register_node(trans_id, x, y, "transition")
         
         # mémoriser le rectangle pour pouvoir changer sa couleur
         self.transition_rects[trans_id] = trans_item
@@ -244,15 +354,9 @@ class PetriCanvas(tk.Canvas):
 
 
     def fire_transition_at(self, x, y):
-        # On récupère l'item le plus proche du clic
-        items = self.find_closest(x, y)
-        if not items:
-            return
-        item = items[0]
-
-        # On regarde si c'est une transition connue du backend
-        trans_id = self.item_to_id.get(item)
-        if trans_id is None:
+        # On regarde si le clic tombe sur une transition connue du backend
+        trans_id = self.node_at(x, y)
+        if trans_id is None or trans_id not in self.model.transitions:
             return
 
         # On travaille sur une copie du marquage courant
@@ -277,53 +381,75 @@ class PetriCanvas(tk.Canvas):
             self.simulating = False
         else:
             self.simulating = True
+            # Le backend simule à partir du marquage affiché
+            self.simulation = Simulation(
+                self.model, dict(self.current_marking), policy=self.sim_policy
+            )
+            self.sim_started_at = time.perf_counter()
             self.auto_step()   # lance la première étape
 
+    def set_turbo(self, enabled):
+        self.turbo = bool(enabled)
+
+    def set_sim_policy(self, policy):
+        self.sim_policy = policy
+        if self.simulation is not None and self.simulating:
+            self.simulation = Simulation(
+                self.model, self.simulation.marking, policy=policy
+            )
+
     def auto_step(self):
-        """Effectue un tir automatique puis planifie le suivant."""
+        """Effectue un lot de tirs automatiques, redessine, puis planifie le suivant."""
         if not self.simulating:
             return
 
-        # On travaille sur une copie du marquage courant
-        marking = dict(self.current_marking)
+        frame_start = time.perf_counter()
+        sim = self.simulation
+
+        # Mode normal : un tir par pas ; mode turbo : un lot de tirs par image
+        n = self.firings_per_frame if self.turbo else 1
+        sim.run(n)
 
-        # Liste des transitions franchissables dans ce marquage
-        enabled_transitions = [
-            t_id for t_id in self.model.transitions.keys()
-            if self.model.enabled(t_id, marking)
-        ]
+        # Mise à jour de l'affichage (une seule fois pour tout le lot)
+        self.update_marking(sim.marking)
+        self.update_sim_stats()
 
-        if not enabled_transitions:
+        if sim.deadlocked:
             # Plus aucune transition possible : on arrête la simulation
-            print("Simulation auto : aucune transition franchissable, arrêt.")
+            print(f"Simulation auto : aucune transition franchissable, arrêt après {sim.steps} tirs.")
             self.simulating = False
             return
 
-        # Choix simple : on tire la première transition franchissable
-        trans_id = enabled_transitions[0]
-        print(f"Simulation auto : tir de {trans_id}")
-
-        # Tir dans le backend
-        new_marking = self.model.fire(trans_id, marking)
-
-        # Mise à jour de l'affichage
-        self.update_marking(new_marking)
-
-        # On planifie l'étape suivante après sim_delay ms
-        self.after(self.sim_delay, self.auto_step)
+        # On planifie l'étape suivante
+        if self.turbo:
+            frame_ms = 1000 / self.max_fps
+            elapsed_ms = (time.perf_counter() - frame_start) * 1000
+            delay = max(1, int(frame_ms - elapsed_ms))
+        else:
+            delay = self.sim_delay
+        self.after(delay, self.auto_step)
+
+    def update_sim_stats(self):
+        """Affiche le nombre de tirs et le débit (tirs/s) de la simulation en cours."""
+        sim = self.simulation
+        if sim is None:
+            self.itemconfig(self.sim_stats_item, text="")
+            return
+        elapsed = time.perf_counter() - self.sim_started_at
+        rate = sim.steps / elapsed if elapsed > 0 else 0.0
+        self.itemconfig(
+            self.sim_stats_item,
+            text=f"Tirs : {sim.steps}   ({rate:,.0f} tirs/s, {sim.policy})".replace(",", " "),
+        )
+        self.tag_raise(self.sim_stats_item)
 
 
 
     def handle_arc(self, x, y):
-        items = self.find_closest(x, y)
-        if not items:
-            return
-        clicked_item = items[0]
-
-        # On récupère l'ID logique (place_id ou trans_id) associé à l'item cliqué
-        logical_id = self.item_to_id.get(clicked_item)
+        # On récupère l'ID logique (place_id ou trans_id) du nœud cliqué
+        logical_id = self.node_at(x, y)
         if logical_id is None:
-            # On ne sait pas à quoi correspond cet item, on annule
+            # Clic dans le vide : on annule
             self.arc_start = None
             return
 
@@ -337,14 +463,8 @@ class PetriCanvas(tk.Canvas):
         tgt_id = logical_id
 
         # Empêcher les doublons simples (même source, même cible)
-        for a in self.model.arcs:
-            if a.source_id == src_id and a.target_id == tgt_id:
-                print("Arc doublon ignoré entre", src_id, "et", tgt_id)
-                self.arc_start = None
-                return
-
-        # Vérif de validité des IDs
-        if src_id is None or tgt_id is None:
+        if self.model.get_arc(src_id, tgt_id) is not None:
+            print("Arc doublon ignoré entre", src_id, "et", tgt_id)
             self.arc_start = None
             return
 
@@ -357,44 +477,9 @@ class PetriCanvas(tk.Canvas):
             self.arc_start = None
             return
 
-        # Dessin graphique : on relie les centres des formes principales
-        src_items = self.id_to_items.get(src_id, set())
-        tgt_items = self.id_to_items.get(tgt_id, set())
-
-        if not src_items or not tgt_items:
-            self.arc_start = None
-            return
-
-        def pick_main_item(items):
-            # On choisit en priorité ovales et rectangles, sinon n'importe quoi
-            for it in items:
-                t = self.type(it)
-                if t in ("oval", "rectangle"):
-                    return it
-            return next(iter(items))
-
-        src_item = pick_main_item(src_items)
-        tgt_item = pick_main_item(tgt_items)
-
-        src_coords = self.coords(src_item)
-        tgt_coords = self.coords(tgt_item)
-
-        # src_coords / tgt_coords peuvent être (x, y) ou (x1, y1, x2, y2)
-        if len(src_coords) == 2:
-            sx, sy = src_coords
-        else:
-            x1, y1, x2, y2 = src_coords
-            sx = (x1 + x2) / 2
-            sy = (y1 + y2) / 2
-
-        if len(tgt_coords) == 2:
-            tx, ty = tgt_coords
-        else:
-            x1, y1, x2, y2 = tgt_coords
-            tx = (x1 + x2) / 2
-            ty = (y1 + y2) / 2
-
-        import math
+        # Dessin graphique : on relie les centres des deux nœuds
+        sx, sy, src_kind = self.node_geom[src_id]
+        tx, ty, tgt_kind = self.node_geom[tgt_id]
 
         dx = tx - sx
         dy = ty - sy
@@ -406,27 +491,26 @@ class PetriCanvas(tk.Canvas):
         ux = dx / dist
         uy = dy / dist
 
-        PLACE_RADIUS = 20
-        TRANS_HALF_WIDTH = 5
-
-        def adjust_endpoint(x, y, node_id, direction):
-            if node_id in self.model.places:
+        def adjust_endpoint(x, y, kind, direction):
+            if kind == "place":
                 r = PLACE_RADIUS
             else:
                 r = TRANS_HALF_WIDTH
             return x + direction * ux * r, y + direction * uy * r
 
-        sx2, sy2 = adjust_endpoint(sx, sy, src_id, +1)
-        tx2, ty2 = adjust_endpoint(tx, ty, tgt_id, -1)
+        sx2, sy2 = adjust_endpoint(sx, sy, src_kind, +1)
+        tx2, ty2 = adjust_endpoint(tx, ty, tgt_kind, -1)
 
+        key = (src_id, tgt_id)
         line_id = self.create_line(sx2, sy2, tx2, ty2, arrow=tk.LAST, tags=("arc",))
-        self.arc_items[(src_id, tgt_id)] = line_id
+        self._register_arc(key, (sx2, sy2, tx2, ty2), line_id)
 
         if arc_obj.weight != 1:
             mx = (sx2 + tx2) / 2
             my = (sy2 + ty2) / 2
             text_id = self.create_text(mx, my - 10, text=str(arc_obj.weight), fill="white")
-            self.arc_text_items[(src_id, tgt_id)] = text_id
+            self.arc_text_items[key] = text_id
+            self.item_to_arc[text_id] = key
 
         # On réinitialise pour le prochain arc
         self.arc_start = None
@@ -435,69 +519,48 @@ class PetriCanvas(tk.Canvas):
 
         
     def erase(self, x, y):
-        items = self.find_closest(x, y)
-        if not items:
+        # CAS 1 : on clique sur une place ou une transition
+        logical_id = self.node_at(x, y)
+        if logical_id is not None:
+            self.erase_node(logical_id)
             return
-        item = items[0]
 
-        # Ne jamais supprimer l'image de fond
-        if item == self.bg_item or "background" in self.gettags(item):
-            return
-
-
-        logical_id = self.item_to_id.get(item)
-
-        # CAS 1 : on clique sur une ligne d'arc (pas d'ID logique enregistré)
-        if logical_id is None:
-            # On supprime l'item graphique
-            coords = self.coords(item)
-            self.delete(item)
-
-            # Si on a bien une ligne (4 coordonnées), on retrouve les nœuds aux extrémités
-            if len(coords) == 4:
-                x1, y1, x2, y2 = coords
-
-                start_items = self.find_closest(x1, y1)
-                end_items = self.find_closest(x2, y2)
+        # CAS 2 : on clique sur un arc
+        key = self.arc_at(x, y)
+        if key is not None:
+            self.erase_arc(key)
 
-                if start_items and end_items:
-                    start_id = self.item_to_id.get(start_items[0])
-                    end_id = self.item_to_id.get(end_items[0])
+    def erase_arc(self, key):
+        """Supprime un arc (graphique + backend) à partir de sa clé (src_id, tgt_id)."""
+        self._unregister_arc(key)
+        if self.model.get_arc(*key) is not None:
+            self.model.remove_arc(*key)
+        self.update_transition_colors()
 
-                    if start_id is not None and end_id is not None:
-                        # On enlève du backend tous les arcs qui relient exactement ces deux IDs
-                        self.model.arcs = [
-                            a for a in self.model.arcs
-                            if not (a.source_id == start_id and a.target_id == end_id)
-                        ]
-            return
+    def erase_node(self, logical_id):
+        """Supprime une place ou une transition, ses arcs incidents et ses items graphiques."""
+        # Arcs incidents : retrouvés directement grâce à node_arcs
+        for key in list(self.node_arcs.get(logical_id, ())):
+            self._unregister_arc(key)
 
-        # CAS 2 : on clique sur une place ou une transition (avec ID logique)
+        # Le backend retire lui-même les arcs incidents
         if logical_id in self.model.places:
-            # supprimer la place et tous les arcs incidents
-            del self.model.places[logical_id]
-            self.model.arcs = [
-                a for a in self.model.arcs
-                if a.source_id != logical_id and a.target_id != logical_id
-            ]
+            self.model.remove_place(logical_id)
         elif logical_id in self.model.transitions:
-            # supprimer la transition et tous les arcs incidents
-            del self.model.transitions[logical_id]
-            self.model.arcs = [
-                a for a in self.model.arcs
-                if a.source_id != logical_id and a.target_id != logical_id
-            ]
+            self.model.remove_transition(logical_id)
 
         # Suppression des items graphiques liés à l'ID
-        items_to_delete = self.id_to_items.get(logical_id, set())
+        items_to_delete = self.id_to_items.pop(logical_id, set())
         for it in items_to_delete:
-            if it in self.item_to_id:
-                del self.item_to_id[it]
+            self.item_to_id.pop(it, None)
             self.delete(it)
 
         # On nettoie les maps
-        if logical_id in self.id_to_items:
-            del self.id_to_items[logical_id]
+        self._unregister_node(logical_id)
+        self.place_token_text.pop(logical_id, None)
+        self.current_marking.pop(logical_id, None)
+        self.transition_rects.pop(logical_id, None)
+        self.update_transition_colors()
 
 
 
@@ -508,22 +571,14 @@ class PetriCanvas(tk.Canvas):
         line_id = item[0]
 
         # retrouver src_id, tgt_id correspondant à cette ligne
-        src_tgt = None
-        for key, lid in self.arc_items.items():
-            if lid == line_id:
-                src_tgt = key
-                break
+        src_tgt = self.item_to_arc.get(line_id)
         if src_tgt is None:
             return
 
         src_id, tgt_id = src_tgt
 
         # retrouver l'objet Arc du backend
-        arc_obj = None
-        for a in self.model.arcs:
-            if a.source_id == src_id and a.target_id == tgt_id:
-                arc_obj = a
-                break
+        arc_obj = self.model.get_arc(src_id, tgt_id)
         if arc_obj is None:
             return
 
@@ -536,27 +591,28 @@ class PetriCanvas(tk.Canvas):
         if new_w is None:
             return
 
-        arc_obj.weight = new_w
+        self.model.set_arc_weight(src_id, tgt_id, new_w)
 
         # mettre à jour le texte
         # recalculer la position milieu de la ligne
-        x1, y1, x2, y2 = self.coords(line_id)
+        x1, y1, x2, y2 = self.arc_coords[src_tgt]
         mx = (x1 + x2) / 2
         my = (y1 + y2) / 2
 
         # supprimer l'ancien texte s'il existe
         key = (src_id, tgt_id)
-        old_text_id = self.arc_text_items.get(key)
+        old_text_id = self.arc_text_items.pop(key, None)
         if old_text_id is not None:
+            self.item_to_arc.pop(old_text_id, None)
             self.delete(old_text_id)
 
         # ne rien afficher si poids == 1
         if new_w != 1:
             text_id = self.create_text(mx, my - 10, text=str(new_w), fill="white")
             self.arc_text_items[key] = text_id
-        else:
-            if key in self.arc_text_items:
-                del self.arc_text_items[key]
+            self.item_to_arc[text_id] = key
+
+        self.update_transition_colors()
 
 
     def reset_marking(self):
@@ -564,6 +620,10 @@ class PetriCanvas(tk.Canvas):
         initial = self.model.initial_marking()
         # met aussi à jour le marquage courant stocké dans le canvas
         self.update_marking(initial)
+        # une simulation en cours repart du marquage initial
+        if self.simulating:
+            self.simulation = Simulation(self.model, initial, policy=self.sim_policy)
+            self.sim_started_at = time.perf_counter()
 
 
     def clear_all(self):
@@ -582,16 +642,29 @@ class PetriCanvas(tk.Canvas):
         self.place_token_text = {}
         self.current_marking = {}
         self.arc_start = None
+        self.arc_items = {}
+        self.arc_text_items = {}
+        self.transition_rects = {}
+
+        # Index spatial et tables d'incidence
+        self.node_index.clear()
+        self.arc_index.clear()
+        self.node_geom = {}
+        self.arc_coords = {}
+        self.item_to_arc = {}
+        self.node_arcs = {}
 
         # 3) Réinitialiser les compteurs
         self.place_count = 0
         self.transition_count = 0
 
         # 4) Réinitialiser le backend (PetriNet)
-        self.model.places.clear()
-        self.model.transitions.clear()
-        self.model.arcs.clear()
+        self.model.clear()
 
         # 5) Arrêter une éventuelle simulation auto
         self.simulating = False
+        self.simulation = None
+        self.sim_stats_item = self.create_text(
+            10, 10, text="", anchor="nw", fill="white", font=("Arial", 10, "bold")
+        )
 
@@ -0,0 +1,71 @@
+"""
+Index spatial pour le canvas (grille uniforme / hachage spatial).
+
+Chaque élément est enregistré avec sa boîte englobante (x1, y1, x2, y2) dans
+toutes les cellules de la grille qu'elle recouvre. Une requête autour d'un
+point ne regarde que les quelques cellules voisines : le coût ne dépend plus
+du nombre total d'éléments dessinés, seulement de la densité locale.
+
+Le module ne dépend pas de tkinter, il ne manipule que des coordonnées.
+"""
+
+import math
+
+
+class SpatialIndex:
+    def __init__(self, cell_size=64):
+        if cell_size <= 0:
+            raise ValueError("cell_size doit être > 0")
+        self.cell_size = cell_size
+        self.cells = {}      # (cx, cy) -> set de clés
+        self.bounds = {}     # clé -> (x1, y1, x2, y2)
+        self.key_cells = {}  # clé -> liste des cellules occupées
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _cells_for(self, x1, y1, x2, y2):
+        cx1, cy1 = self._cell(min(x1, x2), min(y1, y2))
+        cx2, cy2 = self._cell(max(x1, x2), max(y1, y2))
+        return [(cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1)]
+
+    def insert(self, key, x1, y1, x2, y2):
+        """Ajoute (ou replace) un élément avec sa boîte englobante."""
+        if key in self.bounds:
+            self.remove(key)
+        cells = self._cells_for(x1, y1, x2, y2)
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(key)
+        self.bounds[key] = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        self.key_cells[key] = cells
+
+    def remove(self, key):
+        """Retire un élément (sans erreur s'il n'est pas indexé)."""
+        for cell in self.key_cells.pop(key, []):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[cell]
+        self.bounds.pop(key, None)
+
+    def query(self, x, y, radius=0):
+        """Renvoie les clés dont la boîte englobante est à moins de radius du point."""
+        found = set()
+        for cell in self._cells_for(x - radius, y - radius, x + radius, y + radius):
+            for key in self.cells.get(cell, ()):
+                x1, y1, x2, y2 = self.bounds[key]
+                if x1 - radius <= x <= x2 + radius and y1 - radius <= y <= y2 + radius:
+                    found.add(key)
+        return found
+
+    def clear(self):
+        self.cells.clear()
+        self.bounds.clear()
+        self.key_cells.clear()
+
+    def __contains__(self, key):
+        return key in self.bounds
+
+    def __len__(self):
+        return len(self.bounds)
@@ -5,11 +5,15 @@ Barre d'outils verticale pour choisir l'outil de dessin :
 - Arc
 - Gomme
 
+et les commandes de simulation (auto, mode turbo, politique de choix des transitions).
+
 Elle met à jour une StringVar partagée avec le canvas.
 """
 
 import tkinter as tk
-import os
+
+from backend.petri import SIMULATION_POLICIES
+from UI.assets import get_assets
 
 
 class ToolBar(tk.Frame):
@@ -20,14 +24,11 @@ class ToolBar(tk.Frame):
         self.canvas = None
         self.analyser_callback = None
 
-        # Dossier où se trouvent les images (même dossier que toolbar.py)
-        script_dir = os.path.dirname(__file__)
-
-        # On garde les images dans des attributs pour éviter le garbage collection
+        # Icônes chargées par le gestionnaire d'images partagé (gardées en mémoire par lui)
+        assets = get_assets()
         self.icons = {}
         def load_icon(name, filename):
-            path = os.path.join(script_dir, filename)
-            self.icons[name] = tk.PhotoImage(file=path)
+            self.icons[name] = assets.photo(filename)
             return self.icons[name]
 
         icon_place      = load_icon("place",      "btn_place.png")
@@ -65,6 +66,17 @@ class ToolBar(tk.Frame):
 
         tk.Button(self, image=icon_auto,
                   command=self._on_auto, **btn_opts).pack(pady=3)
+
+        # Mode turbo (plusieurs tirs par image) et politique de choix
+        self.turbo = tk.BooleanVar(value=False)
+        tk.Checkbutton(self, text="Turbo", variable=self.turbo, bg="#CCB29B",
+                       activebackground="#CCB29B", command=self._on_turbo).pack(pady=3)
+
+        self.policy = tk.StringVar(value="first")
+        policy_menu = tk.OptionMenu(self, self.policy, *SIMULATION_POLICIES,
+                                    command=self._on_policy)
+        policy_menu.config(bg="#FFFFFF", fg="#583F27", bd=0, highlightthickness=0)
+        policy_menu.pack(pady=3)
         
         tk.Button(self, image=icon_reset,
                   command=self._on_reset_marking, **btn_opts).pack(pady=3)
@@ -92,6 +104,14 @@ class ToolBar(tk.Frame):
         if self.canvas is not None:
             self.canvas.start_auto_simulation()
 
+    def _on_turbo(self):
+        if self.canvas is not None:
+            self.canvas.set_turbo(self.turbo.get())
+
+    def _on_policy(self, policy):
+        if self.canvas is not None:
+            self.canvas.set_sim_policy(policy)
+
     def _on_reset_marking(self):
         if self.canvas is not None:
             self.canvas.reset_marking()
@@ -8,15 +8,11 @@ Fenêtre principale de l'application.
 
 import tkinter as tk
 from tkinter import messagebox
-from UI.canvas import PetriCanvas
-from UI.toolbar import ToolBar
+from UI.assets import get_assets
 
 from backend.petri import PetriNet
 from backend.petri import analyze_from_dict
 
-from PIL import Image, ImageTk   
-import os
-
 
 class MainWindow:
     def __init__(self):
@@ -29,12 +25,8 @@ class MainWindow:
         self.start_frame = tk.Frame(self.root)
         self.start_frame.pack(fill="both", expand=True)
 
-        # charge l'image de fond
-        script_dir = os.path.dirname(__file__)
-        bg_path = os.path.join(script_dir, "FondBillard.png")
-        bg_image = Image.open(bg_path)
-        bg_image = bg_image.resize((1920, 1080))          # taille fenêtre
-        self.bg_photo = ImageTk.PhotoImage(bg_image)   
+        # image de fond à la taille fenêtre (redimensionnée une seule fois, cache disque)
+        self.bg_photo = get_assets().scaled("FondBillard.png", 1920, 1080)
 
         # label plein écran avec l'image de fond
         bg_label = tk.Label(self.start_frame, image=self.bg_photo)
@@ -67,7 +59,21 @@ class MainWindow:
         start_btn.place(relx=0.5, rely=0.55, anchor="center")   # centré aussi
 
 
-        # ÉDITEUR (caché au début)
+        # ÉDITEUR : construit seulement au clic sur START (la fenêtre s'affiche tout de suite)
+        self.editor_frame = None
+        self.toolbar = None
+        self.canvas = None
+
+    def show_editor(self):
+        if self.editor_frame is None:
+            self._build_editor()
+        self.start_frame.pack_forget()
+        self.editor_frame.pack(fill="both", expand=True)
+
+    def _build_editor(self):
+        from UI.canvas import PetriCanvas
+        from UI.toolbar import ToolBar
+
         self.editor_frame = tk.Frame(self.root)
 
         self.toolbar = ToolBar(self.editor_frame)
@@ -79,10 +85,6 @@ class MainWindow:
         self.toolbar.set_canvas(self.canvas)
         self.toolbar.set_analyser_callback(self.analyser_reseau)
 
-    def show_editor(self):
-        self.start_frame.pack_forget()
-        self.editor_frame.pack(fill="both", expand=True)
-
 
     def run(self):
         self.root.mainloop()
@@ -123,6 +125,7 @@ class MainWindow:
             top = tk.Toplevel(self.root)
             top.title("Graphe d'accessibilité")
 
+            from PIL import Image, ImageTk
             img = Image.open("graph.png")
             photo = ImageTk.PhotoImage(img)
             label = tk.Label(top, image=photo)
@@ -0,0 +1,202 @@
+"""
+Analyse en lot, non interactive, d'un ensemble de réseaux.
+
+Exemple :
+    python batch.py modeles/ "autres/**/*.pnml" --out resultats --jobs 8 \
+        --max-states 200000 --timeout 60
+
+Chaque réseau (.json, .pnml ou .pnb, voir formats.py) est analysé dans un processus
+du pool, avec son propre budget d'états (--max-states) et de temps (--timeout).
+Pour chaque réseau on écrit <nom>.result.json et <nom>.dot dans le dossier de sortie,
+puis un résumé summary.jsonl (écrit au fil de l'eau) et summary.csv (trié par fichier).
+Avec --columnar, le graphe d'accessibilité est écrit à part dans <nom>.pnr (format
+colonnaire, voir columnar.py) au lieu d'être inclus dans <nom>.result.json.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from columnar import save_columnar
+from formats import load_net
+from petri import analyze_net
+
+
+NET_EXTENSIONS = (".json", ".pnml", ".pnb")
+RESULT_SUFFIX = ".result.json"
+COLUMNAR_SUFFIX = ".pnr"
+
+SUMMARY_FIELDS = [
+    "file", "status", "seconds", "num_states", "num_edges",
+    "num_deadlocks", "truncated", "error",
+]
+
+
+class AnalysisTimeout(Exception):
+    pass
+
+
+#Liste les fichiers de réseaux désignés par des dossiers ou des motifs glob.
+def collect_nets(paths: List[str], recursive: bool = False) -> List[str]:
+    found: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            pattern = os.path.join(path, "**", "*") if recursive else os.path.join(path, "*")
+            candidates = glob.glob(pattern, recursive=recursive)
+        else:
+            candidates = glob.glob(path, recursive=True)
+        for c in candidates:
+            if os.path.isfile(c) and c.lower().endswith(NET_EXTENSIONS) and not c.endswith(RESULT_SUFFIX):
+                found.append(os.path.normpath(c))
+    # sans doublons, ordre stable
+    return sorted(set(found))
+
+
+#Nom de sortie unique pour chaque fichier (deux modèles peuvent avoir le même nom).
+def output_names(files: List[str]) -> Dict[str, str]:
+    names: Dict[str, str] = {}
+    used = set()
+    for path in files:
+        base = os.path.splitext(os.path.basename(path))[0]
+        name = base
+        i = 2
+        while name in used:
+            name = f"{base}_{i}"
+            i += 1
+        used.add(name)
+        names[path] = name
+    return names
+
+
+def _on_alarm(signum, frame):
+    raise AnalysisTimeout()
+
+
+#Analyse un réseau dans un processus du pool et renvoie sa ligne de résumé.
+def analyze_one(
+    path: str,
+    out_dir: str,
+    name: str,
+    max_states: int,
+    timeout: Optional[float],
+    columnar: bool = False,
+) -> Dict[str, Any]:
+    row: Dict[str, Any] = {field: None for field in SUMMARY_FIELDS}
+    row["file"] = path
+    start = time.perf_counter()
+
+    # Budget de temps : SIGALRM dans le processus de travail (Unix)
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    result = None
+    try:
+        result = analyze_net(load_net(path), max_states=max_states)
+    except AnalysisTimeout:
+        row["status"] = "timeout"
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    if result is not None:
+        analysis = result["analysis"]
+        row["status"] = "truncated" if analysis["truncated"] else "ok"
+        row["num_states"] = analysis["num_states"]
+        row["num_edges"] = analysis["num_edges"]
+        row["num_deadlocks"] = len(analysis["deadlocks"])
+        row["truncated"] = analysis["truncated"]
+
+        if columnar:
+            save_columnar(result.pop("reachability"), os.path.join(out_dir, name + COLUMNAR_SUFFIX))
+        with open(os.path.join(out_dir, name + RESULT_SUFFIX), "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        with open(os.path.join(out_dir, name + ".dot"), "w", encoding="utf-8") as f:
+            f.write(result["dot"])
+
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+#Analyse tous les réseaux en parallèle et écrit les résumés. Renvoie les lignes triées par fichier.
+def run_batch(
+    files: List[str],
+    out_dir: str,
+    jobs: Optional[int] = None,
+    max_states: int = 10000,
+    timeout: Optional[float] = None,
+    verbose: bool = False,
+    columnar: bool = False,
+) -> List[Dict[str, Any]]:
+    os.makedirs(out_dir, exist_ok=True)
+    names = output_names(files)
+    rows: List[Dict[str, Any]] = []
+
+    with open(os.path.join(out_dir, "summary.jsonl"), "w", encoding="utf-8") as jsonl, \
+            ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(analyze_one, path, out_dir, names[path], max_states, timeout, columnar): path
+            for path in files
+        }
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as e:
+                # le processus de travail lui-même a échoué (mémoire, crash...)
+                row = {field: None for field in SUMMARY_FIELDS}
+                row.update(file=futures[future], status="error", error=f"{type(e).__name__}: {e}")
+            rows.append(row)
+            jsonl.write(json.dumps(row, ensure_ascii=False) + "\n")
+            jsonl.flush()
+            if verbose:
+                print(f" [{len(rows)}/{len(files)}] {row['status']:9} {row['file']}")
+
+    rows.sort(key=lambda r: r["file"])
+    with open(os.path.join(out_dir, "summary.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyse en lot de réseaux de Petri.")
+    parser.add_argument("paths", nargs="+", help="dossiers ou motifs glob de réseaux (.json, .pnml, .pnb)")
+    parser.add_argument("--out", default="batch_results", help="dossier de sortie (défaut: batch_results)")
+    parser.add_argument("--jobs", type=int, default=None, help="nombre de processus (défaut: tous les cœurs)")
+    parser.add_argument("--max-states", type=int, default=10000, help="budget d'états par réseau")
+    parser.add_argument("--timeout", type=float, default=None, help="budget de temps par réseau (secondes)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="parcourt les sous-dossiers")
+    parser.add_argument("--columnar", action="store_true",
+                        help="écrit le graphe d'accessibilité au format colonnaire (.pnr)")
+    args = parser.parse_args(argv)
+
+    files = collect_nets(args.paths, recursive=args.recursive)
+    if not files:
+        print(" Aucun réseau trouvé.")
+        return 1
+
+    print(f" {len(files)} réseau(x) à analyser -> {args.out}")
+    rows = run_batch(files, args.out, jobs=args.jobs, max_states=args.max_states,
+                     timeout=args.timeout, verbose=True, columnar=args.columnar)
+
+    counts: Dict[str, int] = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    print(" Bilan : " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    return 0 if counts.get("error", 0) == 0 else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
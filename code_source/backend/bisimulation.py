@@ -0,0 +1,209 @@
+"""
+Minimisation du graphe d'accessibilité par bisimulation (graphe quotient).
+
+Deux états sont bisimilaires s'ils ont les mêmes valeurs pour les prédicats observés
+et si chaque tir observable de l'un peut être imité par l'autre vers des états
+eux-mêmes bisimilaires. On regroupe les états bisimilaires en blocs : le graphe
+quotient (un nœud par bloc) a exactement le même comportement observable, mais il est
+souvent 10 à 1000 fois plus petit (symétries, compteurs non observés...).
+
+- observable : transitions dont le nom reste visible ; les autres sont toutes
+  renommées TAU (on ne distingue plus laquelle a tiré). None = toutes visibles.
+- predicates : expressions sur les places (syntaxe des prédicats, ex. "P3 >= 1") ;
+  les états de départ sont séparés selon leurs valeurs. None = aucun.
+
+La bisimulation calculée est forte (TAU est une étiquette comme une autre).
+
+Algorithme de Paige et Tarjan (raffinement de partition, O(E log V)) : on maintient
+une partition Q des états et une partition X, plus grossière, telle que Q soit stable
+par rapport à chaque bloc de X. On retire de X un bloc B de Q d'au plus la moitié de
+son bloc composé S, puis on coupe Q selon les prédécesseurs de B et selon les états
+dont tous les successeurs dans S sont dans B (grâce à des compteurs par (état, étiquette,
+bloc de X)). Chaque état n'est dans la petite moitié qu'O(log V) fois.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from petri import PetriNet, compile_predicate
+
+
+TAU = "tau"
+
+
+"""
+Plus grosse bisimulation sur un système de transitions étiquetées.
+n états, edges = [(source, étiquette, cible)], initial_keys[s] = observation de s.
+Renvoie block_of[s], blocs numérotés dans l'ordre de leur premier état.
+"""
+
+
+def bisimulation_blocks(
+    n: int,
+    edges: Iterable[Tuple[int, Hashable, int]],
+    initial_keys: Optional[List[Hashable]] = None,
+) -> List[int]:
+    inverse: List[List[Tuple[Hashable, int]]] = [[] for _ in range(n)]
+    count: Dict[Tuple[int, Hashable, int], int] = {}       # (état, étiquette, bloc de X) -> nb de successeurs
+    has_label: Dict[Hashable, Set[int]] = {}
+    for s, a, t in set(edges):
+        inverse[t].append((a, s))
+        count[(s, a, 0)] = count.get((s, a, 0), 0) + 1
+        has_label.setdefault(a, set()).add(s)
+
+    # Partition Q (blocs simples) : observation initiale
+    block_of = [0] * n
+    blocks: List[Set[int]] = []
+    by_key: Dict[Hashable, int] = {}
+    for s in range(n):
+        key = initial_keys[s] if initial_keys is not None else None
+        b = by_key.get(key)
+        if b is None:
+            b = by_key[key] = len(blocks)
+            blocks.append(set())
+        blocks[b].add(s)
+        block_of[s] = b
+
+    # Partition X (blocs composés) : un seul bloc 0 au départ
+    xblock_of_block = [0] * len(blocks)
+    x_members: List[Set[int]] = [set(range(len(blocks)))]
+    compound: List[int] = []
+
+    def split(marked: Iterable[int]) -> None:
+        touched: Dict[int, List[int]] = {}
+        for s in marked:
+            touched.setdefault(block_of[s], []).append(s)
+        for b, moved in touched.items():
+            if len(moved) == len(blocks[b]):
+                continue
+            nb = len(blocks)
+            blocks.append(set(moved))
+            blocks[b].difference_update(moved)
+            for s in moved:
+                block_of[s] = nb
+            x = xblock_of_block[b]
+            xblock_of_block.append(x)
+            x_members[x].add(nb)
+            if len(x_members[x]) == 2:
+                compound.append(x)
+
+    # Stabilité par rapport à X = {tous les états} : avoir ou non un successeur a
+    for a in has_label:
+        split(has_label[a])
+    if len(x_members[0]) > 1 and 0 not in compound:
+        compound.append(0)
+
+    while compound:
+        S = compound.pop()
+        if len(x_members[S]) < 2:
+            continue
+        it = iter(x_members[S])
+        b1, b2 = next(it), next(it)
+        B = b1 if len(blocks[b1]) <= len(blocks[b2]) else b2
+
+        # B devient un bloc composé à lui seul, S garde le reste
+        x_members[S].discard(B)
+        NB = len(x_members)
+        x_members.append({B})
+        xblock_of_block[B] = NB
+        if len(x_members[S]) > 1:
+            compound.append(S)
+
+        # Prédécesseurs de B par étiquette, avec leur nombre de successeurs dans B
+        pre: Dict[Hashable, Dict[int, int]] = {}
+        for y in blocks[B]:
+            for a, x in inverse[y]:
+                by_state = pre.setdefault(a, {})
+                by_state[x] = by_state.get(x, 0) + 1
+
+        for a, in_b in pre.items():
+            split(in_b)
+            # États dont tous les successeurs a dans S sont dans B
+            split([x for x, c in in_b.items() if c == count[(x, a, S)]])
+            for x, c in in_b.items():
+                rest = count[(x, a, S)] - c
+                if rest:
+                    count[(x, a, S)] = rest
+                else:
+                    del count[(x, a, S)]
+                count[(x, a, NB)] = c
+
+    # Renumérotation dans l'ordre des états
+    renumber: Dict[int, int] = {}
+    return [renumber.setdefault(block_of[s], len(renumber)) for s in range(n)]
+
+
+"""
+Graphe quotient d'un résultat de reachability_bfs (calculé si absent).
+Renvoie un dict avec :
+- num_states, num_blocks, block_of (état -> bloc), blocks (bloc -> états),
+- initial (bloc de l'état initial), edges [(bloc, étiquette, bloc)], deadlocks (blocs),
+- predicates {expression: valeur par bloc}, truncated (celui de l'exploration).
+"""
+
+
+def minimize(
+    net: PetriNet,
+    max_states: int = 10000,
+    reachability: Optional[Dict[str, Any]] = None,
+    observable: Optional[Iterable[str]] = None,
+    predicates: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    res = reachability if reachability is not None else net.reachability_bfs(max_states=max_states)
+    order: List[str] = res["place_order"]
+    states: List[Dict[str, int]] = res["states"]
+
+    visible = None if observable is None else set(observable)
+    edges = [
+        (s, tid if visible is None or tid in visible else TAU, t)
+        for s, tid, t in res["edges"]
+    ]
+
+    funcs = [compile_predicate(expr, order) for expr in predicates or []]
+    values: List[Tuple[Any, ...]] = []
+    for m in states:
+        key = tuple(m.get(pid, 0) for pid in order)
+        values.append(tuple(f(key) for f in funcs))
+
+    block_of = bisimulation_blocks(len(states), edges, values)
+    num_blocks = max(block_of) + 1 if block_of else 0
+    blocks: List[List[int]] = [[] for _ in range(num_blocks)]
+    for s, b in enumerate(block_of):
+        blocks[b].append(s)
+
+    quotient_edges = sorted(
+        {(block_of[s], a, block_of[t]) for s, a, t in edges},
+        key=lambda e: (e[0], str(e[1]), e[2]),
+    )
+    return {
+        "num_states": len(states),
+        "num_blocks": num_blocks,
+        "block_of": block_of,
+        "blocks": blocks,
+        "initial": block_of[0] if block_of else None,
+        "edges": quotient_edges,
+        "deadlocks": sorted({block_of[s] for s in res["deadlocks"]}),
+        "predicates": {
+            expr: [values[members[0]][i] for members in blocks]
+            for i, expr in enumerate(predicates or [])
+        },
+        "truncated": res["truncated"],
+    }
+
+
+#Exporte le graphe quotient au format DOT (un nœud par bloc, avec sa taille).
+def quotient_to_dot(quotient: Dict[str, Any]) -> str:
+    deadlocks = set(quotient["deadlocks"])
+    lines: List[str] = ["digraph Quotient {", "  rankdir=LR;"]
+    for b, members in enumerate(quotient["blocks"]):
+        label = [f"B{b} ({len(members)} états)"]
+        label += [f"{expr}={values[b]}" for expr, values in quotient["predicates"].items()]
+        shape = "doublecircle" if b in deadlocks else "circle"
+        style = ", style=bold" if b == quotient["initial"] else ""
+        text = "\\n".join(label)
+        lines.append(f'  B{b} [label="{text}", shape={shape}{style}];')
+    for f, a, t in quotient["edges"]:
+        lines.append(f'  B{f} -> B{t} [label="{a}"];')
+    if quotient.get("truncated"):
+        lines.append('  truncated [label="TRUNCATED"];')
+    lines.append("}")
+    return "\n".join(lines)
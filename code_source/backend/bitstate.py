@@ -0,0 +1,280 @@
+"""
+Exploration probabiliste à mémoire bornée (recherche rapide de deadlocks sur de gros réseaux).
+
+Au lieu de garder chaque marquage dans un dictionnaire (plusieurs centaines d'octets
+par état), on ne garde qu'une signature compacte des marquages déjà vus, dans une
+zone de taille fixée à l'avance (memory_bytes) :
+
+- "bitstate" (Holzmann, supertrace) : k bits par état dans un tableau de bits.
+  Quelques bits par état : de l'ordre du milliard d'états par Go.
+- "hashcompact" : empreinte de 64 bits par état dans une table à adressage ouvert.
+  8 octets par état, probabilité d'omission bien plus faible.
+
+En contrepartie, deux marquages différents peuvent avoir la même signature : le
+second est alors pris pour déjà visité et la partie de l'espace d'états qu'il
+aurait ouverte peut être omise. L'exploration est donc incomplète (une absence de
+deadlock ne prouve rien), mais chaque deadlock trouvé est réel, avec sa trace.
+Le résultat donne une estimation de la probabilité d'omission.
+
+L'exploration est en profondeur (DFS) : la pile est le chemin courant, ce qui donne
+directement la séquence de tirs menant à un deadlock.
+"""
+
+import math
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from petri import PROGRESS_EVERY, PetriNet
+
+
+BITSTATE_MODES = ["bitstate", "hashcompact"]
+
+# Deuxième fonction de hachage (hachage double : h_i = h1 + i * h2)
+_SALT = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+#Tableau de bits avec k fonctions de hachage.
+class _BitStateStore:
+    # Au-delà de cette probabilité d'omettre le prochain nouvel état, le tableau est saturé :
+    # la plupart des nouveaux états seraient perdus, on s'arrête
+    MAX_OMISSION = 0.5
+
+    def __init__(self, memory_bytes: int, hashes: int) -> None:
+        self.bits = bytearray(memory_bytes)
+        self.nbits = memory_bytes * 8
+        self.hashes = hashes
+        self.bits_set = 0
+        self.expected_omissions = 0.0
+
+    #Ajoute m ; renvoie False si m (ou un marquage de même signature) était déjà là.
+    def add(self, m: Tuple[int, ...]) -> bool:
+        bits = self.bits
+        nbits = self.nbits
+        h1 = hash(m)
+        h2 = hash((_SALT, m)) | 1
+        positions = [(h1 + i * h2) % nbits for i in range(self.hashes)]
+        if all(bits[p >> 3] & (1 << (p & 7)) for p in positions):
+            return False
+        # Probabilité que ce nouvel état ait été pris pour un état déjà vu
+        self.expected_omissions += (self.bits_set / nbits) ** self.hashes
+        for p in positions:
+            byte = bits[p >> 3]
+            if not byte & (1 << (p & 7)):
+                bits[p >> 3] = byte | (1 << (p & 7))
+                self.bits_set += 1
+        return True
+
+    def full(self) -> bool:
+        return self.fill_ratio() ** self.hashes >= self.MAX_OMISSION
+
+    def fill_ratio(self) -> float:
+        return self.bits_set / self.nbits
+
+    #Probabilité que le prochain nouvel état soit omis.
+    def omission_probability(self) -> float:
+        return self.fill_ratio() ** self.hashes
+
+
+#Table d'empreintes de 64 bits (adressage ouvert, sondage linéaire, 0 = case vide).
+class _HashCompactStore:
+    # Au-delà de ce taux de remplissage les sondages deviennent trop longs : on s'arrête
+    MAX_LOAD = 0.9
+
+    def __init__(self, memory_bytes: int) -> None:
+        self.capacity = max(memory_bytes // 8, 1)
+        self.table = array("Q", bytes(8 * self.capacity))
+        self.count = 0
+        self.limit = int(self.capacity * self.MAX_LOAD)
+
+    def add(self, m: Tuple[int, ...]) -> bool:
+        fp = hash(m) & _MASK64 or 1
+        table = self.table
+        capacity = self.capacity
+        i = (fp * _SALT & _MASK64) % capacity
+        while True:
+            slot = table[i]
+            if slot == 0:
+                table[i] = fp
+                self.count += 1
+                return True
+            if slot == fp:
+                return False
+            i += 1
+            if i == capacity:
+                i = 0
+
+    def full(self) -> bool:
+        return self.count >= self.limit
+
+    def fill_ratio(self) -> float:
+        return self.count / self.capacity
+
+    #Probabilité qu'une empreinte de 64 bits du prochain nouvel état soit déjà prise.
+    def omission_probability(self) -> float:
+        return self.count / 2.0 ** 64
+
+
+"""
+Explore l'espace d'états avec une mémoire de signatures fixée (memory_bytes).
+
+mode : "bitstate" (hashes = nombre de fonctions de hachage, 2 ou 3 conviennent)
+       ou "hashcompact".
+Arrêts : max_states états distincts (None = pas de limite), table d'empreintes pleine
+(hashcompact) ou tableau de bits saturé (bitstate : probabilité d'omission d'au moins
+_BitStateStore.MAX_OMISSION), ou max_deadlocks deadlocks trouvés (None = pas de limite).
+
+La pile ne garde par niveau que deux entiers (transition tirée, prochaine transition à
+essayer) : le marquage courant est modifié sur place et rétabli en arrière au retour.
+Comme l'option -m de SPIN, max_depth borne la profondeur : les états atteints à cette
+profondeur sont stockés mais pas développés (comptés dans cutoff). Seuls les
+MAX_KEPT_DEADLOCKS premiers deadlocks sont gardés, num_deadlocks les compte tous.
+
+Renvoie un dict avec :
+- states (nombre d'états distincts stockés), edges, max_depth (profondeur atteinte),
+- depth_limit (max_depth demandé), cutoff (états non développés à cause de la profondeur),
+- deadlocks (marquages), num_deadlocks, deadlock_trace (séquence de tirs vers le premier deadlock),
+- fill_ratio, omission_probability (probabilité d'omettre le prochain nouvel état),
+  expected_omissions (nombre estimé d'états omis pendant l'exploration),
+- truncated (True si l'exploration s'est arrêtée avant d'épuiser la pile, ou si cutoff > 0).
+"""
+
+BITSTATE_MAX_DEPTH = 1_000_000
+MAX_KEPT_DEADLOCKS = 100
+
+
+def explore_bitstate(
+    net: PetriNet,
+    memory_bytes: int = 64 * 1024 * 1024,
+    mode: str = "bitstate",
+    hashes: int = 3,
+    max_states: Optional[int] = None,
+    max_deadlocks: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    max_depth: Optional[int] = BITSTATE_MAX_DEPTH,
+) -> Dict[str, Any]:
+    if mode not in BITSTATE_MODES:
+        raise ValueError(f"Mode inconnu: {mode} (attendu: {', '.join(BITSTATE_MODES)})")
+    if memory_bytes <= 0:
+        raise ValueError("memory_bytes doit être > 0")
+    if hashes <= 0:
+        raise ValueError("hashes doit être > 0")
+    if max_depth is not None and max_depth < 0:
+        raise ValueError("max_depth doit être >= 0")
+
+    cn = net.compile()
+    pre, delta, tids = cn.pre, cn.delta, cn.transition_ids
+    n_trans = len(pre)
+    store = _BitStateStore(memory_bytes, hashes) if mode == "bitstate" else _HashCompactStore(memory_bytes)
+
+    #Première transition franchissable à partir de t (n_trans si aucune).
+    def first_enabled(m: List[int], t: int) -> int:
+        while t < n_trans:
+            for i, w in pre[t]:
+                if m[i] < w:
+                    break
+            else:
+                return t
+            t += 1
+        return n_trans
+
+    m = list(net.marking_key(net.initial_marking()))
+    store.add(tuple(m))
+    stored = 1
+    edges = 0
+    reached_depth = 0
+    cutoff = 0
+    num_deadlocks = 0
+    deadlocks: List[Dict[str, int]] = []
+    deadlock_trace: Optional[List[str]] = None
+    truncated = False
+
+    # Pile en trames compactes : path[i] = tir du niveau i au niveau i + 1,
+    # nexts[i] = prochaine transition à essayer au niveau i
+    path = array("l")
+    nexts = array("l")
+    t = first_enabled(m, 0)
+    if t == n_trans:
+        num_deadlocks = 1
+        deadlocks.append(cn.to_marking(tuple(m)))
+        deadlock_trace = []
+    elif max_depth == 0:
+        cutoff = 1
+    else:
+        nexts.append(t)
+
+    while nexts:
+        t = first_enabled(m, nexts[-1])
+        if t == n_trans:
+            nexts.pop()
+            if path:
+                for i, dv in delta[path.pop()]:
+                    m[i] -= dv
+            continue
+
+        nexts[-1] = t + 1
+        edges += 1
+        for i, dv in delta[t]:
+            m[i] += dv
+        if not store.add(tuple(m)):
+            for i, dv in delta[t]:
+                m[i] -= dv
+            continue
+
+        stored += 1
+        if progress is not None and stored % PROGRESS_EVERY == 0:
+            progress(stored, edges)
+        depth = len(path) + 1
+        if depth > reached_depth:
+            reached_depth = depth
+
+        next_t = first_enabled(m, 0)
+        if next_t < n_trans and (max_depth is None or depth < max_depth):
+            path.append(t)
+            nexts.append(next_t)
+        else:
+            if next_t == n_trans:
+                num_deadlocks += 1
+                if len(deadlocks) < MAX_KEPT_DEADLOCKS:
+                    deadlocks.append(cn.to_marking(tuple(m)))
+                if deadlock_trace is None:
+                    deadlock_trace = [tids[i] for i in path] + [tids[t]]
+            else:
+                cutoff += 1
+            for i, dv in delta[t]:
+                m[i] -= dv
+            if max_deadlocks is not None and num_deadlocks >= max_deadlocks:
+                truncated = True
+                break
+
+        if (max_states is not None and stored >= max_states) or store.full():
+            truncated = True
+            break
+
+    return {
+        "mode": mode,
+        "memory_bytes": memory_bytes,
+        "hashes": hashes if mode == "bitstate" else None,
+        "states": stored,
+        "edges": edges,
+        "max_depth": reached_depth,
+        "depth_limit": max_depth,
+        "cutoff": cutoff,
+        "deadlocks": deadlocks,
+        "num_deadlocks": num_deadlocks,
+        "deadlock_trace": deadlock_trace,
+        "fill_ratio": store.fill_ratio(),
+        "omission_probability": store.omission_probability(),
+        "expected_omissions": (
+            store.expected_omissions if mode == "bitstate"
+            else stored * (stored - 1) / 2.0 ** 65
+        ),
+        "truncated": truncated or cutoff > 0,
+    }
+
+
+#Taille de tableau de bits conseillée pour n états avec une probabilité d'omission visée.
+def bitstate_memory_for(n_states: int, hashes: int = 3, omission: float = 1e-3) -> int:
+    # (1 - exp(-k n / m))^k = omission  =>  m = -k n / ln(1 - omission^(1/k))
+    nbits = -hashes * n_states / math.log(1.0 - omission ** (1.0 / hashes))
+    return max(int(math.ceil(nbits / 8)), 1)
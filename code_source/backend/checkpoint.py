@@ -0,0 +1,161 @@
+"""
+Points de reprise (checkpoints) pour les longues explorations de l'espace d'états.
+
+reachability_bfs appelle périodiquement son paramètre checkpoint avec un instantané
+de l'exploration (même format qu'un résultat tronqué : états, arêtes, deadlocks et
+frontière). Ce module écrit ces instantanés dans un fichier binaire compact et sait
+les relire pour reprendre l'exploration là où elle s'était arrêtée :
+
+    res = explore(net, "run.pnx", max_states=5_000_000, every=300)
+
+Si le processus est tué, relancer la même commande repart du dernier instantané.
+Si le résultat est tronqué, relancer avec un max_states plus grand le prolonge.
+
+L'index des états visités n'est pas écrit : il se reconstruit à la lecture à partir
+des marquages (c'est la moitié de la taille du fichier en moins).
+"""
+
+import hashlib
+import os
+import struct
+from array import array
+from typing import Any, Callable, Dict, Optional
+
+from formats import _from_le, _to_le
+from petri import PetriNet
+
+
+"""
+Disposition du fichier (petit-boutiste) :
+
+    en-tête   : magic b"PNX1", version (u16), drapeaux (u16, bit 0 = tronqué),
+                nb places, nb transitions (u32), nb états, nb arêtes, nb deadlocks,
+                taille de la frontière (u64), successeurs déjà traités de frontière[0] (u32),
+                empreinte du réseau (sha256, 32 octets)
+    tableaux  : marquages (i64 x états x places, dans l'ordre place_order()),
+                arêtes (i64 x 3 x arêtes : source, indice de transition, cible),
+                deadlocks (i64), frontière (i64)
+"""
+
+CHECKPOINT_MAGIC = b"PNX1"
+CHECKPOINT_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIQQQQI32s")
+_TRUNCATED = 1
+
+
+#Empreinte de ce qui détermine l'espace d'états (places, transitions, arcs, marquage initial).
+def net_digest(net: PetriNet) -> bytes:
+    h = hashlib.sha256()
+    marking = net.initial_marking()
+    for pid in net.place_order():
+        h.update(f"p\0{pid}\0{marking[pid]}\n".encode("utf-8"))
+    for tid in net.transition_ids():
+        h.update(f"t\0{tid}\n".encode("utf-8"))
+        for arc in net.incoming_arcs(tid):
+            h.update(f"i\0{arc.source_id}\0{arc.weight}\n".encode("utf-8"))
+        for arc in net.outgoing_arcs(tid):
+            h.update(f"o\0{arc.target_id}\0{arc.weight}\n".encode("utf-8"))
+    return h.digest()
+
+
+#Écrit un instantané (ou un résultat de reachability_bfs) ; le fichier est remplacé atomiquement.
+def save_checkpoint(path: str, net: PetriNet, snapshot: Dict[str, Any]) -> None:
+    order = snapshot["place_order"]
+    transition_index = {tid: i for i, tid in enumerate(net.transition_ids())}
+    states = snapshot["states"]
+    edges = snapshot["edges"]
+    frontier = snapshot.get("frontier") or {"queue": [], "skip": 0}
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(
+            CHECKPOINT_MAGIC, CHECKPOINT_VERSION, _TRUNCATED if snapshot["truncated"] else 0,
+            len(order), len(transition_index), len(states), len(edges),
+            len(snapshot["deadlocks"]), len(frontier["queue"]), frontier["skip"],
+            net_digest(net),
+        ))
+        f.write(_to_le(array("q", (m.get(pid, 0) for m in states for pid in order))))
+        f.write(_to_le(array("q", (x for s, tid, t in edges for x in (s, transition_index[tid], t)))))
+        f.write(_to_le(array("q", snapshot["deadlocks"])))
+        f.write(_to_le(array("q", frontier["queue"])))
+    os.replace(tmp, path)
+
+
+#Relit un instantané pour ce réseau (refuse un fichier écrit pour un autre réseau).
+def load_checkpoint(path: str, net: PetriNet) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+
+    if len(data) < _HEADER.size:
+        raise ValueError("Point de reprise tronqué")
+    (magic, version, flags, n_places, n_trans, n_states, n_edges,
+     n_deadlocks, n_frontier, skip, digest) = _HEADER.unpack_from(data, 0)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("Ce fichier n'est pas un point de reprise (.pnx)")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Version de point de reprise non supportée: {version}")
+    if digest != net_digest(net):
+        raise ValueError("Le point de reprise a été écrit pour un autre réseau")
+
+    expected = _HEADER.size + 8 * (n_states * n_places + 3 * n_edges + n_deadlocks + n_frontier)
+    if len(data) != expected:
+        raise ValueError("Point de reprise tronqué ou corrompu")
+
+    pos = _HEADER.size
+
+    def take(count: int) -> array:
+        nonlocal pos
+        values = _from_le("q", data[pos:pos + 8 * count])
+        pos += 8 * count
+        return values
+
+    order = net.place_order()
+    tokens = take(n_states * n_places)
+    flat_edges = take(3 * n_edges)
+    transition_ids = net.transition_ids()
+
+    res: Dict[str, Any] = {
+        "place_order": order,
+        "states": [
+            dict(zip(order, tokens[i:i + n_places])) for i in range(0, n_states * n_places, n_places)
+        ] if n_places else [{} for _ in range(n_states)],
+        "edges": [
+            (flat_edges[i], transition_ids[flat_edges[i + 1]], flat_edges[i + 2])
+            for i in range(0, 3 * n_edges, 3)
+        ],
+        "deadlocks": list(take(n_deadlocks)),
+        "truncated": bool(flags & _TRUNCATED),
+    }
+    queue = list(take(n_frontier))
+    if res["truncated"]:
+        res["frontier"] = {"queue": queue, "skip": skip}
+    return res
+
+
+"""
+Exploration avec points de reprise : reprend depuis path s'il existe (exploration
+interrompue ou tronquée), écrit un instantané au plus toutes les every secondes
+puis le résultat final. Un résultat déjà complet est renvoyé tel quel.
+"""
+
+
+def explore(
+    net: PetriNet,
+    path: str,
+    max_states: int = 10000,
+    every: float = 60.0,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    resume = load_checkpoint(path, net) if os.path.exists(path) else None
+    if resume is not None and not resume["truncated"]:
+        return resume
+
+    res = net.reachability_bfs(
+        max_states=max_states,
+        progress=progress,
+        resume=resume,
+        checkpoint=lambda snapshot: save_checkpoint(path, net, snapshot),
+        checkpoint_every=every,
+    )
+    save_checkpoint(path, net, res)
+    return res
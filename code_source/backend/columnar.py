@@ -0,0 +1,232 @@
+"""
+Format colonnaire (.pnr) pour les graphes d'accessibilité, lisible par projection mémoire (mmap).
+
+result.json écrit chaque marquage comme un dict texte : pour 10^6 états, des centaines
+de Mo à relire entièrement. Ici les données sont des tableaux d'entiers binaires :
+
+    magic b"PNRC", taille de l'en-tête (u32), en-tête JSON (UTF-8), puis, alignés sur 8 octets :
+    - markings        : matrice n_states x n_places (i64, ligne par état, ordre place_order)
+    - succ_start      : n_states + 1 (i64) ; les arêtes sortantes de l'état s sont
+                        les indices succ_start[s] .. succ_start[s + 1] - 1 (format CSR)
+    - succ_transition : n_edges (i32, indice dans la liste "transitions" de l'en-tête)
+    - succ_target     : n_edges (i64)
+    - deadlocks       : n_deadlocks (i64)
+
+L'en-tête JSON donne place_order, transitions, les tailles, truncated et, pour chaque
+tableau, son décalage et son nombre d'éléments. Le tout est petit-boutiste.
+
+ColumnarResult projette le fichier en mémoire : state(s) ou successors(s) ne lisent
+que les quelques octets concernés, sans charger le fichier.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from formats import _from_le, _to_le
+
+
+COLUMNAR_MAGIC = b"PNRC"
+COLUMNAR_VERSION = 1
+_PREFIX = struct.Struct("<4sI")
+
+# nom du tableau -> (code array, taille d'un élément)
+_SECTIONS = [
+    ("markings", "q", 8),
+    ("succ_start", "q", 8),
+    ("succ_transition", "i", 4),
+    ("succ_target", "q", 8),
+    ("deadlocks", "q", 8),
+]
+
+
+#Arêtes (source, transition, cible) d'un résultat reachability_bfs ou reachability_to_dict.
+def _edge_tuples(result: Dict[str, Any]) -> List[Tuple[int, str, int]]:
+    edges = result["edges"]
+    if edges and isinstance(edges[0], dict):
+        return [(e["from"], e["transition"], e["to"]) for e in edges]
+    return list(edges)
+
+
+"""
+Écrit un résultat de reachability_bfs ou de reachability_to_dict au format colonnaire.
+transitions : ordre des transitions à enregistrer (par défaut, ordre d'apparition
+dans les arêtes) ; par exemple net.transition_ids() pour garder celles qui n'ont
+jamais tiré.
+"""
+
+
+def save_columnar(result: Dict[str, Any], path: str, transitions: Optional[List[str]] = None) -> None:
+    order: List[str] = result["place_order"]
+    states: List[Dict[str, int]] = result["states"]
+    edges = _edge_tuples(result)
+    n_states = len(states)
+
+    transition_ids = list(transitions) if transitions is not None else []
+    transition_index = {tid: i for i, tid in enumerate(transition_ids)}
+    for _, tid, _ in edges:
+        if tid not in transition_index:
+            transition_index[tid] = len(transition_ids)
+            transition_ids.append(tid)
+
+    # CSR : tri par état source (tri par comptage, ordre des arêtes conservé)
+    succ_start = array("q", bytes(8 * (n_states + 1)))
+    for s, _, _ in edges:
+        succ_start[s + 1] += 1
+    for s in range(n_states):
+        succ_start[s + 1] += succ_start[s]
+    fill = array("q", succ_start[:-1]) if n_states else array("q")
+    succ_transition = array("i", bytes(4 * len(edges)))
+    succ_target = array("q", bytes(8 * len(edges)))
+    for s, tid, t in edges:
+        k = fill[s]
+        succ_transition[k] = transition_index[tid]
+        succ_target[k] = t
+        fill[s] = k + 1
+
+    data = {
+        "markings": array("q", (m.get(pid, 0) for m in states for pid in order)),
+        "succ_start": succ_start,
+        "succ_transition": succ_transition,
+        "succ_target": succ_target,
+        "deadlocks": array("q", result["deadlocks"]),
+    }
+
+    header: Dict[str, Any] = {
+        "version": COLUMNAR_VERSION,
+        "place_order": order,
+        "transitions": transition_ids,
+        "n_states": n_states,
+        "n_edges": len(edges),
+        "truncated": bool(result["truncated"]),
+        "sections": {},
+    }
+    # Les décalages dépendent de la taille de l'en-tête : on itère jusqu'à stabilité
+    header_len = 0
+    while True:
+        offset = _align(_PREFIX.size + header_len)
+        for name, _, size in _SECTIONS:
+            header["sections"][name] = {"offset": offset, "count": len(data[name])}
+            offset = _align(offset + size * len(data[name]))
+        blob = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(blob) == header_len:
+            break
+        header_len = len(blob)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(COLUMNAR_MAGIC, len(blob)))
+        f.write(blob)
+        for name, _, _ in _SECTIONS:
+            f.write(b"\0" * (header["sections"][name]["offset"] - f.tell()))
+            f.write(_to_le(data[name]))
+    os.replace(tmp, path)
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class ColumnarResult:
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _PREFIX.size:
+                raise ValueError("Fichier colonnaire tronqué")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        self._views: List[memoryview] = []
+        try:
+            magic, header_len = _PREFIX.unpack_from(self._mmap, 0)
+            if magic != COLUMNAR_MAGIC:
+                raise ValueError("Ce fichier n'est pas un résultat colonnaire (.pnr)")
+            header = json.loads(bytes(self._mmap[_PREFIX.size:_PREFIX.size + header_len]).decode("utf-8"))
+            if header.get("version") != COLUMNAR_VERSION:
+                raise ValueError(f"Version de format colonnaire non supportée: {header.get('version')}")
+
+            self.place_order: List[str] = header["place_order"]
+            self.transition_ids: List[str] = header["transitions"]
+            self.num_states: int = header["n_states"]
+            self.num_edges: int = header["n_edges"]
+            self.truncated: bool = header["truncated"]
+
+            base = memoryview(self._mmap)
+            self._views.append(base)
+            for name, typecode, itemsize in _SECTIONS:
+                section = header["sections"][name]
+                start, end = section["offset"], section["offset"] + itemsize * section["count"]
+                if end > len(self._mmap):
+                    raise ValueError("Fichier colonnaire tronqué ou corrompu")
+                if sys.byteorder == "little":
+                    view = base[start:end].cast(typecode)
+                    self._views.append(view)
+                else:
+                    view = _from_le(typecode, base[start:end])
+                setattr(self, "_" + name, view)
+        except BaseException:
+            self.close()
+            raise
+
+    # Accès ponctuels (seules les pages concernées sont lues)
+
+    def marking_row(self, s: int) -> Tuple[int, ...]:
+        n = len(self.place_order)
+        return tuple(self._markings[s * n:(s + 1) * n])
+
+    def state(self, s: int) -> Dict[str, int]:
+        if not 0 <= s < self.num_states:
+            raise IndexError(f"État inconnu: {s}")
+        return dict(zip(self.place_order, self.marking_row(s)))
+
+    def successors(self, s: int) -> List[Tuple[str, int]]:
+        if not 0 <= s < self.num_states:
+            raise IndexError(f"État inconnu: {s}")
+        lo, hi = self._succ_start[s], self._succ_start[s + 1]
+        return [
+            (self.transition_ids[t], target)
+            for t, target in zip(self._succ_transition[lo:hi], self._succ_target[lo:hi])
+        ]
+
+    def deadlocks(self) -> List[int]:
+        return list(self._deadlocks)
+
+    def edges(self) -> Iterator[Tuple[int, str, int]]:
+        for s in range(self.num_states):
+            for tid, target in self.successors(s):
+                yield s, tid, target
+
+    #Relit tout le résultat, au format de reachability_to_dict.
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "place_order": list(self.place_order),
+            "states": [self.state(s) for s in range(self.num_states)],
+            "edges": [{"from": f, "transition": t, "to": to} for f, t, to in self.edges()],
+            "deadlocks": self.deadlocks(),
+            "truncated": self.truncated,
+        }
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "ColumnarResult":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def load_columnar(path: str) -> ColumnarResult:
+    return ColumnarResult(path)
@@ -0,0 +1,342 @@
+"""
+Import / export de réseaux de Petri dans d'autres formats que notre JSON.
+
+- PNML (Petri Net Markup Language, format des outils et du Model Checking Contest) :
+  lecture en flux avec iterparse (chaque place / transition / arc est traité puis
+  retiré de l'arbre, le document complet n'est jamais gardé en mémoire) et écriture
+  en flux, élément par élément.
+- Format binaire compact (.pnb) : un en-tête, une table de chaînes, puis des tableaux
+  de nombres (jetons initiaux, priorités, délais, table des arcs par indices de nœuds).
+  Le fichier se charge en une seule lecture.
+
+Ce que PNML ne sait pas décrire (priorités et délais des transitions) est écrit dans un
+bloc <toolspecific tool="editeur-petri"> de la transition, relu par load_pnml et ignoré
+par les autres outils.
+
+Dans les deux cas le réseau est construit d'un bloc avec PetriNet.from_elements.
+load_net / analyze_file choisissent le lecteur d'après l'extension (.json, .pnml, .pnb).
+"""
+
+import gc
+import math
+import struct
+import sys
+from contextlib import contextmanager
+import xml.etree.ElementTree as ET
+from array import array
+from typing import Any, Dict, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from petri import Arc, PetriNet, Place, Transition, analyze_net, load_petri_from_dict
+
+
+PNML_NAMESPACE = "http://www.pnml.org/version-2009/grammar/pnml"
+PTNET_TYPE = "http://www.pnml.org/version-2009/grammar/ptnet"
+PNML_TOOL = "editeur-petri"
+PNML_TOOL_VERSION = "1"
+
+
+
+#Le ramasse-miettes cyclique est suspendu pendant la création de milliers d'objets
+#qui restent tous vivants (il n'aurait rien à libérer et coûte ~30 % du chargement).
+@contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+
+#  PNML
+
+
+def _local(tag: str) -> str:
+    # "{namespace}place" -> "place"
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(elem: ET.Element, name: str, default: str = "") -> str:
+    # Texte de <name><text>...</text></name> (ou initialMarking / inscription)
+    for child in elem:
+        if _local(child.tag) == name:
+            for sub in child:
+                if _local(sub.tag) == "text":
+                    return (sub.text or "").strip()
+    return default
+
+
+def _tool_text(elem: ET.Element, name: str) -> str:
+    # Texte de <toolspecific tool="editeur-petri"><name>...</name></toolspecific>
+    for child in elem:
+        if _local(child.tag) == "toolspecific" and child.get("tool") == PNML_TOOL:
+            for sub in child:
+                if _local(sub.tag) == name:
+                    return (sub.text or "").strip()
+    return ""
+
+
+#Lit un fichier PNML (P/T net) en flux et construit le PetriNet correspondant.
+def load_pnml(path: str) -> PetriNet:
+    with _gc_paused():
+        return _read_pnml(path)
+
+
+def _read_pnml(path: str) -> PetriNet:
+    places: List[Place] = []
+    transitions: List[Transition] = []
+    arcs: List[Tuple[str, str, int]] = []
+    references: Dict[str, str] = {}   # referencePlace / referenceTransition -> nœud visé
+
+    stack: List[ET.Element] = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        tag = _local(elem.tag)
+        if tag == "place":
+            pid = elem.get("id")
+            tokens = _child_text(elem, "initialMarking")
+            places.append(Place(pid, _child_text(elem, "name", pid), int(tokens) if tokens else 0))
+        elif tag == "transition":
+            tid = elem.get("id")
+            priority = _tool_text(elem, "priority")
+            delay = _tool_text(elem, "delay")
+            max_delay = _tool_text(elem, "maxDelay")
+            transitions.append(Transition(
+                tid,
+                _child_text(elem, "name", tid),
+                priority=int(priority) if priority else 0,
+                delay=float(delay) if delay else 0.0,
+                max_delay=float(max_delay) if max_delay else None,
+            ))
+        elif tag == "arc":
+            weight = _child_text(elem, "inscription")
+            arcs.append((elem.get("source"), elem.get("target"), int(weight) if weight else 1))
+        elif tag in ("referencePlace", "referenceTransition"):
+            references[elem.get("id")] = elem.get("ref")
+        else:
+            continue
+
+        # Élément traité : on le détache de son parent pour libérer la mémoire
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+    def resolve(node_id: str) -> str:
+        seen = set()
+        while node_id in references and node_id not in seen:
+            seen.add(node_id)
+            node_id = references[node_id]
+        return node_id
+
+    return PetriNet.from_elements(
+        places,
+        transitions,
+        [Arc(resolve(src), resolve(tgt), w) for src, tgt, w in arcs],
+    )
+
+
+#Écrit le réseau au format PNML (P/T net), élément par élément.
+def save_pnml(net: PetriNet, path: str, net_id: str = "net") -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(f"<pnml xmlns={quoteattr(PNML_NAMESPACE)}>\n")
+        f.write(f"  <net id={quoteattr(net_id)} type={quoteattr(PTNET_TYPE)}>\n")
+        f.write('    <page id="page0">\n')
+
+        for p in net.places.values():
+            f.write(f"      <place id={quoteattr(p.id)}>")
+            f.write(f"<name><text>{escape(p.name)}</text></name>")
+            if p.initial_tokens:
+                f.write(f"<initialMarking><text>{p.initial_tokens}</text></initialMarking>")
+            f.write("</place>\n")
+
+        for t in net.transitions.values():
+            f.write(f"      <transition id={quoteattr(t.id)}>")
+            f.write(f"<name><text>{escape(t.name)}</text></name>")
+            if t.priority or t.timed:
+                f.write(f"<toolspecific tool={quoteattr(PNML_TOOL)} version={quoteattr(PNML_TOOL_VERSION)}>")
+                if t.priority:
+                    f.write(f"<priority>{t.priority}</priority>")
+                if t.timed:
+                    f.write(f"<delay>{t.delay!r}</delay>")
+                if t.max_delay is not None:
+                    f.write(f"<maxDelay>{t.max_delay!r}</maxDelay>")
+                f.write("</toolspecific>")
+            f.write("</transition>\n")
+
+        for i, a in enumerate(net.arcs):
+            f.write(
+                f"      <arc id={quoteattr(f'a{i}')} source={quoteattr(a.source_id)} "
+                f"target={quoteattr(a.target_id)}>"
+            )
+            if a.weight != 1:
+                f.write(f"<inscription><text>{a.weight}</text></inscription>")
+            f.write("</arc>\n")
+
+        f.write("    </page>\n  </net>\n</pnml>\n")
+
+
+
+#  Format binaire (.pnb)
+
+"""
+Disposition du fichier (petit-boutiste) :
+
+    en-tête   : magic b"PNB1", version (u16), réservé (u16),
+                nb places, nb transitions, nb arcs (u32), taille de la table de chaînes (u64)
+    chaînes   : ids et noms UTF-8 séparés par b"\\0" (ids places, noms places,
+                ids transitions, noms transitions), noms tels quels (vides compris)
+    tableaux  : jetons initiaux (i64 x places), priorités (i64 x transitions),
+                délais, délais max (f64 x transitions, NaN = pas de délai max),
+                source, cible (u32 x arcs, indices de nœuds : places puis transitions),
+                poids (i64 x arcs)
+
+Les versions précédentes se relisent toujours : en version 1 les transitions n'ont pas
+de délai ; en versions 1 et 2 un nom vide voulait dire « même texte que l'id ».
+"""
+
+BINARY_MAGIC = b"PNB1"
+BINARY_VERSION = 3
+_HEADER = struct.Struct("<4sHHIIIQ")
+
+
+def _to_le(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode: str, data: memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+#Écrit le réseau au format binaire compact.
+def save_binary(net: PetriNet, path: str) -> None:
+    places = list(net.places.values())
+    transitions = list(net.transitions.values())
+    node_index = {p.id: i for i, p in enumerate(places)}
+    node_index.update({t.id: len(places) + i for i, t in enumerate(transitions)})
+
+    strings: List[str] = [p.id for p in places]
+    strings += [p.name for p in places]
+    strings += [t.id for t in transitions]
+    strings += [t.name for t in transitions]
+    blob = "\0".join(strings).encode("utf-8")
+
+    arcs = net.arcs
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0,
+                             len(places), len(transitions), len(arcs), len(blob)))
+        f.write(blob)
+        f.write(_to_le(array("q", (p.initial_tokens for p in places))))
+        f.write(_to_le(array("q", (t.priority for t in transitions))))
+        f.write(_to_le(array("d", (t.delay for t in transitions))))
+        f.write(_to_le(array("d", (math.nan if t.max_delay is None else t.max_delay for t in transitions))))
+        f.write(_to_le(array("I", (node_index[a.source_id] for a in arcs))))
+        f.write(_to_le(array("I", (node_index[a.target_id] for a in arcs))))
+        f.write(_to_le(array("q", (a.weight for a in arcs))))
+
+
+#Charge un réseau au format binaire (une seule lecture du fichier).
+def load_binary(path: str) -> PetriNet:
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+
+    if len(data) < _HEADER.size:
+        raise ValueError("Fichier binaire tronqué")
+    magic, version, _, n_places, n_trans, n_arcs, blob_len = _HEADER.unpack_from(data, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Ce fichier n'est pas un réseau binaire (.pnb)")
+    if version not in (1, 2, BINARY_VERSION):
+        raise ValueError(f"Version de format binaire non supportée: {version}")
+
+    timed = version >= 2
+    expected = _HEADER.size + blob_len + 8 * n_places + (24 if timed else 8) * n_trans + 16 * n_arcs
+    if len(data) != expected:
+        raise ValueError("Fichier binaire tronqué ou corrompu")
+
+    pos = _HEADER.size
+    strings = bytes(data[pos:pos + blob_len]).decode("utf-8").split("\0")
+    pos += blob_len
+    if len(strings) != 2 * (n_places + n_trans) and n_places + n_trans > 0:
+        raise ValueError("Table de chaînes incohérente")
+
+    def take(typecode: str, count: int, size: int) -> array:
+        nonlocal pos
+        values = _from_le(typecode, data[pos:pos + count * size])
+        pos += count * size
+        return values
+
+    tokens = take("q", n_places, 8)
+    priorities = take("q", n_trans, 8)
+    delays = take("d", n_trans, 8) if timed else array("d", bytes(8 * n_trans))
+    max_delays = take("d", n_trans, 8) if timed else array("d", [math.nan]) * n_trans
+    sources = take("I", n_arcs, 4)
+    targets = take("I", n_arcs, 4)
+    weights = take("q", n_arcs, 8)
+
+    place_ids = strings[:n_places]
+    place_names = strings[n_places:2 * n_places]
+    trans_ids = strings[2 * n_places:2 * n_places + n_trans]
+    trans_names = strings[2 * n_places + n_trans:2 * (n_places + n_trans)]
+    if version < 3:
+        place_names = [name or pid for pid, name in zip(place_ids, place_names)]
+        trans_names = [name or tid for tid, name in zip(trans_ids, trans_names)]
+    node_ids = place_ids + trans_ids
+    if any(i >= len(node_ids) for i in sources) or any(i >= len(node_ids) for i in targets):
+        raise ValueError("Table des arcs incohérente (indice de nœud hors limites)")
+
+    with _gc_paused():
+        return PetriNet.from_elements(
+            [Place(pid, name, tok) for pid, name, tok in zip(place_ids, place_names, tokens)],
+            [
+                Transition(tid, name, prio, delay, None if math.isnan(max_delay) else max_delay)
+                for tid, name, prio, delay, max_delay in zip(trans_ids, trans_names, priorities, delays, max_delays)
+            ],
+            [Arc(node_ids[s], node_ids[t], w) for s, t, w in zip(sources, targets, weights)],
+        )
+
+
+
+#  Choix du format d'après l'extension
+
+
+def load_net(path: str) -> PetriNet:
+    lower = path.lower()
+    if lower.endswith(".pnml") or lower.endswith(".xml"):
+        return load_pnml(path)
+    if lower.endswith(".pnb"):
+        return load_binary(path)
+
+    import json
+    with open(path, "r", encoding="utf-8") as f:
+        return load_petri_from_dict(json.load(f))
+
+
+def save_net(net: PetriNet, path: str) -> None:
+    lower = path.lower()
+    if lower.endswith(".pnml") or lower.endswith(".xml"):
+        save_pnml(net, path)
+    elif lower.endswith(".pnb"):
+        save_binary(net, path)
+    else:
+        import json
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(net.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+#Comme analyze_from_json_file, pour n'importe quel format reconnu par load_net.
+def analyze_file(path: str, max_states: int = 10000) -> Dict[str, Any]:
+    return analyze_net(load_net(path), max_states=max_states)
@@ -4,11 +4,21 @@ Modèle et moteur de réseau de Petri.
 Contient :
 - les classes Place, Transition et Arc (définition d'un réseau de Petri),
 - la classe PetriNet qui :
-  - stocke les places, transitions et arcs,
+  - stocke les places, transitions et arcs (arcs indexés par (source, cible) et par nœud),
   - vérifie la cohérence du réseau (types d'arcs, IDs uniques),
-  - calcule les tirages possibles et le graphe d'accessibilité (reachability),
+  - calcule les tirages possibles et le graphe d'accessibilité (reachability), en largeur,
+    en profondeur ou par approfondissement itératif (explore, find_deadlock),
   - fournit des fonctions d'analyse (deadlocks, transitions mortes, etc.),
-  - permet l'import/export du réseau et du graphe d'accessibilité (dict JSON, format DOT).
+  - vérifie des propriétés EF / AG / EG / AF sur les marquages, à la volée,
+  - cherche la plus courte séquence de tirs vers un marquage cible (find_path, A*),
+  - permet l'import/export du réseau et du graphe d'accessibilité (dict JSON, format DOT),
+- la classe CompiledNet (forme compilée utilisée par les explorations) et la génération
+  de ses fonctions de tir (firing_functions : code Python spécialisé pour chaque réseau),
+- la classe ReachabilityGraph (graphe d'accessibilité indexé : successeurs, prédécesseurs,
+  arêtes par transition, distances et chemins),
+- la classe ReachabilityStatistics (statistiques tenues pendant l'exploration) et la classe
+  Budget (échéance, mémoire, plafonds et annulation d'une analyse),
+- la classe Simulation (jeu de jetons rapide, plusieurs tirs par appel).
 
 Ce fichier est indépendant de l'interface graphique. Il peut être utilisé en ligne de commande
 ou par le frontend pour analyser un réseau créé par l'utilisateur.
@@ -17,16 +27,37 @@ ou par le frontend pour analyser un réseau créé par l'utilisateur.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+import ast
+import heapq
+import os
+import random
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
 
 
 
+# Tables pre/post : transition -> liste des (place, poids)
+PrePost = Tuple[Dict[str, List[Tuple[str, int]]], Dict[str, List[Tuple[str, int]]]]
+
+
 #  Modèle (data classes)
 
+# Objets immuables et sans __dict__ (slots) : quelques dizaines d'octets chacun, ce qui
+# compte pour des réseaux à des centaines de milliers de nœuds. On les remplace au lieu
+# de les modifier (PetriNet.set_arc_weight, PetriNet.set_initial_tokens).
+
 
 #Représente une place du réseau de Petri (avec son nombre initial de jetons).
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Place:
     id: str
     name: str
@@ -37,14 +68,28 @@ class Place:
             raise ValueError("Une place ne peut pas avoir un nombre de jetons négatif")
 
 
-@dataclass
+#Représente une transition ; delay / max_delay ne servent qu'à la simulation temporisée (timed.py).
+@dataclass(frozen=True, slots=True)
 class Transition:
     id: str
     name: str
+    priority: int = 0   # utilisée par la politique de simulation "priority"
+    delay: float = 0.0                 # délai de tir (déterministe si max_delay est None)
+    max_delay: Optional[float] = None  # borne haute d'un délai tiré uniformément dans [delay, max_delay]
 
-#Représente un arc du réseau de Petri (condition du poid positif).
-@dataclass
+    def __post_init__(self) -> None:
+        if self.delay < 0:
+            raise ValueError("Le délai d'une transition ne peut pas être négatif")
+        if self.max_delay is not None and self.max_delay < self.delay:
+            raise ValueError("max_delay doit être >= delay")
+
+    #True si la transition a un délai (réseau temporisé).
+    @property
+    def timed(self) -> bool:
+        return self.delay != 0 or self.max_delay is not None
 
+#Représente un arc du réseau de Petri (condition du poid positif).
+@dataclass(frozen=True, slots=True)
 class Arc:
     source_id: str
     target_id: str
@@ -56,34 +101,796 @@ class Arc:
 
 
 
+#  Tables d'arcs par indices (CSR)
+
+
+class ArcTables(NamedTuple):
+    pre_start: array
+    pre_place: array
+    pre_weight: array
+    post_start: array
+    post_place: array
+    post_weight: array
+
+
+#  Réseau compilé (marquages en tuples)
+
+"""
+Forme compilée d'un PetriNet pour les algorithmes d'exploration :
+- les marquages sont des tuples d'entiers dans l'ordre place_order() (comme marking_key),
+- pre[t] = ((indice de place, poids), ...) et delta[t] = ((indice de place, variation), ...),
+- les transitions sont désignées par leur indice dans transition_ids.
+
+Obtenue par PetriNet.compile() (mise en cache, invalidée à chaque modification du réseau).
+"""
+
+
+class CompiledNet:
+    def __init__(self, net: "PetriNet") -> None:
+        tables = net.arc_tables()
+
+        self.place_order: List[str] = net.place_order()
+        self.place_index: Dict[str, int] = {pid: i for i, pid in enumerate(self.place_order)}
+        self.transition_ids: List[str] = net.transition_ids()
+        # indice interne de place -> position dans place_order
+        perm = [self.place_index[pid] for pid in net.place_ids()]
+
+        self.pre: List[Tuple[Tuple[int, int], ...]] = []
+        self.delta: List[Tuple[Tuple[int, int], ...]] = []
+        for t in range(len(self.transition_ids)):
+            lo, hi = tables.pre_start[t], tables.pre_start[t + 1]
+            self.pre.append(tuple((perm[p], w) for p, w in zip(tables.pre_place[lo:hi], tables.pre_weight[lo:hi])))
+            d: Dict[int, int] = {}
+            for p, w in zip(tables.pre_place[lo:hi], tables.pre_weight[lo:hi]):
+                d[perm[p]] = d.get(perm[p], 0) - w
+            lo, hi = tables.post_start[t], tables.post_start[t + 1]
+            for p, w in zip(tables.post_place[lo:hi], tables.post_weight[lo:hi]):
+                d[perm[p]] = d.get(perm[p], 0) + w
+            self.delta.append(tuple((i, v) for i, v in sorted(d.items()) if v != 0))
+
+        # Fonctions de tir générées pour ce réseau (voir firing_functions)
+        self.successors, self.enabled_transitions = firing_functions(
+            len(self.place_order), tuple(self.pre), tuple(self.delta)
+        )
+
+    def enabled(self, t: int, m: Tuple[int, ...]) -> bool:
+        for i, w in self.pre[t]:
+            if m[i] < w:
+                return False
+        return True
+
+    def fire(self, t: int, m: Tuple[int, ...]) -> Tuple[int, ...]:
+        new = list(m)
+        for i, d in self.delta[t]:
+            new[i] += d
+        return tuple(new)
+
+    def to_marking(self, m: Tuple[int, ...]) -> Dict[str, int]:
+        return dict(zip(self.place_order, m))
+
+
+#  Fonctions de tir générées
+
+"""
+Le cœur des explorations est successors(m) : tester chaque transition puis construire le
+marquage suivant. Plutôt que de parcourir les tables pre/delta à chaque état, on génère
+pour chaque réseau le source Python de deux fonctions sans boucle, poids écrits en dur :
+- successors(m) -> [(indice de transition, marquage suivant), ...] dans l'ordre des transitions,
+- enabled(m) -> [indices des transitions franchissables].
+
+    def successors(m):
+        p0, p1, p2 = m
+        out = []
+        if p0 >= 1 and p2 >= 2:
+            out.append((0, (p0 - 1, p1 + 1, p2 - 2)))
+        ...
+
+Jusqu'à CODEGEN_UNPACK_PLACES places, le marquage est déballé en variables locales et le
+suivant écrit comme un tuple littéral ; au-delà, on copie le tuple en liste et on ne
+modifie que les places touchées. Au-delà de CODEGEN_MAX_TRANSITIONS transitions, le source
+serait trop long à compiler : on revient aux boucles génériques sur les tables.
+
+Les fonctions sont mises en cache par structure (nombre de places, pre, delta) : un réseau
+rechargé, ou modifié sans toucher aux arcs ni aux jetons, réutilise le code déjà compilé.
+"""
+
+CODEGEN_UNPACK_PLACES = 16
+CODEGEN_MAX_TRANSITIONS = 20000
+
+
+#Source Python des fonctions successors(m) et enabled(m) d'un réseau compilé.
+def firing_source(
+    num_places: int,
+    pre: Tuple[Tuple[Tuple[int, int], ...], ...],
+    delta: Tuple[Tuple[Tuple[int, int], ...], ...],
+) -> str:
+    unpack = num_places <= CODEGEN_UNPACK_PLACES
+
+    def ref(i: int) -> str:
+        return f"p{i}" if unpack else f"m[{i}]"
+
+    def shifted(i: int, d: int) -> str:
+        return f"{ref(i)} + {d}" if d > 0 else f"{ref(i)} - {-d}"
+
+    def guard(t: int) -> Optional[str]:
+        return " and ".join(f"{ref(i)} >= {w}" for i, w in pre[t]) or None
+
+    header = ["def successors(m):"]
+    if unpack and num_places:
+        header.append(f"    {', '.join(ref(i) for i in range(num_places))}, = m")
+
+    lines = header + ["    out = []"]
+    for t, changes in enumerate(delta):
+        cond = guard(t)
+        indent = "    "
+        if cond is not None:
+            lines.append(f"    if {cond}:")
+            indent = "        "
+        if not changes:
+            lines.append(f"{indent}out.append(({t}, m))")
+        elif unpack:
+            d = dict(changes)
+            items = ", ".join(shifted(i, d[i]) if i in d else ref(i) for i in range(num_places))
+            lines.append(f"{indent}out.append(({t}, ({items},)))")
+        else:
+            lines.append(f"{indent}n = list(m)")
+            lines += [f"{indent}n[{i}] {'+=' if d > 0 else '-='} {abs(d)}" for i, d in changes]
+            lines.append(f"{indent}out.append(({t}, tuple(n)))")
+    lines.append("    return out")
+
+    lines += [""] + [line.replace("def successors", "def enabled") for line in header] + ["    out = []"]
+    for t in range(len(pre)):
+        cond = guard(t)
+        if cond is None:
+            lines.append(f"    out.append({t})")
+        else:
+            lines += [f"    if {cond}:", f"        out.append({t})"]
+    lines.append("    return out")
+    return "\n".join(lines) + "\n"
+
+
+#Boucles génériques sur les tables (réseaux trop gros pour la génération de code).
+def _generic_firing_functions(
+    pre: Tuple[Tuple[Tuple[int, int], ...], ...],
+    delta: Tuple[Tuple[Tuple[int, int], ...], ...],
+) -> Tuple[Callable[[Tuple[int, ...]], List[Tuple[int, Tuple[int, ...]]]], Callable[[Tuple[int, ...]], List[int]]]:
+    def successors(m: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        result = []
+        for t, pre_t in enumerate(pre):
+            for i, w in pre_t:
+                if m[i] < w:
+                    break
+            else:
+                new = list(m)
+                for i, d in delta[t]:
+                    new[i] += d
+                result.append((t, tuple(new)))
+        return result
+
+    def enabled(m: Tuple[int, ...]) -> List[int]:
+        return [t for t, pre_t in enumerate(pre) if all(m[i] >= w for i, w in pre_t)]
+
+    return successors, enabled
+
+
+#Fonctions (successors, enabled) d'un réseau, générées et compilées une fois par structure.
+@lru_cache(maxsize=64)
+def firing_functions(
+    num_places: int,
+    pre: Tuple[Tuple[Tuple[int, int], ...], ...],
+    delta: Tuple[Tuple[Tuple[int, int], ...], ...],
+) -> Tuple[Callable[[Tuple[int, ...]], List[Tuple[int, Tuple[int, ...]]]], Callable[[Tuple[int, ...]], List[int]]]:
+    if len(pre) > CODEGEN_MAX_TRANSITIONS:
+        return _generic_firing_functions(pre, delta)
+    namespace: Dict[str, Any] = {}
+    exec(compile(firing_source(num_places, pre, delta), "<petri-firing>", "exec"), namespace)
+    return namespace["successors"], namespace["enabled"]
+
+
+
+#  Budgets d'analyse
+
+"""
+Un Budget borne une analyse au-delà de max_states :
+- time_limit : durée maximale en secondes, l'échéance (deadline) part de la création du
+  budget : un même budget couvre toute une analyse (exploration puis exports),
+- max_memory : plafond de mémoire résidente du processus, en octets,
+- max_states / max_edges : nombres d'états / d'arêtes stockés,
+- cancel : jeton d'annulation (CancelToken, ou tout objet avec un attribut cancelled),
+  positionné depuis un autre thread.
+
+Les plafonds d'états et d'arêtes sont comparés à chaque ajout ; l'horloge, la mémoire et
+l'annulation sont lues tous les check_every états développés (poll), pour rester
+négligeables dans la boucle d'exploration. Une analyse arrêtée n'échoue pas : elle rend
+un résultat tronqué (reprenable pour reachability_bfs) avec stopped_by = la limite
+atteinte, parmi STOP_REASONS (None si l'exploration est complète).
+
+Une étape préalable (analyse structurelle) reçoit un sous-budget (share) : elle ne peut
+pas consommer le temps ni la marge mémoire réservés à l'exploration qui suit.
+
+La mémoire résidente est lue dans /proc/self/statm ; ailleurs on prend le pic
+(resource.getrusage), et sans ces deux sources (Windows) max_memory n'est pas vérifié.
+"""
+
+STOP_REASONS = ("max_states", "max_edges", "deadline", "memory", "cancelled")
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+#Mémoire résidente du processus en octets (None si on ne sait pas la lire).
+def resident_memory() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Budget:
+    def __init__(
+        self,
+        time_limit: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        max_states: Optional[int] = None,
+        max_edges: Optional[int] = None,
+        cancel: Optional[Any] = None,
+        check_every: int = 256,
+    ) -> None:
+        for name, value in (("time_limit", time_limit), ("max_memory", max_memory),
+                            ("max_states", max_states), ("max_edges", max_edges)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} doit être > 0")
+        if check_every <= 0:
+            raise ValueError("check_every doit être > 0")
+
+        self.deadline: Optional[float] = None if time_limit is None else time.monotonic() + time_limit
+        self.max_memory = max_memory
+        self.max_states = max_states
+        self.max_edges = max_edges
+        self.cancel = cancel
+        self.check_every = check_every
+
+    #Plafond d'états effectif : le plus strict entre max_states de l'analyse et celui du budget.
+    def state_cap(self, max_states: int) -> int:
+        return max_states if self.max_states is None else min(max_states, self.max_states)
+
+    def edge_cap(self) -> int:
+        return sys.maxsize if self.max_edges is None else self.max_edges
+
+    #Vérification périodique : raison de l'arrêt ("cancelled", "deadline", "memory") ou None.
+    def poll(self) -> Optional[str]:
+        if self.cancel is not None and self.cancel.cancelled:
+            return "cancelled"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline"
+        if self.max_memory is not None:
+            rss = resident_memory()
+            if rss is not None and rss >= self.max_memory:
+                return "memory"
+        return None
+
+    #Sous-budget d'une étape préalable : même annulation, fraction du temps et de la marge
+    #mémoire restants ; le reste est gardé pour l'étape suivante.
+    def share(self, fraction: float) -> "Budget":
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction doit être dans ]0, 1]")
+        sub = Budget(cancel=self.cancel, check_every=self.check_every)
+        if self.deadline is not None:
+            now = time.monotonic()
+            sub.deadline = now + max(self.deadline - now, 0.0) * fraction
+        if self.max_memory is not None:
+            rss = resident_memory()
+            sub.max_memory = self.max_memory if rss is None else rss + int(max(self.max_memory - rss, 0) * fraction)
+        return sub
+
+
+#  Statistiques d'exploration
+
+"""
+Statistiques mises à jour pendant l'exploration, au fil des états découverts, au lieu de
+re-parcourir ensuite les états et les arêtes :
+- par place : minimum, maximum et histogramme {jetons: nombre d'états},
+- sauf (1-safe) : nombre d'états où une place a plus d'un jeton, un exemple de tel
+  marquage et les places concernées,
+- transitions tirées (tableau de bits ; on arrête de regarder dès que toutes ont tiré),
+- distribution des degrés sortants {nombre de successeurs: nombre d'états développés}
+  (le degré 0 compte les deadlocks),
+- profondeur BFS : distance maximale au marquage initial et nombre d'états par couche.
+
+Les marquages sont des tuples dans l'ordre place_order() (réseau compilé). L'histogramme de
+toutes les places tient dans un seul Counter de couples (place, jetons), mis à jour en C.
+Sur une exploration tronquée, les états de la frontière sont comptés mais pas développés.
+"""
+
+
+class ReachabilityStatistics:
+    def __init__(self, cn: CompiledNet) -> None:
+        self._cn = cn
+        self._positions = range(len(cn.place_order))
+        self.num_states = 0
+        self.tokens: Counter = Counter()           # (indice de place, jetons) -> nombre d'états
+        self.unsafe_states = 0
+        self.unsafe_example: Optional[Tuple[int, ...]] = None
+        self.fired = bytearray(len(cn.transition_ids))
+        self.unfired = len(cn.transition_ids)      # transitions pas encore tirées
+        self.out_degree: Counter = Counter()
+        self.depths: Counter = Counter()           # profondeur BFS -> nombre d'états
+
+    def add_state(self, key: Tuple[int, ...], depth: int) -> None:
+        self.num_states += 1
+        self.tokens.update(zip(self._positions, key))
+        self.depths[depth] += 1
+        if key and max(key) > 1:
+            self.unsafe_states += 1
+            if self.unsafe_example is None:
+                self.unsafe_example = key
+
+    def add_expansion(self, num_successors: int) -> None:
+        self.out_degree[num_successors] += 1
+
+    def mark_fired(self, t: int) -> None:
+        if not self.fired[t]:
+            self.fired[t] = 1
+            self.unfired -= 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cn = self._cn
+        histograms: List[Dict[int, int]] = [{} for _ in cn.place_order]
+        for (i, tokens), count in sorted(self.tokens.items()):
+            histograms[i][tokens] = count
+        places = {
+            pid: {"min": min(h), "max": max(h), "histogram": h} if h else {"min": 0, "max": 0, "histogram": {}}
+            for pid, h in zip(cn.place_order, histograms)
+        }
+        fired = [tid for t, tid in enumerate(cn.transition_ids) if self.fired[t]]
+        return {
+            "num_states": self.num_states,
+            "places": places,
+            "safe": self.unsafe_states == 0,
+            "unsafe_states": self.unsafe_states,
+            "unsafe_places": [pid for pid in cn.place_order if places[pid]["max"] > 1],
+            "unsafe_example": None if self.unsafe_example is None else cn.to_marking(self.unsafe_example),
+            "fired_transitions": sorted(fired),
+            "never_fired_transitions": sorted(set(cn.transition_ids) - set(fired)),
+            "out_degree": dict(sorted(self.out_degree.items())),
+            "max_depth": max(self.depths) if self.depths else 0,
+            "depth_histogram": dict(sorted(self.depths.items())),
+        }
+
+
+#  Stratégies d'exploration
+
+"""
+Explorations de l'espace d'états sur le réseau compilé, au choix (SEARCH_STRATEGIES) :
+- "bfs" : en largeur, file deque (les états développés quittent la file),
+- "dfs" : en profondeur, pile de trames compactes (état, prochaine transition à essayer)
+  dans des array : les successeurs ne sont pas stockés, on reprend le test des
+  transitions là où on s'était arrêté,
+- "bounded_dfs" : DFS limité à max_depth tirs depuis le marquage initial,
+- "iterative_deepening" : DFS bornés successifs (profondeur 1, 2, ...) jusqu'à ce que plus
+  rien ne soit coupé (ou jusqu'à max_depth).
+
+La frontière d'un DFS est le chemin courant (une trame par tir), celle d'un BFS une couche
+entière : sur un réseau profond et étroit, le DFS garde bien moins d'états en attente, et la
+pile donne directement la trace vers un deadlock. L'approfondissement itératif trouve le
+deadlock le moins profond avec la mémoire d'un DFS, en refaisant les premiers niveaux.
+
+Un DFS borné qui atteint un état déjà vu par un chemin plus court le redéveloppe : sinon
+un état vu d'abord à la limite de profondeur couperait ses successeurs.
+Chaque stratégie rend un _Exploration (états en tuples, arêtes, deadlocks, profil mémoire).
+"""
+
+
+class _Exploration:
+    __slots__ = ("visited", "keys", "edges", "deadlocks", "trace", "truncated", "stopped_by",
+                 "cutoff", "frontier", "peak_frontier", "iterations", "depth_limit")
+
+    def __init__(self, m0: Tuple[int, ...], frontier: str, depth_limit: Optional[int]) -> None:
+        self.visited: Dict[Tuple[int, ...], int] = {m0: 0}
+        self.keys: List[Tuple[int, ...]] = [m0]
+        self.edges: List[Tuple[int, str, int]] = []
+        self.deadlocks: List[int] = []
+        self.trace: Optional[List[str]] = None   # tirs vers le premier deadlock trouvé
+        self.truncated = False                   # limite atteinte ou arrêt au premier deadlock
+        self.stopped_by: Optional[str] = None    # limite atteinte (voir Budget)
+        self.cutoff = 0                          # états non développés à cause de la profondeur
+        self.frontier = frontier                 # "queue" ou "stack"
+        self.peak_frontier = 0                   # taille maximale de la file / pile
+        self.iterations = 1
+        self.depth_limit = depth_limit
+
+    def memory(self) -> Dict[str, Any]:
+        return {
+            "frontier": self.frontier,
+            "peak_frontier": self.peak_frontier,
+            "stored_states": len(self.keys),
+            "stored_edges": len(self.edges),
+        }
+
+
+def _explore_bfs(cn: CompiledNet, m0: Tuple[int, ...], max_states: int, max_depth: Optional[int],
+                 stop_at_deadlock: bool, budget: Optional[Budget]) -> _Exploration:
+    ex = _Exploration(m0, "queue", max_depth)
+    successors, tids = cn.successors, cn.transition_ids
+    edge_cap = sys.maxsize if budget is None else budget.edge_cap()
+    check_every = 0 if budget is None else budget.check_every
+    visited, keys, edges = ex.visited, ex.keys, ex.edges
+    depth = array("l", [0])
+    # Arbre BFS (état parent, transition) pour la trace la plus courte vers un deadlock
+    parent = array("q", [-1])
+    via = array("q", [-1])
+
+    queue = deque([0])
+    peak = 1
+    expansions = 0
+    while queue:
+        if check_every and expansions % check_every == 0:
+            ex.stopped_by = budget.poll()
+            if ex.stopped_by is not None:
+                ex.truncated = True
+                break
+        expansions += 1
+        sid = queue.popleft()
+        d = depth[sid]
+        if max_depth is not None and d >= max_depth:
+            ex.cutoff += 1
+            continue
+
+        succ = successors(keys[sid])
+        if not succ:
+            ex.deadlocks.append(sid)
+            if ex.trace is None:
+                trace, s = [], sid
+                while parent[s] >= 0:
+                    trace.append(tids[via[s]])
+                    s = parent[s]
+                ex.trace = trace[::-1]
+            if stop_at_deadlock:
+                ex.truncated = len(queue) > 0
+                break
+
+        for t, key in succ:
+            if len(edges) >= edge_cap:
+                ex.truncated, ex.stopped_by, ex.peak_frontier = True, "max_edges", peak
+                return ex
+            to = visited.get(key)
+            if to is None:
+                if len(keys) >= max_states:
+                    ex.truncated, ex.stopped_by, ex.peak_frontier = True, "max_states", peak
+                    return ex
+                to = len(keys)
+                visited[key] = to
+                keys.append(key)
+                depth.append(d + 1)
+                parent.append(sid)
+                via.append(t)
+                queue.append(to)
+            edges.append((sid, tids[t], to))
+        if len(queue) > peak:
+            peak = len(queue)
+
+    ex.peak_frontier = peak
+    return ex
+
+
+def _explore_dfs(cn: CompiledNet, m0: Tuple[int, ...], max_states: int, max_depth: Optional[int],
+                 stop_at_deadlock: bool, budget: Optional[Budget]) -> _Exploration:
+    ex = _Exploration(m0, "stack", max_depth)
+    edge_cap = sys.maxsize if budget is None else budget.edge_cap()
+    check_every = 0 if budget is None else budget.check_every
+    pre, delta, tids = cn.pre, cn.delta, cn.transition_ids
+    n_trans = len(pre)
+    visited, keys, edges, deadlocks = ex.visited, ex.keys, ex.edges, ex.deadlocks
+    bounded = max_depth is not None
+    depth = array("l", [0])       # profondeur la plus faible connue (DFS borné)
+    expanded = bytearray(1)       # état déjà développé (arêtes enregistrées)
+
+    # Trames : état, prochaine transition à essayer, premier développement de l'état
+    stack_state = array("q")
+    stack_next = array("q")
+    stack_first = bytearray()
+    if bounded and max_depth <= 0:
+        ex.cutoff = 1
+        return ex
+    stack_state.append(0)
+    stack_next.append(0)
+    stack_first.append(1)
+    expanded[0] = 1
+    peak = 1
+    steps = 0
+
+    while stack_state:
+        if check_every and steps % check_every == 0:
+            ex.stopped_by = budget.poll()
+            if ex.stopped_by is not None:
+                ex.truncated = True
+                break
+        steps += 1
+        sid = stack_state[-1]
+        t = stack_next[-1]
+        m = keys[sid]
+        while t < n_trans:
+            for i, w in pre[t]:
+                if m[i] < w:
+                    break
+            else:
+                break
+            t += 1
+
+        if t == n_trans:
+            if stack_next[-1] == 0 and stack_first[-1]:
+                deadlocks.append(sid)
+                if ex.trace is None:
+                    ex.trace = [tids[stack_next[j] - 1] for j in range(len(stack_next) - 1)]
+                if stop_at_deadlock:
+                    ex.truncated = len(stack_state) > 1
+                    break
+            stack_state.pop()
+            stack_next.pop()
+            stack_first.pop()
+            continue
+
+        if stack_first[-1] and len(edges) >= edge_cap:
+            ex.truncated, ex.stopped_by = True, "max_edges"
+            break
+        stack_next[-1] = t + 1
+        new = list(m)
+        for i, dv in delta[t]:
+            new[i] += dv
+        key = tuple(new)
+        d = len(stack_state)
+
+        to = visited.get(key)
+        if to is None:
+            if len(keys) >= max_states:
+                ex.truncated, ex.stopped_by = True, "max_states"
+                break
+            to = len(keys)
+            visited[key] = to
+            keys.append(key)
+            depth.append(d)
+            expanded.append(0)
+            push = True
+        else:
+            # Déjà vu : on ne redéveloppe que s'il est atteint plus tôt (DFS borné)
+            push = bounded and d < depth[to]
+            if push:
+                depth[to] = d
+        if stack_first[-1]:
+            edges.append((sid, tids[t], to))
+
+        if push and not (bounded and d >= max_depth):
+            stack_state.append(to)
+            stack_next.append(0)
+            stack_first.append(0 if expanded[to] else 1)
+            expanded[to] = 1
+            if len(stack_state) > peak:
+                peak = len(stack_state)
+
+    if bounded:
+        ex.cutoff = sum(1 for s in range(len(keys)) if not expanded[s] and depth[s] >= max_depth)
+    ex.peak_frontier = peak
+    return ex
+
+
+def _explore_bounded_dfs(cn: CompiledNet, m0: Tuple[int, ...], max_states: int, max_depth: Optional[int],
+                         stop_at_deadlock: bool, budget: Optional[Budget]) -> _Exploration:
+    if max_depth is None:
+        raise ValueError("bounded_dfs demande max_depth")
+    return _explore_dfs(cn, m0, max_states, max_depth, stop_at_deadlock, budget)
+
+
+def _explore_iterative_deepening(cn: CompiledNet, m0: Tuple[int, ...], max_states: int, max_depth: Optional[int],
+                                 stop_at_deadlock: bool, budget: Optional[Budget]) -> _Exploration:
+    limit, peak, iterations = 1, 0, 0
+    while True:
+        iterations += 1
+        ex = _explore_dfs(cn, m0, max_states, limit, stop_at_deadlock, budget)
+        peak = max(peak, ex.peak_frontier)
+        if (
+            ex.cutoff == 0
+            or ex.truncated
+            or (stop_at_deadlock and ex.deadlocks)
+            or (max_depth is not None and limit >= max_depth)
+        ):
+            break
+        limit += 1
+    ex.iterations = iterations
+    ex.peak_frontier = peak
+    return ex
+
+
+SEARCH_STRATEGIES: Dict[str, Callable[..., _Exploration]] = {
+    "bfs": _explore_bfs,
+    "dfs": _explore_dfs,
+    "bounded_dfs": _explore_bounded_dfs,
+    "iterative_deepening": _explore_iterative_deepening,
+}
+
+
+#  Prédicats sur les marquages
+
+"""
+Un prédicat est une expression Python restreinte sur les IDs de places, par exemple
+"P3 >= 2 and P5 == 0" ou "P1 + P2 <= 1". Sont acceptés : entiers, noms de places,
++ - *, comparaisons, and / or / not, True / False et parenthèses.
+
+L'expression est vérifiée nœud par nœud puis compilée en une fonction sur les
+marquages-tuples (les noms de places deviennent m[indice]) : aucun eval de texte libre.
+"""
+
+_PREDICATE_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Name, ast.Load, ast.Constant,
+)
+
+
+class _PlaceToIndex(ast.NodeTransformer):
+    def __init__(self, place_index: Dict[str, int]) -> None:
+        self.place_index = place_index
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id not in self.place_index:
+            raise ValueError(f"Place inconnue dans le prédicat: {node.id}")
+        index = ast.Subscript(
+            value=ast.Name(id="m", ctx=ast.Load()),
+            slice=ast.Constant(value=self.place_index[node.id]),
+            ctx=ast.Load(),
+        )
+        return ast.copy_location(index, node)
+
+
+def compile_predicate(expression: str, place_order: List[str]) -> Callable[[Tuple[int, ...]], bool]:
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Prédicat invalide: {expression!r} ({e.msg})") from None
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _PREDICATE_NODES):
+            raise ValueError(f"Construction non autorisée dans le prédicat: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (bool, int)):
+            raise ValueError(f"Constante non autorisée dans le prédicat: {node.value!r}")
+
+    body = _PlaceToIndex({pid: i for i, pid in enumerate(place_order)}).visit(tree.body)
+    func = ast.Expression(
+        body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[], args=[ast.arg(arg="m")], vararg=None,
+                kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[],
+            ),
+            body=body,
+        )
+    )
+    ast.fix_missing_locations(func)
+    return eval(compile(func, "<predicat>", "eval"), {"__builtins__": {}})
+
+
+
 #  PetriNet (moteur)
 
+# Fréquence (en nouveaux états) des appels au callback progress des explorations
+PROGRESS_EVERY = 1000
+
+
 
 class PetriNet:
     def __init__(self) -> None:
-        self.places: Dict[str, Place] = {}
-        self.transitions: Dict[str, Transition] = {}
-        self.arcs: List[Arc] = []
+        self._places: Dict[str, Place] = {}
+        self._transitions: Dict[str, Transition] = {}
+
+        # Interning : chaque place / transition reçoit à l'insertion un indice entier dense.
+        # Une suppression laisse un trou (None) ; les indices sont recompactés en une passe,
+        # dans l'ordre de création, au prochain accès (_compact).
+        self._place_ids: List[Optional[str]] = []
+        self._place_index: Dict[str, int] = {}
+        self._transition_ids: List[Optional[str]] = []
+        self._transition_index: Dict[str, int] = {}
+        self._holes = 0
+        # Jetons initiaux, indexés comme _place_ids
+        self._tokens = array("q")
+
+        # Stockage indexé des arcs :
+        # - _arcs[(source, cible)] -> Arc (ordre d'insertion conservé),
+        # - _incoming[noeud][source] / _outgoing[noeud][cible] -> Arc (adjacence par nœud).
+        self._arcs: Dict[Tuple[str, str], Arc] = {}
+        self._incoming: Dict[str, Dict[str, Arc]] = {}
+        self._outgoing: Dict[str, Dict[str, Arc]] = {}
+
+        # Structures compilées (tables pre/post, tables de poids par indices, CompiledNet),
+        # reconstruites à la demande et invalidées à chaque modification du réseau.
+        self._compiled: Optional[PrePost] = None
+        self._arc_tables: Optional[ArcTables] = None
+        self._compiled_net: Optional[CompiledNet] = None
+
+        # Profondeur des transactions batch() en cours (0 = édition directe).
+        self._batch_depth = 0
+
+    #Places et transitions par ID (vues en lecture : on modifie le réseau par ses méthodes).
+    @property
+    def places(self) -> Mapping[str, Place]:
+        return MappingProxyType(self._places)
+
+    @property
+    def transitions(self) -> Mapping[str, Transition]:
+        return MappingProxyType(self._transitions)
+
+    #Liste des arcs dans l'ordre d'insertion (vue en lecture, reconstruite à chaque appel).
+    @property
+    def arcs(self) -> List[Arc]:
+        return list(self._arcs.values())
+
+    #IDs des places / transitions dans l'ordre de leurs indices internes (= ordre de création).
+    def place_ids(self) -> List[str]:
+        self._compact()
+        return list(self._place_ids)
+
+    def transition_ids(self) -> List[str]:
+        self._compact()
+        return list(self._transition_ids)
 
     # Edition / cohérence 
 
     # Ajoute une place au réseau, en vérifiant que son ID n'est pas déjà utilisé.
     def add_place(self, place: Place) -> None:
-        if place.id in self.places or place.id in self.transitions:
+        if place.id in self._places or place.id in self._transitions:
             raise ValueError(f"ID déjà utilisé: {place.id}")
-        self.places[place.id] = place
+        self._places[place.id] = place
+        self._place_index[place.id] = len(self._place_ids)
+        self._place_ids.append(place.id)
+        self._tokens.append(place.initial_tokens)
+        self._incoming.setdefault(place.id, {})
+        self._outgoing.setdefault(place.id, {})
+        self._invalidate()
 
     #Ajoute une transition au réseau, et vérifie l'ID.
     def add_transition(self, transition: Transition) -> None:
-        if transition.id in self.transitions or transition.id in self.places:
+        if transition.id in self._transitions or transition.id in self._places:
             raise ValueError(f"ID déjà utilisé: {transition.id}")
-        self.transitions[transition.id] = transition
-
+        self._transitions[transition.id] = transition
+        self._transition_index[transition.id] = len(self._transition_ids)
+        self._transition_ids.append(transition.id)
+        self._incoming.setdefault(transition.id, {})
+        self._outgoing.setdefault(transition.id, {})
+        self._invalidate()
+
+    #Ajoute un arc. Dans une transaction batch(), la vérification est faite une seule fois à la fin.
     def add_arc(self, arc: Arc) -> None:
-        src_is_place = arc.source_id in self.places
-        src_is_trans = arc.source_id in self.transitions
-        tgt_is_place = arc.target_id in self.places
-        tgt_is_trans = arc.target_id in self.transitions
+        key = (arc.source_id, arc.target_id)
+        if key in self._arcs:
+            raise ValueError(f"Arc déjà existant: {arc.source_id} -> {arc.target_id}")
+        if self._batch_depth == 0:
+            self._check_arc(arc)
+
+        self._arcs[key] = arc
+        self._outgoing.setdefault(arc.source_id, {})[arc.target_id] = arc
+        self._incoming.setdefault(arc.target_id, {})[arc.source_id] = arc
+        self._invalidate()
+
+    #Vérifie qu'un arc relie une place existante à une transition existante (ou l'inverse).
+    def _check_arc(self, arc: Arc) -> None:
+        src_is_place = arc.source_id in self._places
+        src_is_trans = arc.source_id in self._transitions
+        tgt_is_place = arc.target_id in self._places
+        tgt_is_trans = arc.target_id in self._transitions
 
         if not (src_is_place or src_is_trans):
             raise ValueError(f"Source inconnue: {arc.source_id}")
@@ -96,13 +903,229 @@ class PetriNet:
                 "(pas Place->Place ni Transition->Transition)"
             )
 
-        self.arcs.append(arc)
+    #Renvoie l'arc source -> cible, ou None s'il n'existe pas (O(1)).
+    def get_arc(self, source_id: str, target_id: str) -> Optional[Arc]:
+        return self._arcs.get((source_id, target_id))
+
+    #Arcs entrants / sortants d'un nœud (place ou transition).
+    def incoming_arcs(self, node_id: str) -> List[Arc]:
+        return list(self._incoming.get(node_id, {}).values())
+
+    def outgoing_arcs(self, node_id: str) -> List[Arc]:
+        return list(self._outgoing.get(node_id, {}).values())
+
+    #Supprime l'arc source -> cible et le renvoie.
+    def remove_arc(self, source_id: str, target_id: str) -> Arc:
+        arc = self._arcs.pop((source_id, target_id), None)
+        if arc is None:
+            raise ValueError(f"Arc inconnu: {source_id} -> {target_id}")
+        del self._outgoing[source_id][target_id]
+        del self._incoming[target_id][source_id]
+        self._invalidate()
+        return arc
+
+    #Modifie le poids d'un arc existant (Arc est immuable : l'objet est remplacé).
+    def set_arc_weight(self, source_id: str, target_id: str, weight: int) -> None:
+        arc = self.get_arc(source_id, target_id)
+        if arc is None:
+            raise ValueError(f"Arc inconnu: {source_id} -> {target_id}")
+        arc = replace(arc, weight=weight)
+        self._arcs[(source_id, target_id)] = arc
+        self._outgoing[source_id][target_id] = arc
+        self._incoming[target_id][source_id] = arc
+        self._invalidate()
+
+    #Modifie le nombre initial de jetons d'une place (Place est immuable : l'objet est remplacé).
+    def set_initial_tokens(self, place_id: str, tokens: int) -> None:
+        if place_id not in self._places:
+            raise ValueError(f"Place inconnue: {place_id}")
+        self._places[place_id] = replace(self._places[place_id], initial_tokens=tokens)
+        self._tokens[self._place_index[place_id]] = tokens
+
+    #Supprime une place et tous ses arcs incidents (coût proportionnel au degré de la place).
+    def remove_place(self, place_id: str) -> Place:
+        if place_id not in self._places:
+            raise ValueError(f"Place inconnue: {place_id}")
+        self._remove_incident_arcs(place_id)
+        self._place_ids[self._place_index.pop(place_id)] = None
+        self._holes += 1
+        self._invalidate()
+        return self._places.pop(place_id)
+
+    #Supprime une transition et tous ses arcs incidents.
+    def remove_transition(self, transition_id: str) -> Transition:
+        if transition_id not in self._transitions:
+            raise ValueError(f"Transition inconnue: {transition_id}")
+        self._remove_incident_arcs(transition_id)
+        self._transition_ids[self._transition_index.pop(transition_id)] = None
+        self._holes += 1
+        self._invalidate()
+        return self._transitions.pop(transition_id)
+
+    def _remove_incident_arcs(self, node_id: str) -> None:
+        for source_id in self._incoming.pop(node_id, {}):
+            del self._arcs[(source_id, node_id)]
+            del self._outgoing[source_id][node_id]
+        for target_id in self._outgoing.pop(node_id, {}):
+            del self._arcs[(node_id, target_id)]
+            del self._incoming[target_id][node_id]
+
+    #Recompacte les indices internes après des suppressions (une passe, ordre de création conservé).
+    def _compact(self) -> None:
+        if self._holes == 0:
+            return
+        kept = [i for i, pid in enumerate(self._place_ids) if pid is not None]
+        self._tokens = array("q", (self._tokens[i] for i in kept))
+        self._place_ids = [self._place_ids[i] for i in kept]
+        self._place_index = {pid: i for i, pid in enumerate(self._place_ids)}
+        self._transition_ids = [tid for tid in self._transition_ids if tid is not None]
+        self._transition_index = {tid: i for i, tid in enumerate(self._transition_ids)}
+        self._holes = 0
+
+    #Vide complètement le réseau.
+    def clear(self) -> None:
+        self._places.clear()
+        self._transitions.clear()
+        self._place_ids = []
+        self._place_index = {}
+        self._transition_ids = []
+        self._transition_index = {}
+        self._holes = 0
+        self._tokens = array("q")
+        self._arcs.clear()
+        self._incoming.clear()
+        self._outgoing.clear()
+        self._invalidate()
+
+    #Vérifie la cohérence de tous les arcs (utilisé en fin de transaction batch()).
+    def validate(self) -> None:
+        for arc in self._arcs.values():
+            self._check_arc(arc)
+
+    """
+    Transaction d'édition groupée :
+
+        with net.batch():
+            net.add_place(...)
+            net.add_arc(...)
+            net.remove_transition(...)
+
+    Les arcs ne sont vérifiés qu'une seule fois à la sortie du bloc et les structures
+    compilées ne sont reconstruites qu'une fois. Si la validation (ou le bloc) échoue,
+    le réseau est remis dans son état d'avant la transaction.
+    """
+
+    @contextmanager
+    def batch(self) -> Iterator["PetriNet"]:
+        if self._batch_depth > 0:
+            # Transaction imbriquée : tout est validé par la transaction englobante
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+
+        # Les objets du modèle sont immuables : des copies superficielles suffisent
+        saved = (
+            dict(self._places),
+            dict(self._transitions),
+            list(self._place_ids),
+            dict(self._place_index),
+            list(self._transition_ids),
+            dict(self._transition_index),
+            self._holes,
+            array("q", self._tokens),
+            dict(self._arcs),
+            {n: dict(a) for n, a in self._incoming.items()},
+            {n: dict(a) for n, a in self._outgoing.items()},
+        )
+        self._batch_depth = 1
+        try:
+            yield self
+            self._batch_depth = 0
+            self.validate()
+        except BaseException:
+            self._batch_depth = 0
+            (
+                self._places, self._transitions,
+                self._place_ids, self._place_index,
+                self._transition_ids, self._transition_index,
+                self._holes, self._tokens,
+                self._arcs, self._incoming, self._outgoing,
+            ) = saved
+            raise
+        finally:
+            self._batch_depth = 0
+            self._invalidate()
+
+    #Invalide les structures compilées (appelé après chaque modification).
+    def _invalidate(self) -> None:
+        self._compiled = None
+        self._arc_tables = None
+        self._compiled_net = None
+
+    """
+    Construit un réseau d'un seul bloc (import de gros fichiers : PNML, format binaire).
+    Les dictionnaires et index sont remplis directement, puis l'ensemble est vérifié
+    en une passe (IDs uniques, arcs Place<->Transition) au lieu d'un contrôle par élément.
+    """
+
+    @classmethod
+    def from_elements(
+        cls,
+        places: List[Place],
+        transitions: List[Transition],
+        arcs: List[Arc],
+    ) -> "PetriNet":
+        net = cls()
+        places_map = {p.id: p for p in places}
+        trans_map = {t.id: t for t in transitions}
+        if len(places_map) != len(places) or len(trans_map) != len(transitions):
+            raise ValueError("ID déjà utilisé (doublon dans les places ou les transitions)")
+        shared = places_map.keys() & trans_map.keys()
+        if shared:
+            raise ValueError(f"ID déjà utilisé: {sorted(shared)[0]}")
+
+        net._places = places_map
+        net._transitions = trans_map
+        net._place_ids = list(places_map)
+        net._place_index = {pid: i for i, pid in enumerate(net._place_ids)}
+        net._tokens = array("q", (p.initial_tokens for p in places))
+        net._transition_ids = list(trans_map)
+        net._transition_index = {tid: i for i, tid in enumerate(net._transition_ids)}
+
+        incoming: Dict[str, Dict[str, Arc]] = {nid: {} for nid in places_map}
+        outgoing: Dict[str, Dict[str, Arc]] = {nid: {} for nid in places_map}
+        for tid in trans_map:
+            incoming[tid] = {}
+            outgoing[tid] = {}
+
+        arc_map: Dict[Tuple[str, str], Arc] = {}
+        for arc in arcs:
+            src = arc.source_id
+            tgt = arc.target_id
+            if not ((src in places_map and tgt in trans_map) or (src in trans_map and tgt in places_map)):
+                # Erreur : on laisse _check_arc produire le message précis
+                net._check_arc(arc)
+            key = (src, tgt)
+            if key in arc_map:
+                raise ValueError(f"Arc déjà existant: {src} -> {tgt}")
+            arc_map[key] = arc
+            outgoing[src][tgt] = arc
+            incoming[tgt][src] = arc
+
+        net._arcs = arc_map
+        net._incoming = incoming
+        net._outgoing = outgoing
+        return net
 
     # Marquage / tables pre-post 
 
     #Construit le marquage initial à partir des jetons initiaux de chaque place.
     def initial_marking(self) -> Dict[str, int]:
-        return {pid: p.initial_tokens for pid, p in self.places.items()}
+        self._compact()
+        return dict(zip(self._place_ids, self._tokens))
 
     """
         Construit les tables pre et post :
@@ -110,20 +1133,55 @@ class PetriNet:
         - post[t] = liste des (place, poids) produits par la transition t.
         """
     
-    def build_pre_post(self) -> Tuple[Dict[str, List[Tuple[str, int]]], Dict[str, List[Tuple[str, int]]]]:
-        pre: Dict[str, List[Tuple[str, int]]] = {tid: [] for tid in self.transitions}
-        post: Dict[str, List[Tuple[str, int]]] = {tid: [] for tid in self.transitions}
-
-        for arc in self.arcs:
-            if arc.source_id in self.places and arc.target_id in self.transitions:
-                pre[arc.target_id].append((arc.source_id, arc.weight))
-            elif arc.source_id in self.transitions and arc.target_id in self.places:
-                post[arc.source_id].append((arc.target_id, arc.weight))
-            else:
-                raise ValueError("Arc incohérent: il ne relie pas Place->Transition ou Transition->Place")
+    def build_pre_post(self) -> PrePost:
+        pre: Dict[str, List[Tuple[str, int]]] = {}
+        post: Dict[str, List[Tuple[str, int]]] = {}
+
+        for tid in self.transitions:
+            pre[tid] = []
+            for arc in self._incoming.get(tid, {}).values():
+                if arc.source_id not in self.places:
+                    raise ValueError("Arc incohérent: il ne relie pas Place->Transition ou Transition->Place")
+                pre[tid].append((arc.source_id, arc.weight))
+            post[tid] = []
+            for arc in self._outgoing.get(tid, {}).values():
+                if arc.target_id not in self.places:
+                    raise ValueError("Arc incohérent: il ne relie pas Place->Transition ou Transition->Place")
+                post[tid].append((arc.target_id, arc.weight))
 
         return pre, post
 
+    #Tables pre/post mises en cache (reconstruites seulement après une modification du réseau).
+    def _pre_post(self) -> PrePost:
+        if self._compiled is None:
+            self._compiled = self.build_pre_post()
+        return self._compiled
+
+    """
+    Tables de poids par indices internes, au format CSR (tableaux d'entiers) :
+    les pré-places de la transition d'indice t sont
+        pre_place[pre_start[t]:pre_start[t + 1]]  avec les poids  pre_weight[...]
+    (même chose pour post). Base de CompiledNet et de Simulation : aucune chaîne à hacher.
+    """
+
+    def arc_tables(self) -> ArcTables:
+        if self._arc_tables is None:
+            self._compact()
+            pre_start, pre_place, pre_weight = array("l", [0]), array("l"), array("q")
+            post_start, post_place, post_weight = array("l", [0]), array("l"), array("q")
+            place_index = self._place_index
+            for tid in self._transition_ids:
+                for arc in self._incoming[tid].values():
+                    pre_place.append(place_index[arc.source_id])
+                    pre_weight.append(arc.weight)
+                for arc in self._outgoing[tid].values():
+                    post_place.append(place_index[arc.target_id])
+                    post_weight.append(arc.weight)
+                pre_start.append(len(pre_place))
+                post_start.append(len(post_place))
+            self._arc_tables = ArcTables(pre_start, pre_place, pre_weight, post_start, post_place, post_weight)
+        return self._arc_tables
+
     # Moteur : enabled / fire / step
 
     #Teste si la transition est franchissable pour un marquage donné.
@@ -134,7 +1192,7 @@ class PetriNet:
         if transition_id not in self.transitions:
             raise ValueError(f"Transition inconnue: {transition_id}")
 
-        pre, _ = self.build_pre_post()
+        pre, _ = self._pre_post()
 
         for place_id, weight in pre[transition_id]:
             if marking.get(place_id, 0) < weight:
@@ -147,7 +1205,7 @@ class PetriNet:
         if not self.enabled(transition_id, marking):
             raise ValueError(f"Transition non franchissable (not enabled): {transition_id}")
 
-        pre, post = self.build_pre_post()
+        pre, post = self._pre_post()
         new_marking = dict(marking)
 
         for place_id, weight in pre[transition_id]:
@@ -177,6 +1235,12 @@ class PetriNet:
         order = self.place_order()
         return tuple(marking.get(pid, 0) for pid in order)
 
+    #Forme compilée du réseau (tables d'indices sur les marquages-tuples), mise en cache.
+    def compile(self) -> CompiledNet:
+        if self._compiled_net is None:
+            self._compiled_net = CompiledNet(self)
+        return self._compiled_net
+
 
     # Reachability BFS 
     """
@@ -185,145 +1249,358 @@ class PetriNet:
         - la liste des marquages atteints,
         - les arêtes (état source, transition, état cible),
         - les états en deadlock,
-        - un indicateur de troncature si on dépasse max_states.
+        - un indicateur de troncature si on dépasse max_states,
+        - stopped_by : la limite qui a arrêté l'exploration (voir Budget), None si complète.
+
+        budget (Budget), si fourni, ajoute une échéance, un plafond mémoire, des plafonds
+        d'états / d'arêtes et un jeton d'annulation ; le résultat est alors tronqué et
+        reprenable comme pour max_states.
+
+        progress(nb_états, nb_arêtes), si fourni, est appelé tous les PROGRESS_EVERY
+        nouveaux états ; une exception levée par progress interrompt l'exploration
+        (c'est ainsi que le service d'analyse annule un job en cours).
+
+        Reprise : un résultat tronqué contient aussi "frontier" = {"queue": états restant
+        à développer, "skip": nombre de successeurs de queue[0] déjà enregistrés}.
+        resume=<résultat tronqué> continue l'exploration à partir de là (avec un
+        max_states plus grand) au lieu de repartir du marquage initial.
+
+        statistics=True ajoute "statistics" : statistiques calculées pendant l'exploration
+        (voir ReachabilityStatistics) ; reachability_statistics fait de même sans garder
+        ni états ni arêtes.
+
+        checkpoint(instantané), si fourni, est appelé toutes les checkpoint_every secondes
+        (au plus) avec un instantané de l'exploration au même format qu'un résultat
+        tronqué, donc utilisable avec resume (voir checkpoint.py pour l'écriture sur disque) ;
+        ses listes sont des copies, l'instantané peut être gardé en mémoire.
         """
     
-    def reachability_bfs(self, max_states: int = 10000) -> Dict[str, object]:
+    def reachability_bfs(
+        self,
+        max_states: int = 10000,
+        progress: Optional[Callable[[int, int], None]] = None,
+        resume: Optional[Dict[str, Any]] = None,
+        checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+        checkpoint_every: float = 60.0,
+        budget: Optional[Budget] = None,
+        statistics: bool = False,
+    ) -> Dict[str, object]:
         if max_states <= 0:
             raise ValueError("max_states doit être > 0")
+        if statistics and resume is not None:
+            raise ValueError("statistics ne se combine pas avec resume (profondeurs des états repris inconnues)")
+        state_cap = max_states if budget is None else budget.state_cap(max_states)
+        edge_cap = sys.maxsize if budget is None else budget.edge_cap()
+        check_every = 0 if budget is None else budget.check_every
 
         order = self.place_order()
-        m0 = self.initial_marking()
-        k0 = self.marking_key(m0)
-
-        visited: Dict[Tuple[int, ...], int] = {k0: 0}
-        states: List[Dict[str, int]] = [m0]
-        edges: List[Tuple[int, str, int]] = []
-        queue: List[int] = [0]
-        deadlocks: List[int] = []
-
-        while queue:
-            sid = queue.pop(0)
-            marking = states[sid]
-
-            succ = self.step(marking)
+        # Exploration sur les marquages-tuples (fonctions de tir générées) ;
+        # les états rendus restent des dicts, places dans l'ordre de initial_marking
+        cn = self.compile()
+        successors = cn.successors
+        ids = self.place_ids()
+        positions = [cn.place_index[pid] for pid in ids]
+        tids = cn.transition_ids
+
+        if resume is None:
+            m0 = self.initial_marking()
+            states: List[Dict[str, int]] = [m0]
+            edges: List[Tuple[int, str, int]] = []
+            deadlocks: List[int] = []
+            queue: List[int] = [0]
+            skip = 0
+            visited: Dict[Tuple[int, ...], int] = {self.marking_key(m0): 0}
+        else:
+            if resume["place_order"] != order:
+                raise ValueError("Le résultat à reprendre ne correspond pas à ce réseau (places différentes)")
+            # Copies : le résultat repris reste inchangé
+            states = list(resume["states"])
+            edges = list(resume["edges"])
+            deadlocks = list(resume["deadlocks"])
+            frontier = resume.get("frontier") or {"queue": [], "skip": 0}
+            queue = list(frontier["queue"])
+            skip = frontier["skip"]
+            visited = {self.marking_key(m): sid for sid, m in enumerate(states)}
+
+        # Statistiques en ligne (voir ReachabilityStatistics) ; depth[sid] = profondeur BFS
+        stats = ReachabilityStatistics(cn) if statistics else None
+        depth = array("l", [0])
+        if stats is not None:
+            stats.add_state(self.marking_key(states[0]), 0)
+
+        # copy=True pour le callback checkpoint : l'exploration continue d'allonger les
+        # listes, l'instantané doit rester figé dans l'état correspondant à sa frontière
+        def snapshot(
+            head: int, done: int, truncated: bool, stopped_by: Optional[str] = None, copy: bool = False
+        ) -> Dict[str, object]:
+            res: Dict[str, object] = {
+                "place_order": order,
+                "states": list(states) if copy else states,
+                "edges": list(edges) if copy else edges,
+                "deadlocks": list(deadlocks) if copy else deadlocks,
+                "truncated": truncated,
+                "stopped_by": stopped_by,
+            }
+            if truncated:
+                res["frontier"] = {"queue": queue[head:], "skip": done}
+            if stats is not None:
+                res["statistics"] = stats.to_dict()
+            return res
+
+        last_checkpoint = time.monotonic()
+
+        # La file est parcourue par un indice (queue[head:] = frontière encore à développer)
+        # keys[sid] = marquage-tuple de l'état sid
+        keys: List[Tuple[int, ...]] = [None] * len(states)  # type: ignore[list-item]
+        for key, sid in visited.items():
+            keys[sid] = key
+
+        head = 0
+        while head < len(queue):
+            sid = queue[head]
+            if check_every and head % check_every == 0:
+                reason = budget.poll()
+                if reason is not None:
+                    return snapshot(head, skip, True, reason)
+
+            succ = successors(keys[sid])
 
             if len(succ) == 0:
                 deadlocks.append(sid)
+            if stats is not None:
+                stats.add_expansion(len(succ))
 
-            for tid, new_marking in succ:
-                key = self.marking_key(new_marking)
+            for i in range(skip, len(succ)):
+                t, key = succ[i]
+                if len(edges) >= edge_cap:
+                    return snapshot(head, i, True, "max_edges")
 
                 if key in visited:
                     to_id = visited[key]
                 else:
-                    if len(states) >= max_states:
-                        return {
-                            "place_order": order,
-                            "states": states,
-                            "edges": edges,
-                            "deadlocks": deadlocks,
-                            "truncated": True,
-                        }
+                    if len(states) >= state_cap:
+                        return snapshot(head, i, True, "max_states")
 
                     to_id = len(states)
                     visited[key] = to_id
-                    states.append(new_marking)
+                    keys.append(key)
+                    states.append(dict(zip(ids, [key[j] for j in positions])))
                     queue.append(to_id)
+                    if stats is not None:
+                        depth.append(depth[sid] + 1)
+                        stats.add_state(key, depth[-1])
+                    if to_id % PROGRESS_EVERY == 0:
+                        if progress is not None:
+                            progress(len(states), len(edges))
+                        if checkpoint is not None and time.monotonic() - last_checkpoint >= checkpoint_every:
+                            checkpoint(snapshot(head, i, True, copy=True))
+                            last_checkpoint = time.monotonic()
+
+                if stats is not None and stats.unfired:
+                    stats.mark_fired(t)
+                edges.append((sid, tids[t], to_id))
+
+            skip = 0
+            head += 1
+
+        return snapshot(head, 0, False)
+
+    #Graphe d'accessibilité indexé (voir ReachabilityGraph), à partir d'un résultat déjà calculé si fourni.
+    def reachability_graph(self, max_states: int = 10000, reachability: Optional[Dict[str, Any]] = None) -> ReachabilityGraph:
+        res = reachability if reachability is not None else self.reachability_bfs(max_states=max_states)
+        return ReachabilityGraph(res, transitions=self.transition_ids())
 
-                edges.append((sid, tid, to_id))
-
-        return {
-            "place_order": order,
-            "states": states,
-            "edges": edges,
-            "deadlocks": deadlocks,
-            "truncated": False,
-        }
-    
     """
-    def reachability_dfs(self, max_states: int = 10000) -> Dict[str, object]:
+    Mode « statistiques seulement » : même parcours en largeur que reachability_bfs, mais
+    seul l'ensemble des marquages déjà vus (tuples) est gardé, ni états en dicts ni arêtes.
+    Renvoie place_order, num_states, num_edges, num_deadlocks, truncated, stopped_by et
+    statistics (voir ReachabilityStatistics) : le résumé de graphes trop gros pour être gardés.
+    """
+
+    def reachability_statistics(self, max_states: int = 10000, budget: Optional[Budget] = None) -> Dict[str, Any]:
         if max_states <= 0:
             raise ValueError("max_states doit être > 0")
+        state_cap = max_states if budget is None else budget.state_cap(max_states)
+        edge_cap = sys.maxsize if budget is None else budget.edge_cap()
+        check_every = 0 if budget is None else budget.check_every
+
+        cn = self.compile()
+        successors = cn.successors
+        stats = ReachabilityStatistics(cn)
+        m0 = self.marking_key(self.initial_marking())
+        visited = {m0}
+        stats.add_state(m0, 0)
+        queue = deque([(m0, 0)])
+        num_edges = 0
+        expansions = 0
+        stopped_by: Optional[str] = None
+
+        while queue and stopped_by is None:
+            if check_every and expansions % check_every == 0:
+                stopped_by = budget.poll()
+                if stopped_by is not None:
+                    break
+            expansions += 1
+            key, d = queue.popleft()
+            succ = successors(key)
+            stats.add_expansion(len(succ))
+            for t, new in succ:
+                if num_edges >= edge_cap:
+                    stopped_by = "max_edges"
+                    break
+                if new not in visited:
+                    if len(visited) >= state_cap:
+                        stopped_by = "max_states"
+                        break
+                    visited.add(new)
+                    stats.add_state(new, d + 1)
+                    queue.append((new, d + 1))
+                if stats.unfired:
+                    stats.mark_fired(t)
+                num_edges += 1
 
-        order = self.place_order()
-        m0 = self.initial_marking()
-        k0 = self.marking_key(m0)
-
-        visited: Dict[Tuple[int, ...], int] = {k0: 0}
-        states: List[Dict[str, int]] = [m0]
-        edges: List[Tuple[int, str, int]] = []
-        stack: List[int] = [0]
-        deadlocks: List[int] = []
-
-        while stack:
-            sid = stack.pop()              # pile → DFS
-            marking = states[sid]
-
-            succ = self.step(marking)
+        return {
+            "place_order": self.place_order(),
+            "num_states": len(visited),
+            "num_edges": num_edges,
+            "num_deadlocks": stats.out_degree[0],
+            "truncated": stopped_by is not None,
+            "stopped_by": stopped_by,
+            "statistics": stats.to_dict(),
+        }
 
-            if len(succ) == 0:
-                deadlocks.append(sid)
+    """
+    Exploration avec une stratégie au choix (voir SEARCH_STRATEGIES) ; même format de
+    résultat que reachability_bfs, plus :
+    - strategy, depth_limit (profondeur maximale utilisée), iterations (approfondissement),
+    - cutoff : nombre d'états non développés à cause de la profondeur (truncated les compte),
+    - deadlock_trace : tirs vers le premier deadlock trouvé (le plus court en BFS),
+    - memory : profil mémoire (frontier "queue"/"stack", peak_frontier, stored_states, stored_edges).
+    stop_at_deadlock=True arrête l'exploration au premier deadlock ; budget comme pour
+    reachability_bfs (le résultat n'est pas reprenable).
+    """
 
-            for tid, new_marking in succ:
-                key = self.marking_key(new_marking)
+    def explore(
+        self,
+        strategy: str = "bfs",
+        max_states: int = 10000,
+        max_depth: Optional[int] = None,
+        stop_at_deadlock: bool = False,
+        budget: Optional[Budget] = None,
+    ) -> Dict[str, Any]:
+        ex = self._explore(strategy, max_states, max_depth, stop_at_deadlock, budget)
+        ids = self.place_ids()
+        positions = [self.compile().place_index[pid] for pid in ids]
+        return {
+            "place_order": self.place_order(),
+            "states": [dict(zip(ids, [key[j] for j in positions])) for key in ex.keys],
+            "edges": ex.edges,
+            "deadlocks": ex.deadlocks,
+            "truncated": ex.truncated or ex.cutoff > 0,
+            "stopped_by": ex.stopped_by,
+            "strategy": strategy,
+            "depth_limit": ex.depth_limit,
+            "iterations": ex.iterations,
+            "cutoff": ex.cutoff,
+            "deadlock_trace": ex.trace,
+            "memory": ex.memory(),
+        }
 
-                if key in visited:
-                    to_id = visited[key]
-                else:
-                    if len(states) >= max_states:
-                        return {
-                            "place_order": order,
-                            "states": states,
-                            "edges": edges,
-                            "deadlocks": deadlocks,
-                            "truncated": True,
-                        }
+    def _explore(
+        self,
+        strategy: str,
+        max_states: int,
+        max_depth: Optional[int],
+        stop_at_deadlock: bool,
+        budget: Optional[Budget],
+    ) -> _Exploration:
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Stratégie inconnue: {strategy} (attendu: {', '.join(SEARCH_STRATEGIES)})")
+        if max_states <= 0:
+            raise ValueError("max_states doit être > 0")
+        if budget is not None:
+            max_states = budget.state_cap(max_states)
+        cn = self.compile()
+        m0 = self.marking_key(self.initial_marking())
+        return SEARCH_STRATEGIES[strategy](cn, m0, max_states, max_depth, stop_at_deadlock, budget)
 
-                    to_id = len(states)
-                    visited[key] = to_id
-                    states.append(new_marking)
-                    stack.append(to_id)
+    #Exploration en profondeur (pile de trames compactes), même format que reachability_bfs.
+    def reachability_dfs(self, max_states: int = 10000, budget: Optional[Budget] = None) -> Dict[str, Any]:
+        return self.explore(strategy="dfs", max_states=max_states, budget=budget)
 
-                edges.append((sid, tid, to_id))
+    """
+    Cherche un deadlock, par défaut en profondeur : la frontière reste le chemin courant et
+    les états ne sont pas convertis en dicts. "iterative_deepening" donne le deadlock le
+    moins profond avec la même mémoire. Renvoie found, deadlock (marquage), trace,
+    states_explored, truncated (found False et truncated True : on ne sait pas), stopped_by
+    et memory.
+    """
 
+    def find_deadlock(
+        self,
+        max_states: int = 10000,
+        strategy: str = "dfs",
+        max_depth: Optional[int] = None,
+        budget: Optional[Budget] = None,
+    ) -> Dict[str, Any]:
+        ex = self._explore(strategy, max_states, max_depth, True, budget)
+        found = bool(ex.deadlocks)
         return {
-            "place_order": order,
-            "states": states,
-            "edges": edges,
-            "deadlocks": deadlocks,
-            "truncated": False,
+            "found": found,
+            "deadlock": self.compile().to_marking(ex.keys[ex.deadlocks[0]]) if found else None,
+            "trace": ex.trace,
+            "states_explored": len(ex.keys),
+            "truncated": not found and (ex.truncated or ex.cutoff > 0),
+            "stopped_by": None if found else ex.stopped_by,
+            "memory": ex.memory(),
         }
-        """
 
 
 
     # Analyse 
     """
+    Les fonctions d'analyse et d'export acceptent un résultat de reachability_bfs déjà
+    calculé, ou son ReachabilityGraph (paramètre reachability), pour éviter de
+    ré-explorer l'espace d'états.
+
     Résumé d'analyse du graphe d'accessibilité :
     - nombre d'états et d'arêtes,
     - listes des deadlocks,
     - nombre max de jetons observés par place,
     - transitions qui ont tiré / jamais tiré.
+    Si le résultat porte des statistiques calculées pendant l'exploration (statistics=True,
+    c'est le cas quand analyze_reachability explore elle-même), max_tokens et les
+    transitions tirées en sont repris ; sinon on parcourt les états et les arêtes.
     """
 
-    def analyze_reachability(self, max_states: int = 10000) -> Dict[str, object]:
-        res = self.reachability_bfs(max_states=max_states)
+    def analyze_reachability(
+        self,
+        max_states: int = 10000,
+        reachability: Union[Dict[str, object], ReachabilityGraph, None] = None,
+        budget: Optional[Budget] = None,
+    ) -> Dict[str, object]:
+        res = self._reachability_result(max_states, reachability, budget)
 
         order: List[str] = res["place_order"] 
         states: List[Dict[str, int]] = res["states"] 
         edges: List[Tuple[int, str, int]] = res["edges"] 
 
-        max_tokens = {pid: 0 for pid in order}
-        for m in states:
-            for pid in order:
-                max_tokens[pid] = max(max_tokens[pid], m.get(pid, 0))
-
-        fired = {tid for (_, tid, _) in edges}
+        # Statistiques calculées pendant l'exploration : pas de nouveau parcours
+        stats = res.get("statistics")
+        if stats is not None:
+            max_tokens = {pid: stats["places"][pid]["max"] for pid in order}
+            fired = set(stats["fired_transitions"])
+        else:
+            max_tokens = {pid: 0 for pid in order}
+            for m in states:
+                for pid in order:
+                    max_tokens[pid] = max(max_tokens[pid], m.get(pid, 0))
+            fired = self._fired_transitions(reachability, edges)
         never_fired = sorted(set(self.transitions.keys()) - fired)
 
         return {
             "truncated": res["truncated"],
+            "stopped_by": res.get("stopped_by"),
             "num_states": len(states),
             "num_edges": len(edges),
             "deadlocks": res["deadlocks"],
@@ -332,11 +1609,11 @@ class PetriNet:
             "never_fired_transitions": never_fired,
         }
 
-    def liveness_summary(self, max_states: int = 10000) -> Dict[str, object]:
-        res = self.reachability_bfs(max_states=max_states)
+    def liveness_summary(self, max_states: int = 10000, reachability: Union[Dict[str, object], ReachabilityGraph, None] = None) -> Dict[str, object]:
+        res = self._reachability_result(max_states, reachability)
         edges: List[Tuple[int, str, int]] = res["edges"] 
 
-        fired = {tid for (_, tid, _) in edges}
+        fired = self._fired_transitions(reachability, edges)
         all_t = set(self.transitions.keys())
         dead = sorted(all_t - fired)
 
@@ -348,6 +1625,340 @@ class PetriNet:
             "num_dead": len(dead),
         }
 
+    # reachability : résultat de reachability_bfs ou ReachabilityGraph (dont on reprend le résultat)
+    def _reachability_result(
+        self,
+        max_states: int,
+        reachability: Union[Dict[str, object], ReachabilityGraph, None],
+        budget: Optional[Budget] = None,
+    ) -> Dict[str, object]:
+        if reachability is None:
+            return self.reachability_bfs(max_states=max_states, budget=budget, statistics=True)
+        if isinstance(reachability, ReachabilityGraph):
+            return reachability.result
+        return reachability
+
+    # Avec l'index, les transitions tirées se lisent sans parcourir les arêtes
+    def _fired_transitions(self, reachability: Any, edges: List[Tuple[int, str, int]]) -> set:
+        if isinstance(reachability, ReachabilityGraph):
+            return set(reachability.fired_transitions())
+        return {tid for (_, tid, _) in edges}
+
+    # Classes structurelles
+    """
+    Classe du réseau (voir NET_CLASSES) et analyse sans exploration propre à cette classe :
+    - net_class : la classe la plus précise, classes : toutes celles satisfaites,
+    - live, bounded, deadlock_free : booléens, ou None si la classe ne permet pas de conclure,
+    - bounds : borne de chaque place (None = non bornée) quand elles sont connues,
+    - siphon : pour un réseau free choice non vivant, un siphon sans trappe marquée,
+    - method : le critère utilisé,
+    - stopped_by : limite du budget qui a interrompu l'analyse (voir Budget), sinon None ;
+      la recherche de siphons (extended free choice) vérifie le budget à chaque siphon.
+    """
+
+    def net_class(self) -> str:
+        return net_classes(self)[0]
+
+    def structural_analysis(self, max_siphon_nodes: int = 1000, budget: Optional[Budget] = None) -> Dict[str, Any]:
+        st = _structure(self)
+        classes = _classes(st)
+        m0 = self.initial_marking()
+        result: Dict[str, Any] = {
+            "net_class": classes[0],
+            "classes": classes,
+            "live": None,
+            "bounded": None,
+            "bounds": None,
+            "deadlock_free": None,
+            "siphon": None,
+            "method": None,
+            "stopped_by": None if budget is None else budget.poll(),
+        }
+
+        if result["stopped_by"] is not None:
+            return result
+        if "state_machine" in classes:
+            result.update(_state_machine_analysis(st, m0), method="state machine (jetons indépendants)")
+        elif "marked_graph" in classes:
+            result.update(_marked_graph_analysis(st, m0), method="marked graph (jetons des circuits)")
+        elif "extended_free_choice" in classes:
+            siphon, decided, result["stopped_by"] = _siphon_without_marked_trap(st, m0, max_siphon_nodes, budget)
+            if decided:
+                live = siphon is None
+                result.update(
+                    live=live,
+                    deadlock_free=bool(st.pre) if live else None,
+                    siphon=None if live else sorted(siphon),
+                    method="Commoner (siphons et trappes)",
+                )
+        return result
+
+
+    # Propriétés temporelles (vérification à la volée)
+    """
+    Vérifie une propriété EF / AG / EG / AF sur un prédicat de marquage, pendant
+    l'exploration, en s'arrêtant dès qu'un témoin ou un contre-exemple est trouvé :
+    - EF p : un marquage accessible vérifie p (témoin = séquence de tirs, BFS donc la plus courte),
+    - AG p : tous les marquages accessibles vérifient p (contre-exemple = chemin vers un état non p),
+    - EG p : il existe un chemin maximal (infini, ou fini jusqu'à un deadlock) où p reste vraie,
+    - AF p : tout chemin maximal finit par vérifier p (AF p = non EG non p).
+
+    Pour EG/AF, le témoin est un "lasso" : trace puis retour à l'état d'indice loop_start
+    de la trace (loop_start vaut None si le chemin se termine sur un deadlock).
+
+    Le prédicat est une chaîne (voir compile_predicate) ou une fonction sur un marquage dict.
+    holds vaut None si max_states est atteint avant de pouvoir conclure.
+    """
+
+    def check_property(self, query: str, max_states: int = 10000) -> Dict[str, Any]:
+        match = re.match(r"^\s*(EF|AG|EG|AF)\b(.+)$", query, re.S)
+        if match is None:
+            raise ValueError(f"Propriété invalide (attendu 'EF|AG|EG|AF <prédicat>'): {query!r}")
+        return self.check(match.group(1), match.group(2), max_states=max_states)
+
+    def check(
+        self,
+        operator: str,
+        predicate: Union[str, Callable[[Dict[str, int]], bool]],
+        max_states: int = 10000,
+    ) -> Dict[str, Any]:
+        if operator not in ("EF", "AG", "EG", "AF"):
+            raise ValueError(f"Opérateur inconnu: {operator}")
+        if max_states <= 0:
+            raise ValueError("max_states doit être > 0")
+
+        net = self.compile()
+        if isinstance(predicate, str):
+            pred = compile_predicate(predicate, net.place_order)
+        else:
+            user_pred = predicate
+            pred = lambda m: bool(user_pred(net.to_marking(m)))
+
+        m0 = self.marking_key(self.initial_marking())
+        if operator in ("EF", "AG"):
+            goal = pred if operator == "EF" else (lambda m: not pred(m))
+            found, trace, end, explored, truncated = self._search_reachable(net, m0, goal, max_states)
+            loop_start = None
+        else:
+            invariant = pred if operator == "EG" else (lambda m: not pred(m))
+            found, trace, end, loop_start, explored, truncated = self._search_maximal_path(
+                net, m0, invariant, max_states
+            )
+
+        if found:
+            holds: Optional[bool] = operator in ("EF", "EG")
+        elif truncated:
+            holds = None
+        else:
+            holds = operator in ("AG", "AF")
+
+        return {
+            "operator": operator,
+            "predicate": predicate if isinstance(predicate, str) else repr(predicate),
+            "holds": holds,
+            "trace": [net.transition_ids[t] for t in trace] if found else [],
+            "marking": net.to_marking(end) if found else None,
+            "loop_start": loop_start,
+            "states_explored": explored,
+            "truncated": truncated and not found,
+        }
+
+    #BFS avec pointeurs parents, arrêtée au premier état vérifiant goal.
+    def _search_reachable(self, net: CompiledNet, m0: Tuple[int, ...], goal: Callable, max_states: int):
+        parents: Dict[Tuple[int, ...], Optional[Tuple[Tuple[int, ...], int]]] = {m0: None}
+        queue = deque([m0])
+        found = m0 if goal(m0) else None
+        truncated = False
+
+        while queue and found is None and not truncated:
+            m = queue.popleft()
+            for t, m2 in net.successors(m):
+                if m2 in parents:
+                    continue
+                if len(parents) >= max_states:
+                    truncated = True
+                    break
+                parents[m2] = (m, t)
+                if goal(m2):
+                    found = m2
+                    break
+                queue.append(m2)
+
+        if found is None:
+            return False, [], None, len(parents), truncated
+
+        trace: List[int] = []
+        cur = found
+        while parents[cur] is not None:
+            cur, t = parents[cur]
+            trace.append(t)
+        trace.reverse()
+        return True, trace, found, len(parents), truncated
+
+    #DFS restreint aux états vérifiant invariant : cherche un cycle ou un deadlock.
+    def _search_maximal_path(self, net: CompiledNet, m0: Tuple[int, ...], invariant: Callable, max_states: int):
+        if not invariant(m0):
+            return False, [], None, None, 1, False
+
+        on_stack: Dict[Tuple[int, ...], int] = {m0: 0}   # état -> position dans le chemin courant
+        done = set()
+        path: List[int] = []                             # transitions du chemin courant
+        frames = [[m0, None, 0]]                         # [état, successeurs, prochain indice]
+        truncated = False
+
+        while frames:
+            frame = frames[-1]
+            m = frame[0]
+            if frame[1] is None:
+                succ = net.successors(m)
+                if not succ:
+                    # deadlock : chemin maximal fini sur lequel invariant reste vraie
+                    return True, list(path), m, None, len(on_stack) + len(done), False
+                frame[1] = [(t, m2) for t, m2 in succ if invariant(m2)]
+
+            if frame[2] < len(frame[1]):
+                t, m2 = frame[1][frame[2]]
+                frame[2] += 1
+                if m2 in on_stack:
+                    return True, path + [t], m2, on_stack[m2], len(on_stack) + len(done), False
+                if m2 in done:
+                    continue
+                if len(on_stack) + len(done) >= max_states:
+                    truncated = True
+                    continue
+                on_stack[m2] = len(path) + 1
+                path.append(t)
+                frames.append([m2, None, 0])
+            else:
+                frames.pop()
+                del on_stack[m]
+                done.add(m)
+                if path:
+                    path.pop()
+
+        return False, [], None, None, len(done), truncated
+
+
+
+    # Recherche guidée d'un chemin (A*)
+    """
+    Cherche une séquence de tirs la plus courte menant du marquage initial à une cible :
+    - target dict : marquage partiel {place: jetons} (les places absentes sont libres),
+    - target str / fonction : prédicat sur le marquage (comme pour check()).
+
+    Pour un marquage partiel, la recherche est un A* guidé par
+        h(M) = ceil( somme_p |M(p) - cible(p)| / D )
+    où D est la variation maximale que peut produire un seul tir sur les places de la cible.
+    h ne baisse jamais de plus de 1 par tir : l'heuristique est consistante et la
+    séquence renvoyée est de longueur minimale. Pour un prédicat, h = 0 (parcours en largeur).
+
+    prune=True élague les marquages que l'équation d'état exclut déjà place par place :
+    une place sous sa cible qu'aucune transition ne remplit, ou au-dessus de sa cible
+    qu'aucune transition ne vide. prune peut aussi être une fonction marquage -> bool
+    (True = marquage à élaguer), par exemple le test complet de l'équation d'état en
+    nombres entiers (StateEquation.prune, dans state_equation.py).
+    """
+
+    def find_path(
+        self,
+        target: Union[Dict[str, int], str, Callable[[Dict[str, int]], bool]],
+        max_states: int = 10000,
+        prune: Union[bool, Callable[[Dict[str, int]], bool]] = True,
+    ) -> Dict[str, Any]:
+        if max_states <= 0:
+            raise ValueError("max_states doit être > 0")
+
+        net = self.compile()
+        heuristic: Callable[[Tuple[int, ...]], int] = lambda m: 0
+        prune_key: Optional[Callable[[Tuple[int, ...]], bool]] = None
+
+        if isinstance(target, dict):
+            goal_items = []
+            for pid, tokens in target.items():
+                if pid not in net.place_index:
+                    raise ValueError(f"Place inconnue dans la cible: {pid}")
+                goal_items.append((net.place_index[pid], int(tokens)))
+            goal = lambda m: all(m[i] == v for i, v in goal_items)
+
+            targets = dict(goal_items)
+            max_change = max(
+                (sum(abs(d) for i, d in delta if i in targets) for delta in net.delta),
+                default=0,
+            )
+            if max_change > 0:
+                heuristic = lambda m: -(-sum(abs(m[i] - v) for i, v in goal_items) // max_change)
+
+            if prune is True:
+                can_grow = {i for delta in net.delta for i, d in delta if d > 0}
+                can_shrink = {i for delta in net.delta for i, d in delta if d < 0}
+                prune_key = lambda m: any(
+                    (m[i] < v and i not in can_grow) or (m[i] > v and i not in can_shrink)
+                    for i, v in goal_items
+                )
+        elif isinstance(target, str):
+            goal = compile_predicate(target, net.place_order)
+        else:
+            user_goal = target
+            goal = lambda m: bool(user_goal(net.to_marking(m)))
+
+        if callable(prune):
+            user_prune = prune
+            prune_key = lambda m: bool(user_prune(net.to_marking(m)))
+
+        m0 = self.marking_key(self.initial_marking())
+        best_g: Dict[Tuple[int, ...], int] = {m0: 0}
+        parents: Dict[Tuple[int, ...], Optional[Tuple[Tuple[int, ...], int]]] = {m0: None}
+        closed = set()
+        counter = 0
+        heap = [(heuristic(m0), counter, m0)]
+        found = None
+        truncated = False
+
+        while heap:
+            _, _, m = heapq.heappop(heap)
+            if m in closed:
+                continue
+            if goal(m):
+                found = m
+                break
+            closed.add(m)
+            if prune_key is not None and prune_key(m):
+                continue
+
+            g = best_g[m] + 1
+            for t, m2 in net.successors(m):
+                if m2 in closed or g >= best_g.get(m2, g + 1):
+                    continue
+                if m2 not in best_g and len(best_g) >= max_states:
+                    truncated = True
+                    continue
+                best_g[m2] = g
+                parents[m2] = (m, t)
+                counter += 1
+                heapq.heappush(heap, (g + heuristic(m2), counter, m2))
+
+        result: Dict[str, Any] = {
+            "found": found is not None,
+            "trace": [],
+            "marking": None,
+            "length": None,
+            "states_explored": len(closed),
+            "states_generated": len(best_g),
+            "truncated": truncated and found is None,
+        }
+        if found is not None:
+            trace: List[int] = []
+            cur = found
+            while parents[cur] is not None:
+                cur, t = parents[cur]
+                trace.append(t)
+            trace.reverse()
+            result["trace"] = [net.transition_ids[t] for t in trace]
+            result["marking"] = net.to_marking(found)
+            result["length"] = len(trace)
+        return result
+
+
 
     # Export 
     # Exporte la structure du réseau sous forme de dictionnaire JSON-sérialisable.
@@ -358,7 +1969,7 @@ class PetriNet:
                 {"id": p.id, "name": p.name, "initial_tokens": p.initial_tokens}
                 for p in self.places.values()
             ],
-            "transitions": [{"id": t.id, "name": t.name} for t in self.transitions.values()],
+            "transitions": [_transition_to_dict(t) for t in self.transitions.values()],
             "arcs": [
                 {"source_id": a.source_id, "target_id": a.target_id, "weight": a.weight}
                 for a in self.arcs
@@ -366,8 +1977,8 @@ class PetriNet:
         }
 
     #Exporte le graphe d'accessibilité au format DOT (Graphviz).
-    def reachability_to_dict(self, max_states: int = 10000) -> Dict[str, object]:
-        res = self.reachability_bfs(max_states=max_states)
+    def reachability_to_dict(self, max_states: int = 10000, reachability: Union[Dict[str, object], ReachabilityGraph, None] = None) -> Dict[str, object]:
+        res = self._reachability_result(max_states, reachability)
         return {
             "place_order": res["place_order"],
             "states": res["states"],
@@ -377,13 +1988,13 @@ class PetriNet:
         }
 
     #Exporte le graphe d'accessibilité au format DOT (Graphviz).
-    def reachability_to_dot(self, max_states: int = 10000) -> str:
-        res = self.reachability_bfs(max_states=max_states)
+    def reachability_to_dot(self, max_states: int = 10000, reachability: Union[Dict[str, object], ReachabilityGraph, None] = None) -> str:
+        res = self._reachability_result(max_states, reachability)
 
         order: List[str] = res["place_order"] 
         states: List[Dict[str, int]] = res["states"]
         edges: List[Tuple[int, str, int]] = res["edges"]
-        deadlocks: List[int] = res["deadlocks"] 
+        deadlocks = set(res["deadlocks"])
 
         lines: List[str] = []
         lines.append("digraph Reachability {")
@@ -404,8 +2015,759 @@ class PetriNet:
         return "\n".join(lines)
 
 
+#  Graphe d'accessibilité indexé
+
+"""
+Index CSR (compressed sparse row) d'un résultat de reachability_bfs, construit une fois :
+- successeurs : les arêtes sortantes de s sont succ_start[s] .. succ_start[s + 1] - 1
+  dans succ_transition / succ_target (et succ_source, la source de chaque arête),
+- prédécesseurs : même principe avec pred_start / pred_transition / pred_source,
+- par transition : trans_start / trans_edge donnent les arêtes (indices CSR des successeurs)
+  étiquetées par chaque transition, triées par état source.
+
+Les transitions sont internées (indices dans transition_ids). successors(s),
+predecessors(s) et enabled_in(t) coûtent O(degré) ; distances() et path() font un
+parcours en largeur sur l'index (O(états + arêtes)), mis en cache par état de départ.
+
+Sur un résultat tronqué, les états de la frontière n'ont pas encore de successeurs :
+enabled_in ne les compte pas.
+"""
+
+
+class ReachabilityGraph:
+    def __init__(self, result: Dict[str, Any], transitions: Optional[List[str]] = None) -> None:
+        self.result = result
+        self.place_order: List[str] = result["place_order"]
+        self.states: List[Dict[str, int]] = result["states"]
+        self.deadlocks: List[int] = result["deadlocks"]
+        self.truncated: bool = bool(result["truncated"])
+        n_states = len(self.states)
+
+        edges = result["edges"]
+        if edges and isinstance(edges[0], dict):
+            edges = [(e["from"], e["transition"], e["to"]) for e in edges]
+        self.num_edges = len(edges)
+
+        self.transition_ids: List[str] = list(transitions) if transitions is not None else []
+        self.transition_index: Dict[str, int] = {tid: i for i, tid in enumerate(self.transition_ids)}
+        labels = array("i", bytes(4 * len(edges)))
+        for k, (_, tid, _) in enumerate(edges):
+            t = self.transition_index.get(tid)
+            if t is None:
+                t = self.transition_index[tid] = len(self.transition_ids)
+                self.transition_ids.append(tid)
+            labels[k] = t
+
+        sources = array("q", (f for f, _, _ in edges))
+        targets = array("q", (to for _, _, to in edges))
+
+        # Successeurs et prédécesseurs : tri par comptage (ordre des arêtes conservé)
+        self.succ_start, succ_order = _csr(n_states, sources)
+        self.succ_transition = array("i", (labels[k] for k in succ_order))
+        self.succ_target = array("q", (targets[k] for k in succ_order))
+        self.pred_start, pred_order = _csr(n_states, targets)
+        self.pred_transition = array("i", (labels[k] for k in pred_order))
+        self.pred_source = array("q", (sources[k] for k in pred_order))
+        self.succ_source = array("q", (sources[k] for k in succ_order))
+
+        # Arêtes par transition, en indices CSR des successeurs (donc triées par source)
+        self.trans_start, self.trans_edge = _csr(len(self.transition_ids), self.succ_transition)
+
+        self._bfs_cache: Dict[int, Tuple[array, array]] = {}
+
+    @property
+    def num_states(self) -> int:
+        return len(self.states)
+
+    def successors(self, s: int) -> List[Tuple[str, int]]:
+        ids = self.transition_ids
+        lo, hi = self.succ_start[s], self.succ_start[s + 1]
+        return [(ids[t], to) for t, to in zip(self.succ_transition[lo:hi], self.succ_target[lo:hi])]
+
+    def predecessors(self, s: int) -> List[Tuple[int, str]]:
+        ids = self.transition_ids
+        lo, hi = self.pred_start[s], self.pred_start[s + 1]
+        return [(f, ids[t]) for f, t in zip(self.pred_source[lo:hi], self.pred_transition[lo:hi])]
+
+    #Arêtes (source, cible) étiquetées par la transition tid.
+    def transition_edges(self, tid: str) -> List[Tuple[int, int]]:
+        t = self.transition_index.get(tid)
+        if t is None:
+            return []
+        sources, targets = self.succ_source, self.succ_target
+        return [(sources[k], targets[k]) for k in self.trans_edge[self.trans_start[t]:self.trans_start[t + 1]]]
+
+    #États développés où tid est franchissable (sources de ses arêtes, dans l'ordre croissant).
+    def enabled_in(self, tid: str) -> List[int]:
+        t = self.transition_index.get(tid)
+        if t is None:
+            return []
+        sources = self.succ_source
+        return [sources[k] for k in self.trans_edge[self.trans_start[t]:self.trans_start[t + 1]]]
+
+    def fired_transitions(self) -> List[str]:
+        return sorted(
+            tid for t, tid in enumerate(self.transition_ids)
+            if self.trans_start[t + 1] > self.trans_start[t]
+        )
+
+    #Distance (nombre de tirs) depuis source vers chaque état ; -1 si inaccessible.
+    def distances(self, source: int = 0) -> array:
+        return self._bfs(source)[0]
+
+    def distance(self, target: int, source: int = 0) -> Optional[int]:
+        d = self._bfs(source)[0][target]
+        return None if d < 0 else d
+
+    #Plus courte séquence de tirs de source à target (None si target est inaccessible).
+    def path(self, target: int, source: int = 0) -> Optional[List[str]]:
+        dist, parent_edge = self._bfs(source)
+        if dist[target] < 0:
+            return None
+        sources = self.succ_source
+        trace: List[str] = []
+        s = target
+        while s != source:
+            k = parent_edge[s]
+            trace.append(self.transition_ids[self.succ_transition[k]])
+            s = sources[k]
+        trace.reverse()
+        return trace
+
+    def _bfs(self, source: int) -> Tuple[array, array]:
+        cached = self._bfs_cache.get(source)
+        if cached is not None:
+            return cached
+        n = self.num_states
+        if not 0 <= source < n:
+            raise IndexError(f"État inconnu: {source}")
+        dist = array("q", [-1]) * n
+        parent_edge = array("q", [-1]) * n
+        start, target = self.succ_start, self.succ_target
+        dist[source] = 0
+        queue = [source]
+        head = 0
+        while head < len(queue):
+            s = queue[head]
+            head += 1
+            d = dist[s] + 1
+            for k in range(start[s], start[s + 1]):
+                to = target[k]
+                if dist[to] < 0:
+                    dist[to] = d
+                    parent_edge[to] = k
+                    queue.append(to)
+        self._bfs_cache[source] = (dist, parent_edge)
+        return dist, parent_edge
+
+
+#Tri par comptage des éléments selon keys[k] dans [0, n) : (début de chaque clé, ordre des éléments).
+def _csr(n: int, keys: array) -> Tuple[array, array]:
+    start = array("q", bytes(8 * (n + 1)))
+    for key in keys:
+        start[key + 1] += 1
+    for i in range(n):
+        start[i + 1] += start[i]
+    fill = array("q", start[:-1]) if n else array("q")
+    order = array("q", bytes(8 * len(keys)))
+    for k, key in enumerate(keys):
+        order[fill[key]] = k
+        fill[key] += 1
+    return start, order
+
+
+#  Classes structurelles
+
+"""
+Classes de réseaux reconnues sur la structure seule (réseaux ordinaires, tous les poids à 1) :
+- state_machine         : chaque transition a exactement une place d'entrée et une de sortie,
+- marked_graph          : chaque place a exactement une transition d'entrée et une de sortie,
+- free_choice           : deux transitions qui partagent une place d'entrée n'ont que
+                          cette place en entrée (p• > 1 implique •t = {p}),
+- extended_free_choice  : deux transitions qui partagent une place d'entrée ont exactement
+                          les mêmes places d'entrée,
+- general               : tout le reste (en particulier dès qu'un poids dépasse 1).
+
+Un state machine ou un marked graph est aussi free choice, qui est aussi extended free choice.
+
+Pour ces classes, vivacité, bornes et absence de deadlock se décident sans explorer
+l'espace d'états (polynomial en la taille du réseau, indépendant du nombre de jetons) :
+- state_machine : les jetons circulent indépendamment les uns des autres. Borne d'une
+  place = jetons des places depuis lesquelles on peut l'atteindre ; un deadlock est
+  accessible ssi chaque place marquée peut atteindre une place sans sortie ; t (entrée p)
+  n'est pas vivante ssi chaque place marquée peut atteindre une place d'où p est
+  inaccessible (calculs sur les composantes fortement connexes du graphe des places),
+- marked_graph : vivant ssi chaque circuit porte au moins un jeton (pas de cycle dans le
+  graphe des places vides) ; s'il est vivant, une place est bornée ssi elle est sur un
+  circuit, sa borne étant le minimum de jetons d'un circuit qui la contient (plus court
+  chemin, Dijkstra),
+- (extended) free choice : théorème de Commoner, vivant ssi chaque siphon non vide contient
+  une trappe marquée. La recherche d'un siphon sans trappe marquée est exponentielle au
+  pire (le problème est coNP-complet) : elle est bornée par max_siphon_nodes, au-delà la
+  réponse est None. Les bornes ne sont pas calculées.
+
+Une réponse None signifie « non décidé structurellement » : il faut explorer.
+"""
+
+NET_CLASSES = ("state_machine", "marked_graph", "free_choice", "extended_free_choice", "general")
+
+
+# Structure d'un réseau : entrées / sorties de chaque transition et de chaque place
+class _Structure(NamedTuple):
+    pre: Dict[str, List[str]]
+    post: Dict[str, List[str]]
+    place_in: Dict[str, List[str]]
+    place_out: Dict[str, List[str]]
+    ordinary: bool
+
+
+def _structure(net: "PetriNet") -> _Structure:
+    pre = {tid: [a.source_id for a in net.incoming_arcs(tid)] for tid in net.transition_ids()}
+    post = {tid: [a.target_id for a in net.outgoing_arcs(tid)] for tid in net.transition_ids()}
+    place_in = {pid: [a.source_id for a in net.incoming_arcs(pid)] for pid in net.place_ids()}
+    place_out = {pid: [a.target_id for a in net.outgoing_arcs(pid)] for pid in net.place_ids()}
+    ordinary = all(a.weight == 1 for a in net.arcs)
+    return _Structure(pre, post, place_in, place_out, ordinary)
+
+
+#Classes satisfaites par le réseau, de la plus précise à la plus générale (toujours "general" en dernier).
+def net_classes(net: "PetriNet") -> List[str]:
+    return _classes(_structure(net))
+
+
+def _classes(st: _Structure) -> List[str]:
+    if not st.ordinary:
+        return ["general"]
+    classes = []
+    if all(len(st.pre[t]) == 1 and len(st.post[t]) == 1 for t in st.pre):
+        classes.append("state_machine")
+    if all(len(st.place_in[p]) == 1 and len(st.place_out[p]) == 1 for p in st.place_in):
+        classes.append("marked_graph")
+    if all(len(out) <= 1 or all(st.pre[t] == [p] for t in out) for p, out in st.place_out.items()):
+        classes.append("free_choice")
+    if all(all(set(st.pre[t]) == set(st.pre[out[0]]) for t in out) for out in st.place_out.values() if out):
+        classes.append("extended_free_choice")
+    classes.append("general")
+    return classes
+
+
+"""
+Composantes fortement connexes du graphe des places (p -> q s'il existe une transition de p
+vers q), par Tarjan itératif. Les composantes sortent dans l'ordre topologique inverse :
+les successeurs d'une composante ont un indice plus petit qu'elle.
+"""
+
+
+def _place_components(st: _Structure) -> Tuple[Dict[str, int], List[List[str]], List[set]]:
+    succ = {p: list(dict.fromkeys(q for t in st.place_out[p] for q in st.post[t])) for p in st.place_in}
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    comp_of: Dict[str, int] = {}
+    comps: List[List[str]] = []
+
+    for root in succ:
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                index[v] = low[v] = len(index)
+                stack.append(v)
+                on_stack.add(v)
+            children = succ[v]
+            while i < len(children):
+                w = children[i]
+                i += 1
+                if w not in index:
+                    work.append((v, i))
+                    work.append((w, 0))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                if low[v] == index[v]:
+                    comp: List[str] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        comp_of[w] = len(comps)
+                        comp.append(w)
+                        if w == v:
+                            break
+                    comps.append(comp)
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+
+    comp_succ: List[set] = [set() for _ in comps]
+    for p, qs in succ.items():
+        for q in qs:
+            if comp_of[q] != comp_of[p]:
+                comp_succ[comp_of[p]].add(comp_of[q])
+    return comp_of, comps, comp_succ
+
+
+def _state_machine_analysis(st: _Structure, m0: Dict[str, int]) -> Dict[str, Any]:
+    comp_of, comps, comp_succ = _place_components(st)
+    n = len(comps)
+    marked = [p for p, k in m0.items() if k > 0]
+
+    # Par composante (successeurs d'abord) : composante terminale unique atteignable
+    # (-1 s'il y en a plusieurs) et accès à une place sans sortie
+    unique_bottom = [0] * n
+    reaches_sink = [False] * n
+    for c in range(n):
+        if not comp_succ[c]:
+            unique_bottom[c] = c
+            reaches_sink[c] = any(not st.place_out[p] for p in comps[c])
+        else:
+            bottoms = {unique_bottom[d] for d in comp_succ[c]}
+            unique_bottom[c] = bottoms.pop() if len(bottoms) == 1 else -1
+            reaches_sink[c] = any(reaches_sink[d] for d in comp_succ[c])
+
+    # Borne d'une place = jetons des composantes qui l'atteignent (ancêtres, en masques de bits)
+    tokens = [sum(m0[p] for p in comp) for comp in comps]
+    ancestors = [1 << c for c in range(n)]
+    for c in range(n - 1, -1, -1):
+        for d in comp_succ[c]:
+            ancestors[d] |= ancestors[c]
+    comp_bound = []
+    for c in range(n):
+        mask, total = ancestors[c], 0
+        while mask:
+            low_bit = mask & -mask
+            total += tokens[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        comp_bound.append(total)
+    bounds = {p: comp_bound[comp_of[p]] for p in st.place_in}
+
+    # Un jeton peut toujours revenir en p ssi p est dans une composante terminale qui est
+    # la seule que ce jeton peut atteindre ; sinon tous les jetons peuvent s'en éloigner
+    committed = {unique_bottom[comp_of[q]] for q in marked}
+    live = all(
+        not comp_succ[comp_of[st.pre[t][0]]] and comp_of[st.pre[t][0]] in committed
+        for t in st.pre
+    )
+    # Deadlock accessible ssi chaque jeton peut finir dans une place sans sortie
+    deadlock = all(reaches_sink[comp_of[q]] for q in marked)
+    return {"live": live, "bounded": True, "bounds": bounds, "deadlock_free": not deadlock}
+
+
+def _marked_graph_analysis(st: _Structure, m0: Dict[str, int]) -> Dict[str, Any]:
+    # Graphe des transitions : t -> t' pour chaque place p avec •p = {t}, p• = {t'}
+    edges: Dict[str, List[Tuple[str, int]]] = {t: [] for t in st.pre}
+    for p in st.place_in:
+        edges[st.place_in[p][0]].append((st.place_out[p][0], m0[p]))
+
+    live = not _has_cycle({t: [u for u, w in out if w == 0] for t, out in edges.items()})
+    if not live:
+        return {"live": False, "bounded": None, "bounds": None, "deadlock_free": None}
+
+    # Un plus court chemin par transition de sortie, pour toutes ses places à la fois
+    by_output: Dict[str, List[str]] = {}
+    for p in st.place_in:
+        by_output.setdefault(st.place_out[p][0], []).append(p)
+    bounds: Dict[str, Optional[int]] = {}
+    for t_out, places in by_output.items():
+        dist = _dijkstra(edges, t_out, {st.place_in[p][0] for p in places})
+        for p in places:
+            d = dist.get(st.place_in[p][0])
+            bounds[p] = None if d is None else d + m0[p]
+    bounded = all(b is not None for b in bounds.values())
+    return {"live": True, "bounded": bounded, "bounds": bounds, "deadlock_free": bool(st.pre)}
+
+
+def _has_cycle(graph: Dict[str, List[str]]) -> bool:
+    # Tri topologique (Kahn) : il reste des sommets ssi il y a un cycle
+    indegree = {v: 0 for v in graph}
+    for out in graph.values():
+        for u in out:
+            indegree[u] += 1
+    stack = [v for v, d in indegree.items() if d == 0]
+    done = 0
+    while stack:
+        v = stack.pop()
+        done += 1
+        for u in graph[v]:
+            indegree[u] -= 1
+            if indegree[u] == 0:
+                stack.append(u)
+    return done < len(graph)
+
+
+#Distances depuis source ; s'arrête dès que toutes les cibles sont fixées.
+def _dijkstra(graph: Dict[str, List[Tuple[str, int]]], source: str, targets: set) -> Dict[str, int]:
+    dist = {source: 0}
+    heap = [(0, source)]
+    remaining = set(targets)
+    while heap and remaining:
+        d, v = heapq.heappop(heap)
+        if d > dist[v]:
+            continue
+        remaining.discard(v)
+        for u, w in graph[v]:
+            if d + w < dist.get(u, d + w + 1):
+                dist[u] = d + w
+                heapq.heappush(heap, (d + w, u))
+    return dist
+
+
+#Plus grand siphon (•S ⊆ S•) contenu dans places.
+def _max_siphon(st: _Structure, places: set) -> set:
+    s = set(places)
+    # Nombre de places d'entrée de chaque transition encore dans s
+    inside = {t: sum(1 for p in st.pre[t] if p in s) for t in st.pre}
+    stack = [p for p in s if any(inside[t] == 0 for t in st.place_in[p])]
+    while stack:
+        p = stack.pop()
+        if p not in s:
+            continue
+        s.discard(p)
+        for t in st.place_out[p]:
+            inside[t] -= 1
+            if inside[t] == 0:
+                stack.extend(q for q in st.post[t] if q in s)
+    return s
+
+
+#Plus grande trappe (S• ⊆ •S) contenue dans places.
+def _max_trap(st: _Structure, places: set) -> set:
+    s = set(places)
+    inside = {t: sum(1 for p in st.post[t] if p in s) for t in st.pre}
+    stack = [p for p in s if any(inside[t] == 0 for t in st.place_out[p])]
+    while stack:
+        p = stack.pop()
+        if p not in s:
+            continue
+        s.discard(p)
+        for t in st.place_in[p]:
+            inside[t] -= 1
+            if inside[t] == 0:
+                stack.extend(q for q in st.pre[t] if q in s)
+    return s
+
+
+"""
+Cherche un siphon non vide sans trappe marquée. Un tel siphon contenu dans X est dans
+le plus grand siphon S de X ; s'il ne contient pas toute la plus grande trappe T de S
+(sinon T, marquée, serait une trappe marquée du siphon), il manque au moins une place
+de T : on essaie S privé de chaque place de T. Renvoie (siphon ou None, décidé).
+
+Les fils S - {p} sont produits un par un (la pile garde S, T et la prochaine place de T
+à retirer) : la mémoire reste proportionnelle à la profondeur. Le travail total (places
+et transitions parcourues par les calculs de siphon et de trappe, doublons compris) est
+plafonné par max_work, en plus du nombre de siphons distincts (max_nodes) ; au-delà, la
+recherche abandonne sans conclure.
+"""
+
+SIPHON_MAX_WORK = 1_000_000
+
+
+# Renvoie (siphon, décidé, limite du budget atteinte ou None)
+def _siphon_without_marked_trap(
+    st: _Structure,
+    m0: Dict[str, int],
+    max_nodes: int,
+    budget: Optional[Budget] = None,
+    max_work: int = SIPHON_MAX_WORK,
+) -> Tuple[Optional[set], bool, Optional[str]]:
+    # Un siphon n'empêche de tirer que ses transitions de sortie : les places sans sortie n'y changent rien
+    candidate: Optional[set] = {p for p, out in st.place_out.items() if out}
+    # Cadres [S, places de T, prochain indice dans T]
+    stack: List[List[Any]] = []
+    seen = set()
+    work = 0
+    while True:
+        if candidate is not None:
+            if budget is not None:
+                reason = budget.poll()
+                if reason is not None:
+                    return None, False, reason
+            # _max_siphon et _max_trap parcourent chacun l'ensemble et toutes les transitions
+            work += 2 * (len(candidate) + len(st.pre))
+            if work > max_work:
+                return None, False, None
+            s = _max_siphon(st, candidate)
+            candidate = None
+            key = frozenset(s)
+            if s and key not in seen:
+                if len(seen) >= max_nodes:
+                    return None, False, None
+                seen.add(key)
+                trap = _max_trap(st, s)
+                if not any(m0[p] > 0 for p in trap):
+                    return s, True, None
+                stack.append([s, list(trap), 0])
+
+        if not stack:
+            return None, True, None
+        frame = stack[-1]
+        if frame[2] == len(frame[1]):
+            stack.pop()
+            continue
+        candidate = frame[0] - {frame[1][frame[2]]}
+        frame[2] += 1
+
+
+#  Simulation rapide (jeu de jetons)
+
+"""
+Simulation du jeu de jetons découplée de l'affichage.
+
+Le réseau est compilé une fois en tables d'indices (marquage = liste d'entiers).
+Après chaque tir, seules les transitions dont une pré-place a changé sont
+re-testées : run(n) enchaîne donc des milliers de tirs par appel, et l'interface
+ne redessine qu'une fois par image.
+
+Politiques de choix parmi les transitions franchissables :
+- "first"       : la première dans l'ordre de création,
+- "random"      : tirage uniforme (graine optionnelle pour rejouer une simulation),
+- "round_robin" : la suivante après la dernière tirée, en tournant,
+- "priority"    : la plus grande Transition.priority (à égalité, ordre de création).
+
+Chaque politique garde les transitions franchissables dans une structure mise à jour à
+chaque changement (add / discard), pour que le choix ne re-parcoure pas tout l'ensemble :
+- first / priority : tas de rangs à suppression paresseuse, choix en O(log n),
+- random           : liste indexable avec retrait par échange, choix en O(1),
+- round_robin      : arbre de Fenwick sur les indices, « suivante après t » en O(log n).
+"""
+
+SIMULATION_POLICIES = ("first", "random", "round_robin", "priority")
+
+
+#Tas des rangs franchissables ; une entrée devenue non franchissable n'est retirée qu'en sommet de tas.
+class _EnabledHeap:
+    def __init__(self, order: List[int]) -> None:
+        self.order = order                    # rang -> transition
+        self.rank = [0] * len(order)          # transition -> rang
+        for r, t in enumerate(order):
+            self.rank[t] = r
+        self.on = bytearray(len(order))
+        self.in_heap = bytearray(len(order))
+        self.heap: List[int] = []
+
+    def add(self, t: int) -> None:
+        self.on[t] = 1
+        if not self.in_heap[t]:
+            self.in_heap[t] = 1
+            heapq.heappush(self.heap, self.rank[t])
+
+    def discard(self, t: int) -> None:
+        self.on[t] = 0
+
+    def choose(self, last: int, rng: random.Random) -> int:
+        heap, order = self.heap, self.order
+        while not self.on[order[heap[0]]]:
+            self.in_heap[order[heapq.heappop(heap)]] = 0
+        return order[heap[0]]
+
+
+#Liste des transitions franchissables ; retrait en O(1) en déplaçant la dernière à sa place.
+class _EnabledList:
+    def __init__(self, n: int) -> None:
+        self.items: List[int] = []
+        self.pos = [-1] * n
+
+    def add(self, t: int) -> None:
+        if self.pos[t] < 0:
+            self.pos[t] = len(self.items)
+            self.items.append(t)
+
+    def discard(self, t: int) -> None:
+        i = self.pos[t]
+        if i >= 0:
+            last = self.items.pop()
+            if last != t:
+                self.items[i] = last
+                self.pos[last] = i
+            self.pos[t] = -1
+
+    def choose(self, last: int, rng: random.Random) -> int:
+        return self.items[rng.randrange(len(self.items))]
+
+
+#Arbre de Fenwick (1 = franchissable) : la première transition franchissable après last, en tournant.
+class _EnabledFenwick:
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.tree = [0] * (n + 1)
+        self.on = bytearray(n)
+        self.count = 0
+        self.top = 1 << max(n.bit_length() - 1, 0)
+
+    def _update(self, t: int, v: int) -> None:
+        i = t + 1
+        while i <= self.n:
+            self.tree[i] += v
+            i += i & -i
+
+    def add(self, t: int) -> None:
+        if not self.on[t]:
+            self.on[t] = 1
+            self.count += 1
+            self._update(t, 1)
+
+    def discard(self, t: int) -> None:
+        if self.on[t]:
+            self.on[t] = 0
+            self.count -= 1
+            self._update(t, -1)
+
+    #Nombre de transitions franchissables d'indice <= t.
+    def _prefix(self, t: int) -> int:
+        total, i = 0, t + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    #Indice de la k-ième transition franchissable (k >= 1).
+    def _select(self, k: int) -> int:
+        i, step = 0, self.top
+        while step:
+            if i + step <= self.n and self.tree[i + step] < k:
+                i += step
+                k -= self.tree[i]
+            step >>= 1
+        return i
+
+    def choose(self, last: int, rng: random.Random) -> int:
+        before = self._prefix(last) if last >= 0 else 0
+        return self._select(before + 1 if before < self.count else 1)
+
+
+class Simulation:
+    def __init__(
+        self,
+        net: PetriNet,
+        marking: Optional[Dict[str, int]] = None,
+        policy: str = "first",
+        seed: Optional[int] = None,
+    ) -> None:
+        if policy not in SIMULATION_POLICIES:
+            raise ValueError(f"Politique inconnue: {policy} (attendu: {', '.join(SIMULATION_POLICIES)})")
+
+        self.policy = policy
+        self.rng = random.Random(seed)
+        self.steps = 0               # nombre total de tirs effectués
+        self.deadlocked = False      # True si plus aucune transition n'est franchissable
+        self.last_fired: Optional[str] = None
+
+        # Indices internes du réseau : place_ids / transition_ids dans l'ordre de création
+        tables = net.arc_tables()
+        self.place_ids: List[str] = net.place_ids()
+        self.transition_ids: List[str] = net.transition_ids()
+
+        self._pre = []
+        delta: List[Dict[int, int]] = []
+        for t in range(len(self.transition_ids)):
+            lo, hi = tables.pre_start[t], tables.pre_start[t + 1]
+            pairs = list(zip(tables.pre_place[lo:hi], tables.pre_weight[lo:hi]))
+            self._pre.append(pairs)
+            d: Dict[int, int] = {}
+            for i, w in pairs:
+                d[i] = d.get(i, 0) - w
+            lo, hi = tables.post_start[t], tables.post_start[t + 1]
+            for i, w in zip(tables.post_place[lo:hi], tables.post_weight[lo:hi]):
+                d[i] = d.get(i, 0) + w
+            delta.append({i: v for i, v in d.items() if v != 0})
+        self._delta = [list(d.items()) for d in delta]
+
+        # Transitions à re-tester quand une place change
+        consumers: List[List[int]] = [[] for _ in self.place_ids]
+        for t, pairs in enumerate(self._pre):
+            for i, _ in pairs:
+                consumers[i].append(t)
+        self._affected = [
+            sorted({u for i in d for u in consumers[i]}) for d in delta
+        ]
+
+        n = len(self.transition_ids)
+        if policy == "first":
+            self._chooser: Any = _EnabledHeap(list(range(n)))
+        elif policy == "priority":
+            self._chooser = _EnabledHeap(sorted(
+                range(n), key=lambda t: (-net.transitions[self.transition_ids[t]].priority, t)
+            ))
+        elif policy == "random":
+            self._chooser = _EnabledList(n)
+        else:
+            self._chooser = _EnabledFenwick(n)
+        self._last = -1
+
+        source = net.initial_marking() if marking is None else marking
+        self._marking = [int(source.get(pid, 0)) for pid in self.place_ids]
+        self._enabled = {t for t in range(n) if self._is_enabled(t)}
+        for t in sorted(self._enabled):
+            self._chooser.add(t)
+        self.deadlocked = not self._enabled
+
+    def _is_enabled(self, t: int) -> bool:
+        m = self._marking
+        for i, w in self._pre[t]:
+            if m[i] < w:
+                return False
+        return True
+
+    def _choose(self) -> int:
+        if not self._enabled:
+            raise RuntimeError("aucune transition franchissable")
+        return self._chooser.choose(self._last, self.rng)
+
+    #Effectue au plus n tirs ; s'arrête avant si le réseau est bloqué. Renvoie le nombre de tirs faits.
+    def run(self, n: int) -> int:
+        m = self._marking
+        enabled = self._enabled
+        chooser = self._chooser
+        fired = 0
+        t = -1
+        while fired < n and enabled:
+            t = chooser.choose(self._last, self.rng)
+            for i, d in self._delta[t]:
+                m[i] += d
+            for u in self._affected[t]:
+                if self._is_enabled(u):
+                    if u not in enabled:
+                        enabled.add(u)
+                        chooser.add(u)
+                elif u in enabled:
+                    enabled.discard(u)
+                    chooser.discard(u)
+            self._last = t
+            fired += 1
+
+        self.steps += fired
+        if fired:
+            self.last_fired = self.transition_ids[t]
+        self.deadlocked = not enabled
+        return fired
+
+    #Marquage courant sous forme de dict place -> jetons.
+    @property
+    def marking(self) -> Dict[str, int]:
+        return dict(zip(self.place_ids, self._marking))
+
+    #Transitions franchissables dans le marquage courant (ordre de création).
+    def enabled_transitions(self) -> List[str]:
+        return [self.transition_ids[t] for t in sorted(self._enabled)]
+
+
+
 #  Façade Frontend (JSON)
 
+#Les délais ne sont exportés que pour les transitions temporisées (JSON inchangé sinon).
+def _transition_to_dict(t: Transition) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"id": t.id, "name": t.name, "priority": t.priority}
+    if t.timed:
+        data["delay"] = t.delay
+        if t.max_delay is not None:
+            data["max_delay"] = t.max_delay
+    return data
+
+
 #Construit un objet PetriNet à partir d'un dictionnaire JSON (clé 'places','transitions', 'arcs'). 
 #Sert de point d'entrée pour le frontend ou la ligne de commande.
 def load_petri_from_dict(data: Dict[str, Any]) -> PetriNet:
@@ -418,6 +2780,15 @@ def load_petri_from_dict(data: Dict[str, Any]) -> PetriNet:
 
     net = PetriNet()
 
+    # Chargement en une seule transaction : une seule passe de validation des arcs
+    with net.batch():
+        _fill_from_dict(net, data)
+
+    return net
+
+
+#Ajoute places, transitions et arcs du dict au réseau (appelé dans une transaction batch()).
+def _fill_from_dict(net: PetriNet, data: Dict[str, Any]) -> None:
     for p in data["places"]:
         if not isinstance(p, dict):
             raise ValueError("Chaque place doit être un dict")
@@ -436,6 +2807,9 @@ def load_petri_from_dict(data: Dict[str, Any]) -> PetriNet:
             Transition(
                 id=t["id"],
                 name=t.get("name", t["id"]),
+                priority=int(t.get("priority", 0)),
+                delay=float(t.get("delay", 0.0)),
+                max_delay=None if t.get("max_delay") is None else float(t["max_delay"]),
             )
         )
 
@@ -450,23 +2824,79 @@ def load_petri_from_dict(data: Dict[str, Any]) -> PetriNet:
             )
         )
 
-    return net
-
 
 """
 Point d'entrée :
 - charge le réseau à partir d'un dict,
-- effectue l'analyse de reachability,
-- renvoie à la fois le réseau, l'analyse, le graphe d'états (dict) et le DOT.
+- effectue l'analyse de reachability (dans les limites de budget, voir Budget ;
+  analysis["stopped_by"] indique la limite qui l'a arrêtée),
+- renvoie à la fois le réseau, l'analyse, les statistiques d'exploration (voir
+  ReachabilityStatistics), le graphe d'états (dict) et le DOT.
+
+Le budget couvre toute l'analyse : il est vérifié pendant l'exploration et avant les
+exports. Si une échéance, le plafond mémoire ou une annulation interrompt l'analyse, le
+résultat s'arrête à la dernière étape terminée et porte "stopped_by" (la limite
+atteinte) ; les exports ne sont alors pas produits. Avec explore=False, l'analyse
+structurelle n'en reçoit qu'une part (STRUCTURAL_BUDGET_SHARE, voir Budget.share) : si
+elle l'épuise, elle ne conclut pas (structure["stopped_by"]) et l'exploration se fait
+avec le reste.
+
+Avec explore=False, on classe d'abord le réseau et on applique l'analyse structurelle de
+sa classe (clé "structure", voir PetriNet.structural_analysis). Si elle décide la vivacité
+et l'absence de deadlock, l'exploration est sautée : le résultat ne contient alors que
+"network" et "structure". Sinon (classe générale, question non décidée) on explore comme
+d'habitude. Par défaut l'analyse structurelle n'est pas faite : pour les réseaux free
+choice, la recherche de siphons peut coûter bien plus qu'une exploration bornée.
 """
-def analyze_from_dict(data: Dict[str, Any], max_states: int = 10000) -> Dict[str, Any]:
-    net = load_petri_from_dict(data)
-    return {
-        "network": net.to_dict(),
-        "analysis": net.analyze_reachability(max_states=max_states),
-        "reachability": net.reachability_to_dict(max_states=max_states),
-        "dot": net.reachability_to_dot(max_states=max_states),
-    }
+def analyze_from_dict(
+    data: Dict[str, Any],
+    max_states: int = 10000,
+    progress: Optional[Callable[[int, int], None]] = None,
+    explore: bool = True,
+    budget: Optional[Budget] = None,
+) -> Dict[str, Any]:
+    return analyze_net(load_petri_from_dict(data), max_states=max_states, progress=progress, explore=explore, budget=budget)
+
+
+# Part du temps et de la marge mémoire laissée à l'analyse structurelle (explore=False)
+STRUCTURAL_BUDGET_SHARE = 0.5
+
+
+#Même analyse pour un réseau déjà construit (par exemple importé en PNML ou en binaire).
+def analyze_net(
+    net: PetriNet,
+    max_states: int = 10000,
+    progress: Optional[Callable[[int, int], None]] = None,
+    explore: bool = True,
+    budget: Optional[Budget] = None,
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"network": net.to_dict()}
+    if not explore:
+        # L'analyse structurelle n'a droit qu'à une part du budget : l'exploration garde le reste
+        shared = None if budget is None else budget.share(STRUCTURAL_BUDGET_SHARE)
+        structure = result["structure"] = net.structural_analysis(budget=shared)
+        if structure["stopped_by"] == "cancelled":
+            result["stopped_by"] = "cancelled"
+            return result
+        if structure["live"] is not None and structure["deadlock_free"] is not None:
+            return result
+
+    # Une seule exploration, partagée par l'analyse et les exports
+    res = net.reachability_bfs(max_states=max_states, progress=progress, budget=budget, statistics=True)
+    result["analysis"] = net.analyze_reachability(reachability=res)
+    result["statistics"] = res["statistics"]
+
+    # Exports seulement si le budget n'est pas épuisé (échéance, mémoire, annulation)
+    reason = None if budget is None else budget.poll()
+    if reason is None and res["stopped_by"] in ("deadline", "memory", "cancelled"):
+        reason = res["stopped_by"]
+    if reason is not None:
+        result["stopped_by"] = reason
+        return result
+
+    result["reachability"] = net.reachability_to_dict(reachability=res)
+    result["dot"] = net.reachability_to_dot(reachability=res)
+    return result
 
 
 def analyze_from_json_file(path: str, max_states: int = 10000) -> Dict[str, Any]:
@@ -0,0 +1,369 @@
+"""
+Réductions structurelles avant l'exploration de l'espace d'états.
+
+Des règles qui préservent les deadlocks sont appliquées jusqu'à point fixe :
+- place constante : place seulement lue (chaque transition la consomme et la remet à
+  l'identique) avec assez de jetons pour toutes ses lectures : elle ne bloque jamais,
+- place redondante : deux places avec les mêmes arcs (mêmes poids) ; celle qui a le plus
+  de jetons initiaux suit l'autre avec un écart constant, elle ne bloque jamais seule,
+- transitions parallèles : mêmes arcs d'entrée et de sortie ; on n'en garde qu'une,
+- transition boucle : ne modifie pas le marquage ; on la retire (les marquages atteints
+  sont les mêmes) et on élimine à la remontée les deadlocks où elle était franchissable,
+- fusion en série (post-agglomération) : une place vide au départ, alimentée par une seule
+  transition t1 (poids 1) et vidée par une seule transition t2 dont c'est la seule
+  entrée (poids 1) : t2 est toujours franchissable dès que la place est marquée, on
+  fusionne t1 puis t2 en une seule transition « t1+t2 ».
+
+Les arcs parallèles n'existent pas dans ce modèle : un seul arc par couple
+(source, cible), add_arc refuse les doublons.
+
+La réduction garde tout ce qu'il faut pour remonter les résultats au réseau d'origine
+(Reduction.lift_marking, lift_trace, lift_deadlocks, lift_bounds). Les bornes des places
+gardées restent exactes (un état intermédiaire d'une fusion a moins de jetons que l'état
+qui le suit) ; celle d'une place absorbée par une fusion est inconnue (None).
+Les priorités et délais des transitions fusionnées ne sont pas conservés : la réduction
+sert à l'analyse de l'espace d'états, pas à la simulation.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from petri import Arc, PetriNet, Place, Transition
+
+
+#File de travail sans doublons : un élément déjà en attente n'est pas ajouté deux fois.
+class _Worklist:
+    def __init__(self, items: List[str]) -> None:
+        self.queue: Deque[str] = deque(items)
+        self.pending: Set[str] = set(items)
+
+    def push(self, item: str) -> None:
+        if item not in self.pending:
+            self.pending.add(item)
+            self.queue.append(item)
+
+    def pop(self) -> str:
+        item = self.queue.popleft()
+        self.pending.discard(item)
+        return item
+
+
+"""
+Les règles ne re-parcourent pas tout le réseau après chaque application : on garde
+l'incidence place -> transitions (consumers / producers), une signature par place
+(colonne) et par transition (arcs d'entrée et de sortie) indexées pour trouver les
+doublons, et une file de travail par règle. Chaque modification remet en file les seules
+places et transitions qu'elle touche ; la file de la règle la plus prioritaire est
+toujours vidée en premier. Point fixe atteint quand toutes les files sont vides.
+"""
+
+
+class Reduction:
+    def __init__(self, net: PetriNet) -> None:
+        self.original = net
+
+        self._m0: Dict[str, int] = net.initial_marking()
+        self._pre: Dict[str, Dict[str, int]] = {}
+        self._post: Dict[str, Dict[str, int]] = {}
+        for tid in net.transition_ids():
+            self._pre[tid] = {a.source_id: a.weight for a in net.incoming_arcs(tid)}
+            self._post[tid] = {a.target_id: a.weight for a in net.outgoing_arcs(tid)}
+        # Places gardées (dict pour des retraits en O(1), dans l'ordre d'origine)
+        self._places: Dict[str, None] = dict.fromkeys(net.place_ids())
+        # Rang de chaque transition ; une fusion prend le rang de sa première transition
+        self._rank: Dict[str, int] = {tid: i for i, tid in enumerate(self._pre)}
+
+        # Incidence : place -> {transition: poids} pour les arcs sortants / entrants de la place
+        self._consumers: Dict[str, Dict[str, int]] = {pid: {} for pid in self._places}
+        self._producers: Dict[str, Dict[str, int]] = {pid: {} for pid in self._places}
+        for tid in self._pre:
+            for pid, w in self._pre[tid].items():
+                self._consumers[pid][tid] = w
+            for pid, w in self._post[tid].items():
+                self._producers[pid][tid] = w
+
+        # Signatures indexées : colonne d'une place, arcs d'une transition
+        self._column: Dict[str, Hashable] = {}
+        self._by_column: Dict[Hashable, Dict[str, None]] = {}
+        self._key: Dict[str, Hashable] = {}
+        self._by_key: Dict[Hashable, Dict[str, None]] = {}
+        for pid in self._places:
+            self._index_place(pid)
+        for tid in self._pre:
+            self._index_transition(tid)
+
+        # Transition réduite -> séquence de transitions d'origine
+        self.transition_map: Dict[str, List[str]] = {tid: [tid] for tid in self._pre}
+        # Places retirées, dans l'ordre : (place, "constant", valeur, None)
+        # / (place, "copy", écart, place suivie) / (place, "fused", 0, None)
+        self.removed_places: List[Tuple[str, str, int, Optional[str]]] = []
+        self.duplicates: Dict[str, str] = {}   # transition retirée -> transition réduite équivalente
+        self.self_loops: List[str] = []         # transitions boucles retirées
+        self.rules: List[str] = []              # journal des règles appliquées
+
+        # Files par règle, dans l'ordre de priorité
+        self._worklists = [
+            (_Worklist(list(self._pre)), self._pre, self._remove_self_loop),
+            (_Worklist(list(self._places)), self._places, self._remove_constant_place),
+            (_Worklist(list(self._places)), self._places, self._remove_redundant_place),
+            (_Worklist(list(self._pre)), self._pre, self._merge_parallel_transitions),
+            (_Worklist(list(self._places)), self._places, self._fuse_series),
+        ]
+        while True:
+            for worklist, alive, rule in self._worklists:
+                if worklist.queue:
+                    item = worklist.pop()
+                    # Élément retiré depuis sa mise en file : rien à faire
+                    if item in alive:
+                        rule(item)
+                    break
+            else:
+                break
+
+        self.net = self._build()
+
+    # Règles
+
+    def _remove_self_loop(self, tid: str) -> None:
+        if self._pre[tid] == self._post[tid]:
+            self._remove_transition(tid)
+            self.self_loops.extend(self.transition_map.pop(tid))
+            self.rules.append(f"boucle retirée: {tid}")
+
+    def _remove_constant_place(self, pid: str) -> None:
+        m0 = self._m0[pid]
+        consumers = self._consumers[pid]
+        if consumers == self._producers[pid] and all(w <= m0 for w in consumers.values()):
+            self._drop_place(pid, "constant", m0, None)
+
+    def _remove_redundant_place(self, pid: str) -> None:
+        same = self._by_column[self._column[pid]]
+        if len(same) < 2:
+            return
+        other = next(p for p in same if p != pid)
+        # La place la plus marquée ne bloque jamais : c'est elle qu'on retire
+        keep, drop = (other, pid) if self._m0[other] <= self._m0[pid] else (pid, other)
+        self._drop_place(drop, "copy", self._m0[drop] - self._m0[keep], keep)
+
+    def _merge_parallel_transitions(self, tid: str) -> None:
+        same = self._by_key[self._key[tid]]
+        if len(same) < 2:
+            return
+        # On garde la première dans l'ordre des transitions
+        keep = min(same, key=self._rank.__getitem__)
+        for other in [t for t in same if t != keep]:
+            self._remove_transition(other)
+            for original in self.transition_map.pop(other):
+                self.duplicates[original] = keep
+            self.rules.append(f"transition parallèle retirée: {other} (= {keep})")
+
+    def _fuse_series(self, pid: str) -> None:
+        producers, consumers = self._producers[pid], self._consumers[pid]
+        if self._m0[pid] != 0 or len(producers) != 1 or len(consumers) != 1:
+            return
+        (t1,), (t2,) = producers, consumers
+        if (
+            t1 == t2
+            or self._post[t1][pid] != 1
+            or self._pre[t2] != {pid: 1}
+            or pid in self._pre[t1]
+            or pid in self._post[t2]
+        ):
+            return
+
+        post = {p: w for p, w in self._post[t1].items() if p != pid}
+        for p, w in self._post[t2].items():
+            post[p] = post.get(p, 0) + w
+        pre = dict(self._pre[t1])
+        fused = self._fresh_id(f"{t1}+{t2}")
+        rank = self._rank[t1]
+
+        self._remove_transition(t1)
+        self._remove_transition(t2)
+        # La transition fusionnée prend la place de t1 dans l'ordre des transitions
+        self._add_transition(fused, pre, post, rank)
+        sequence = self.transition_map.pop(t1)
+        sequence.extend(self.transition_map.pop(t2))
+        self.transition_map[fused] = sequence
+        self._drop_place(pid, "fused", 0, None)
+        self.rules.append(f"fusion en série: {t1} ; {t2} (place {pid})")
+
+    # Mise à jour incrémentale
+
+    def _index_place(self, pid: str) -> None:
+        consumers, producers = self._consumers[pid], self._producers[pid]
+        column = frozenset(
+            (tid, consumers.get(tid, 0), producers.get(tid, 0))
+            for tid in consumers.keys() | producers.keys()
+        )
+        self._unindex(self._column, self._by_column, pid)
+        self._column[pid] = column
+        self._by_column.setdefault(column, {})[pid] = None
+
+    def _index_transition(self, tid: str) -> None:
+        key = (frozenset(self._pre[tid].items()), frozenset(self._post[tid].items()))
+        self._unindex(self._key, self._by_key, tid)
+        self._key[tid] = key
+        self._by_key.setdefault(key, {})[tid] = None
+
+    @staticmethod
+    def _unindex(signature: Dict[str, Hashable], index: Dict[Hashable, Dict[str, None]], item: str) -> None:
+        old = signature.pop(item, None)
+        if old is not None:
+            bucket = index[old]
+            del bucket[item]
+            if not bucket:
+                del index[old]
+
+    #Remet en file une place modifiée pour les règles de places.
+    def _touch_place(self, pid: str) -> None:
+        self._index_place(pid)
+        for worklist, alive, _ in self._worklists:
+            if alive is self._places:
+                worklist.push(pid)
+
+    #Remet en file une transition modifiée, et ses places (la fusion dépend de ses arcs d'entrée).
+    def _touch_transition(self, tid: str) -> None:
+        self._index_transition(tid)
+        for worklist, alive, _ in self._worklists:
+            if alive is self._pre:
+                worklist.push(tid)
+        for pid in self._pre[tid].keys() | self._post[tid].keys():
+            self._touch_place(pid)
+
+    def _remove_transition(self, tid: str) -> None:
+        pre, post = self._pre.pop(tid), self._post.pop(tid)
+        self._unindex(self._key, self._by_key, tid)
+        for pid in pre:
+            del self._consumers[pid][tid]
+        for pid in post:
+            del self._producers[pid][tid]
+        for pid in pre.keys() | post.keys():
+            self._touch_place(pid)
+
+    def _add_transition(self, tid: str, pre: Dict[str, int], post: Dict[str, int], rank: int) -> None:
+        self._pre[tid], self._post[tid] = pre, post
+        self._rank[tid] = rank
+        for pid, w in pre.items():
+            self._consumers[pid][tid] = w
+        for pid, w in post.items():
+            self._producers[pid][tid] = w
+        self._touch_transition(tid)
+
+    def _drop_place(self, pid: str, kind: str, value: int, ref: Optional[str]) -> None:
+        touched = self._consumers.pop(pid).keys() | self._producers.pop(pid).keys()
+        for tid in touched:
+            self._pre[tid].pop(pid, None)
+            self._post[tid].pop(pid, None)
+        del self._places[pid]
+        self._unindex(self._column, self._by_column, pid)
+        for tid in touched:
+            self._touch_transition(tid)
+        self.removed_places.append((pid, kind, value, ref))
+        if kind == "constant":
+            self.rules.append(f"place constante retirée: {pid} ({value} jetons)")
+        elif kind == "copy":
+            self.rules.append(f"place redondante retirée: {pid} (= {ref} + {value})")
+
+    def _fresh_id(self, base: str) -> str:
+        original = self.original
+        candidate, i = base, 2
+        while candidate in self._pre or candidate in original.places or candidate in original.transitions:
+            candidate = f"{base}#{i}"
+            i += 1
+        return candidate
+
+    def _build(self) -> PetriNet:
+        original = self.original
+        places = [Place(pid, original.places[pid].name, self._m0[pid]) for pid in self._places]
+        order = sorted(self._pre, key=self._rank.__getitem__)
+        transitions = []
+        for tid in order:
+            if tid in original.transitions:
+                transitions.append(original.transitions[tid])
+            else:
+                transitions.append(Transition(tid, "+".join(original.transitions[t].name for t in self.transition_map[tid])))
+        arcs = []
+        for tid in order:
+            arcs += [Arc(pid, tid, w) for pid, w in self._pre[tid].items()]
+            arcs += [Arc(tid, pid, w) for pid, w in self._post[tid].items()]
+        return PetriNet.from_elements(places, transitions, arcs)
+
+    # Remontée des résultats
+
+    #Marquage du réseau d'origine correspondant à un marquage du réseau réduit.
+    def lift_marking(self, marking: Dict[str, int]) -> Dict[str, int]:
+        full = dict(marking)
+        for pid, kind, value, ref in reversed(self.removed_places):
+            full[pid] = full[ref] + value if kind == "copy" else value
+        return {pid: full[pid] for pid in self.original.place_ids()}
+
+    #Séquence de tirs du réseau d'origine correspondant à une trace du réseau réduit.
+    def lift_trace(self, trace: List[str]) -> List[str]:
+        lifted: List[str] = []
+        for tid in trace:
+            lifted.extend(self.transition_map[tid])
+        return lifted
+
+    #Deadlocks d'origine à partir d'un résultat reachability_bfs du réseau réduit.
+    def lift_deadlocks(self, reachability: Dict[str, Any]) -> List[Dict[str, int]]:
+        lifted = []
+        for sid in reachability["deadlocks"]:
+            m = self.lift_marking(reachability["states"][sid])
+            # Une transition boucle retirée encore franchissable : pas un deadlock
+            if not any(self.original.enabled(tid, m) for tid in self.self_loops):
+                lifted.append(m)
+        return lifted
+
+    #Bornes des places d'origine (None = inconnue : place absorbée par une fusion en série).
+    def lift_bounds(self, max_tokens: Dict[str, int]) -> Dict[str, Optional[int]]:
+        bounds: Dict[str, Optional[int]] = dict(max_tokens)
+        for pid, kind, value, ref in reversed(self.removed_places):
+            if kind == "constant":
+                bounds[pid] = value
+            elif kind == "copy":
+                bounds[pid] = None if bounds[ref] is None else bounds[ref] + value
+            else:
+                bounds[pid] = None
+        return {pid: bounds[pid] for pid in self.original.place_ids()}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "original": {"places": len(self.original.places), "transitions": len(self.original.transitions)},
+            "reduced": {"places": len(self.net.places), "transitions": len(self.net.transitions)},
+            "rules": list(self.rules),
+        }
+
+
+"""
+Réduit le réseau, explore le réseau réduit et remonte les résultats :
+deadlocks (marquages d'origine), max_tokens (bornes, None si inconnue) et, si au moins
+un deadlock existe, deadlock_trace (séquence de tirs d'origine vers le premier).
+"""
+
+
+def analyze_reduced(net: PetriNet, max_states: int = 10000) -> Dict[str, Any]:
+    reduction = Reduction(net)
+    reduced = reduction.net
+    res = reduced.reachability_bfs(max_states=max_states)
+    graph = reduced.reachability_graph(reachability=res)
+    analysis = reduced.analyze_reachability(reachability=graph)
+
+    deadlocks = reduction.lift_deadlocks(res)
+    trace = None
+    if deadlocks:
+        target = next(
+            sid for sid in res["deadlocks"]
+            if reduction.lift_marking(res["states"][sid]) == deadlocks[0]
+        )
+        trace = reduction.lift_trace(graph.path(target))
+
+    return {
+        **reduction.summary(),
+        "num_states": analysis["num_states"],
+        "num_edges": analysis["num_edges"],
+        "deadlocks": deadlocks,
+        "deadlock_trace": trace,
+        "max_tokens": reduction.lift_bounds(analysis["max_tokens"]),
+        "truncated": res["truncated"],
+    }
@@ -0,0 +1,442 @@
+"""
+Service local d'analyse asynchrone, pour appeler le moteur sans passer par l'interface Tk.
+
+Lancement :
+    python service.py --port 8765 --workers 4
+    python service.py --unix /tmp/petri.sock
+
+API HTTP (JSON) :
+    POST   /jobs              {"net": {...}, "max_states": 10000}
+                              -> 202 {"id", "status", "deduplicated"}
+    GET    /jobs              -> liste des jobs
+    GET    /jobs/<id>         -> état et progression (états / arêtes explorés)
+    GET    /jobs/<id>/result  -> résultat de analyze_from_dict (409 tant que le job n'est pas fini)
+    GET    /jobs/<id>/events  -> flux NDJSON (une ligne JSON par progression) jusqu'à la fin du job
+    DELETE /jobs/<id>         -> annulation
+    GET    /health
+
+Les analyses tournent dans un pool borné de processus : la boucle asyncio ne fait que
+du routage et reste réactive même avec des dizaines d'explorations lourdes en parallèle.
+Deux soumissions identiques (même réseau, même max_states) pendant qu'une analyse est
+en cours partagent le même job. Un job en cours est annulé de façon coopérative : chaque
+job tourne avec un Budget dont le jeton d'annulation lit l'ensemble partagé des jobs
+annulés, et le moteur s'arrête au prochain contrôle du budget (résultat "stopped_by":
+"cancelled", le job passe alors à l'état cancelled).
+
+Pour des réseaux soumis par n'importe qui, --time-limit et --max-memory-mb bornent chaque
+job (Budget du moteur) : l'exploration s'arrête proprement et le résultat indique la
+limite atteinte ("stopped_by", et analysis["stopped_by"] si l'exploration a commencé).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from petri import Budget, analyze_from_dict
+
+
+MAX_BODY = 256 * 1024 * 1024
+TERMINAL_STATUSES = ("done", "failed", "cancelled")
+
+REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+}
+
+
+
+#  Côté processus de travail
+
+
+_progress_queue = None
+_cancelled = None
+
+
+#Jeton d'annulation du Budget : lit l'ensemble des jobs annulés partagé avec le service.
+class _JobToken:
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+
+    @property
+    def cancelled(self) -> bool:
+        return self.job_id in _cancelled
+
+
+def _init_worker(progress_queue, cancelled) -> None:
+    global _progress_queue, _cancelled
+    _progress_queue = progress_queue
+    _cancelled = cancelled
+
+
+def _run_job(
+    job_id: str,
+    data: Dict[str, Any],
+    max_states: int,
+    time_limit: Optional[float] = None,
+    max_memory: Optional[int] = None,
+) -> Dict[str, Any]:
+    _progress_queue.put((job_id, 0, 0))
+
+    def progress(num_states: int, num_edges: int) -> None:
+        _progress_queue.put((job_id, num_states, num_edges))
+
+    # Toujours un budget : c'est lui qui porte l'annulation, même sans limite de temps ni de mémoire
+    budget = Budget(time_limit=time_limit, max_memory=max_memory, cancel=_JobToken(job_id))
+    return analyze_from_dict(data, max_states=max_states, progress=progress, budget=budget)
+
+
+
+#  Côté service (boucle asyncio)
+
+
+class Job:
+    def __init__(self, job_id: str, key: str, max_states: int) -> None:
+        self.id = job_id
+        self.key = key
+        self.max_states = max_states
+        self.status = "queued"       # queued / running / cancelling / done / failed / cancelled
+        self.num_states = 0
+        self.num_edges = 0
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.pool_future = None      # concurrent.futures.Future du pool
+        self.future = None           # même future, côté asyncio
+        self.listeners: List[asyncio.Queue] = []
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "max_states": self.max_states,
+            "num_states": self.num_states,
+            "num_edges": self.num_edges,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def job_key(data: Dict[str, Any], max_states: int) -> str:
+    canonical = json.dumps({"net": data, "max_states": max_states}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AnalysisService:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_jobs_kept: int = 1000,
+        time_limit: Optional[float] = None,
+        max_memory: Optional[int] = None,
+    ) -> None:
+        self.workers = workers
+        self.max_jobs_kept = max_jobs_kept
+        # Limites appliquées à chaque job (secondes, octets de mémoire résidente du processus)
+        self.time_limit = time_limit
+        self.max_memory = max_memory
+        self.jobs: Dict[str, Job] = {}
+        self.inflight: Dict[str, str] = {}    # clé du réseau -> id du job en cours
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._manager = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cancelled = None
+        self._progress_queue = None
+        self._progress_thread: Optional[threading.Thread] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # Cycle de vie
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None):
+        self._loop = asyncio.get_running_loop()
+        # Pas de fork direct : les processus hériteraient des sockets ouverts du serveur
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._manager = ctx.Manager()
+        self._cancelled = self._manager.dict()
+        self._progress_queue = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self._progress_queue, self._cancelled),
+        )
+        self._progress_thread = threading.Thread(target=self._read_progress, daemon=True)
+        self._progress_thread.start()
+
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for job in self.jobs.values():
+            if job.status not in TERMINAL_STATUSES:
+                self._cancelled[job.id] = True
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._progress_queue.put(None)
+        self._progress_thread.join()
+        self._manager.shutdown()
+
+    #Lit les messages de progression des processus de travail (thread dédié, bloquant).
+    def _read_progress(self) -> None:
+        while True:
+            msg = self._progress_queue.get()
+            if msg is None:
+                return
+            self._loop.call_soon_threadsafe(self._on_progress, *msg)
+
+    def _on_progress(self, job_id: str, num_states: int, num_edges: int) -> None:
+        job = self.jobs.get(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return
+        if job.status == "queued":
+            job.status = "running"
+            job.started = time.time()
+        job.num_states = num_states
+        job.num_edges = num_edges
+        self._notify(job)
+
+    def _notify(self, job: Job) -> None:
+        info = job.info()
+        for queue in job.listeners:
+            queue.put_nowait(info)
+
+    # Jobs
+
+    #Soumet une analyse ; renvoie (job, True) si un job identique était déjà en cours.
+    def submit(self, data: Dict[str, Any], max_states: int = 10000) -> Tuple[Job, bool]:
+        if not isinstance(data, dict) or any(k not in data for k in ("places", "transitions", "arcs")):
+            raise ValueError("net doit être un dict avec 'places', 'transitions' et 'arcs'")
+        if not isinstance(max_states, int) or max_states <= 0:
+            raise ValueError("max_states doit être un entier > 0")
+
+        key = job_key(data, max_states)
+        existing = self.inflight.get(key)
+        if existing is not None:
+            return self.jobs[existing], True
+
+        job = Job(str(next(self._ids)), key, max_states)
+        self.jobs[job.id] = job
+        self.inflight[key] = job.id
+        job.pool_future = self._pool.submit(_run_job, job.id, data, max_states, self.time_limit, self.max_memory)
+        job.future = asyncio.wrap_future(job.pool_future, loop=self._loop)
+        job.future.add_done_callback(lambda fut, job=job: self._on_done(job, fut))
+        self._evict()
+        return job, False
+
+    def _on_done(self, job: Job, fut: asyncio.Future) -> None:
+        if fut.cancelled():
+            job.status = "cancelled"
+        else:
+            exc = fut.exception()
+            if exc is None and fut.result().get("stopped_by") == "cancelled":
+                job.status = "cancelled"
+            elif exc is None:
+                job.status = "done"
+                job.result = fut.result()
+                # arrêtée par le budget avant l'exploration : pas de clé "analysis"
+                analysis = job.result.get("analysis")
+                if analysis is not None:
+                    job.num_states = analysis["num_states"]
+                    job.num_edges = analysis["num_edges"]
+            else:
+                job.status = "failed"
+                job.error = f"{type(exc).__name__}: {exc}"
+        job.finished = time.time()
+        if self.inflight.get(job.key) == job.id:
+            del self.inflight[job.key]
+        self._cancelled.pop(job.id, None)
+        self._notify(job)
+
+    #Annule un job en attente (immédiat) ou en cours (au prochain contrôle du budget).
+    def cancel(self, job_id: str) -> Job:
+        job = self.jobs[job_id]
+        if job.status in TERMINAL_STATUSES:
+            return job
+        self._cancelled[job.id] = True
+        # cancel() du pool échoue si le job a déjà démarré dans un processus
+        if job.status == "queued" and job.pool_future.cancel():
+            return job
+        job.status = "cancelling"
+        # le job ne doit plus être partagé avec de nouvelles soumissions
+        if self.inflight.get(job.key) == job.id:
+            del self.inflight[job.key]
+        self._notify(job)
+        return job
+
+    #Oublie les jobs terminés les plus anciens au-delà de max_jobs_kept.
+    def _evict(self) -> None:
+        excess = len(self.jobs) - self.max_jobs_kept
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self.jobs.values() if j.status in TERMINAL_STATUSES][:excess]:
+            del self.jobs[job_id]
+
+    # HTTP
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            parts = request_line.split(" ")
+            if len(parts) != 3:
+                await self._send(writer, 400, {"error": "requête HTTP invalide"})
+                return
+            method, target, _ = parts
+
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY:
+                await self._send(writer, 413, {"error": "corps de requête trop gros"})
+                return
+            body = await reader.readexactly(length) if length else b""
+
+            await self._route(method, target.split("?", 1)[0].rstrip("/"), body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            await self._send(writer, 400, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        parts = [p for p in path.split("/") if p]
+
+        if parts == ["health"]:
+            running = sum(1 for j in self.jobs.values() if j.status not in TERMINAL_STATUSES)
+            await self._send(writer, 200, {"status": "ok", "active_jobs": running})
+            return
+
+        if parts == ["jobs"]:
+            if method == "GET":
+                await self._send(writer, 200, [j.info() for j in self.jobs.values()])
+            elif method == "POST":
+                try:
+                    payload = json.loads(body or b"{}")
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"JSON invalide: {e}") from None
+                if not isinstance(payload, dict):
+                    raise ValueError("le corps doit être un objet JSON")
+                job, dedup = self.submit(payload.get("net"), payload.get("max_states", 10000))
+                await self._send(writer, 202, {"id": job.id, "status": job.status, "deduplicated": dedup})
+            else:
+                await self._send(writer, 405, {"error": "méthode non autorisée"})
+            return
+
+        if len(parts) < 2 or parts[0] != "jobs" or len(parts) > 3:
+            await self._send(writer, 404, {"error": "ressource inconnue"})
+            return
+        job = self.jobs.get(parts[1])
+        if job is None:
+            await self._send(writer, 404, {"error": f"job inconnu: {parts[1]}"})
+            return
+
+        action = parts[2] if len(parts) == 3 else None
+        if action is None and method == "GET":
+            await self._send(writer, 200, job.info())
+        elif action is None and method == "DELETE":
+            await self._send(writer, 200, self.cancel(job.id).info())
+        elif action == "result" and method == "GET":
+            if job.status != "done":
+                await self._send(writer, 409, job.info())
+            else:
+                # gros résultats : sérialisation hors de la boucle
+                data = await self._loop.run_in_executor(None, _dumps, job.result)
+                await self._send_raw(writer, 200, data)
+        elif action == "events" and method == "GET":
+            await self._stream_events(job, writer)
+        else:
+            await self._send(writer, 405, {"error": "méthode non autorisée"})
+
+    async def _stream_events(self, job: Job, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+        )
+        queue: asyncio.Queue = asyncio.Queue()
+        job.listeners.append(queue)
+        try:
+            info = job.info()
+            while True:
+                writer.write(_dumps(info) + b"\n")
+                await writer.drain()
+                if info["status"] in TERMINAL_STATUSES:
+                    return
+                info = await queue.get()
+        finally:
+            job.listeners.remove(queue)
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+        await self._send_raw(writer, status, _dumps(payload))
+
+    async def _send_raw(self, writer: asyncio.StreamWriter, status: int, data: bytes) -> None:
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+        )
+        writer.write(data)
+        await writer.drain()
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+async def serve(
+    host: str,
+    port: int,
+    unix_path: Optional[str],
+    workers: Optional[int],
+    time_limit: Optional[float] = None,
+    max_memory: Optional[int] = None,
+) -> None:
+    service = AnalysisService(workers=workers, time_limit=time_limit, max_memory=max_memory)
+    server = await service.start(host=host, port=port, unix_path=unix_path)
+    where = unix_path if unix_path else f"http://{host}:{server.sockets[0].getsockname()[1]}"
+    print(f" Service d'analyse prêt sur {where}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Service local d'analyse de réseaux de Petri.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="chemin d'un socket Unix (au lieu de TCP)")
+    parser.add_argument("--workers", type=int, default=None, help="processus d'analyse (défaut: tous les cœurs)")
+    parser.add_argument("--time-limit", type=float, default=None, help="durée maximale d'un job, en secondes")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="mémoire maximale d'un processus d'analyse, en Mo")
+    args = parser.parse_args(argv)
+    max_memory = None if args.max_memory_mb is None else args.max_memory_mb * 1024 * 1024
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.time_limit, max_memory))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+Équation d'état d'un réseau de Petri, résolue en nombres entiers.
+
+Tout marquage M accessible depuis M0 vérifie M = M0 + C·σ, où C est la matrice
+d'incidence (C[p][t] = post(t, p) - pré(t, p)) et σ ≥ 0 le vecteur entier du nombre
+de tirs de chaque transition. C'est une condition nécessaire, pas suffisante :
+- si l'équation n'a pas de solution, le marquage est inaccessible (réponse sûre, sans
+  explorer l'espace d'états),
+- si elle en a une, on ne sait rien : il faut chercher un chemin.
+
+Même chose pour la couverture (M ≥ cible) et pour les bornes : le maximum de M(p)
+sous l'équation majore le nombre de jetons que p peut contenir.
+
+Le solveur est intégré (pas de dépendance) : test de divisibilité sur les égalités
+(forme échelonnée entière), simplexe à deux phases en rationnels exacts
+(fractions.Fraction, règle de Bland, donc pas de cyclage), et séparation-évaluation
+(branch and bound) en profondeur sur les variables fractionnaires. Le nombre de nœuds
+est borné par max_nodes ; au-delà, la réponse reste sûre : faisabilité inconnue (None),
+ou majorant moins fin pour une borne.
+
+Taille visée : quelques dizaines de places et de transitions (calcul exact, donc lent
+sur de gros réseaux). Les transitions dont la colonne de C est nulle (boucles) ne
+changent rien au marquage et sont écartées.
+"""
+
+from fractions import Fraction
+from math import ceil, floor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from petri import PetriNet
+
+
+# Contrainte linéaire : (coefficients par indice de variable, sens "<=" / ">=" / "==", second membre)
+Row = Tuple[Dict[int, int], str, int]
+
+
+#  Simplexe (rationnels exacts)
+
+"""
+Maximise objective·x sous les contraintes rows, x ≥ 0 (n variables).
+objective None : simple test de faisabilité.
+Renvoie ("optimal", valeur, x), ("infeasible", None, None) ou ("unbounded", None, None).
+"""
+
+
+def _simplex(rows: List[Row], n: int, objective: Optional[List[int]]) -> Tuple[str, Optional[Fraction], Optional[List[Fraction]]]:
+    # Colonnes : n variables, puis une variable d'écart par contrainte d'inégalité,
+    # puis une variable artificielle par contrainte >= ou ==
+    normalized = []
+    for coeffs, sense, rhs in rows:
+        if rhs < 0:
+            coeffs = {j: -a for j, a in coeffs.items()}
+            rhs = -rhs
+            sense = {"<=": ">=", ">=": "<=", "==": "=="}[sense]
+        normalized.append((coeffs, sense, rhs))
+
+    n_slack = sum(1 for _, sense, _ in normalized if sense != "==")
+    n_art = sum(1 for _, sense, _ in normalized if sense != "<=")
+    width = n + n_slack + n_art
+    first_art = n + n_slack
+
+    table: List[List[Fraction]] = []
+    basis: List[int] = []
+    slack, art = n, first_art
+    for coeffs, sense, rhs in normalized:
+        row = [Fraction(0)] * (width + 1)
+        for j, a in coeffs.items():
+            row[j] = Fraction(a)
+        row[width] = Fraction(rhs)
+        if sense == "<=":
+            row[slack] = Fraction(1)
+            basis.append(slack)
+            slack += 1
+        else:
+            if sense == ">=":
+                row[slack] = Fraction(-1)
+                slack += 1
+            row[art] = Fraction(1)
+            basis.append(art)
+            art += 1
+        table.append(row)
+
+    # Phase 1 : minimiser la somme des artificielles
+    if n_art:
+        cost = [0] * first_art + [-1] * n_art
+        _optimize(table, basis, cost, width, width)
+        if _objective_value(table, basis, cost, width) < 0:
+            return "infeasible", None, None
+        # Les artificielles encore en base (à 0) en sortent, ou leur ligne est redondante
+        for r in range(len(table) - 1, -1, -1):
+            if basis[r] >= first_art:
+                col = next((j for j in range(first_art) if table[r][j] != 0), None)
+                if col is None:
+                    del table[r], basis[r]
+                else:
+                    _pivot(table, basis, r, col, width)
+
+    if objective is None:
+        x = _solution(table, basis, n, width)
+        return "optimal", Fraction(0), x
+
+    cost = list(objective) + [0] * (width - n)
+    status = _optimize(table, basis, cost, width, first_art)
+    if status == "unbounded":
+        return "unbounded", None, None
+    return "optimal", _objective_value(table, basis, cost, width), _solution(table, basis, n, width)
+
+
+#Itérations du simplexe (maximisation de cost), colonnes entrantes limitées à [0, allowed).
+def _optimize(table: List[List[Fraction]], basis: List[int], cost: List[int], width: int, allowed: int) -> str:
+    while True:
+        # Coûts réduits : c_j - c_B · colonne j ; Bland : plus petit indice qui améliore
+        entering = None
+        for j in range(allowed):
+            if j in basis:
+                continue
+            reduced = cost[j] - sum(cost[basis[r]] * table[r][j] for r in range(len(table)) if table[r][j] != 0)
+            if reduced > 0:
+                entering = j
+                break
+        if entering is None:
+            return "optimal"
+
+        leaving = None
+        best = None
+        for r, row in enumerate(table):
+            a = row[entering]
+            if a > 0:
+                ratio = row[width] / a
+                if best is None or ratio < best or (ratio == best and basis[r] < basis[leaving]):
+                    best, leaving = ratio, r
+        if leaving is None:
+            return "unbounded"
+        _pivot(table, basis, leaving, entering, width)
+
+
+def _pivot(table: List[List[Fraction]], basis: List[int], r: int, col: int, width: int) -> None:
+    pivot_row = table[r]
+    p = pivot_row[col]
+    if p != 1:
+        for j in range(width + 1):
+            if pivot_row[j] != 0:
+                pivot_row[j] /= p
+    nonzero = [j for j in range(width + 1) if pivot_row[j] != 0]
+    for i, row in enumerate(table):
+        factor = row[col]
+        if i != r and factor != 0:
+            for j in nonzero:
+                row[j] -= factor * pivot_row[j]
+    basis[r] = col
+
+
+def _objective_value(table: List[List[Fraction]], basis: List[int], cost: List[int], width: int) -> Fraction:
+    return sum((cost[basis[r]] * table[r][width] for r in range(len(table))), Fraction(0))
+
+
+def _solution(table: List[List[Fraction]], basis: List[int], n: int, width: int) -> List[Fraction]:
+    x = [Fraction(0)] * n
+    for r, j in enumerate(basis):
+        if j < n:
+            x[j] = table[r][width]
+    return x
+
+
+#  Solutions entières d'un système d'égalités (sans contrainte de signe)
+
+"""
+Le système A·x = b (égalités seulement, x entier de signe quelconque) a-t-il une
+solution ? Opérations unimodulaires sur les colonnes (algorithme d'Euclide) pour mettre
+A sous forme échelonnée H = A·U, puis résolution de H·y = b par substitution en
+vérifiant les divisibilités. Condition nécessaire, qui attrape ce que la relaxation
+continue ne voit pas (2σ1 - 2σ2 = 1 par exemple, qu'aucune séparation ne refermerait
+sur un domaine non borné).
+"""
+
+
+def _integer_solvable(rows: List[Row], n: int) -> bool:
+    matrix = [[coeffs.get(j, 0) for j in range(n)] for coeffs, sense, _ in rows if sense == "=="]
+    rhs = [b for _, sense, b in rows if sense == "=="]
+    pivots: List[Optional[int]] = []
+    col = 0
+    for i, row in enumerate(matrix):
+        # Ne garder qu'une entrée non nulle de la ligne i parmi les colonnes col..n-1
+        while True:
+            nonzero = [j for j in range(col, n) if row[j] != 0]
+            if len(nonzero) <= 1:
+                break
+            k = min(nonzero, key=lambda j: abs(row[j]))
+            for j in nonzero:
+                if j != k:
+                    q = row[j] // row[k]
+                    for r in matrix:
+                        r[j] -= q * r[k]
+        if not nonzero:
+            pivots.append(None)
+            continue
+        k = nonzero[0]
+        for r in matrix:
+            r[k], r[col] = r[col], r[k]
+        pivots.append(col)
+        col += 1
+
+    y: List[int] = []
+    for i, row in enumerate(matrix):
+        rest = rhs[i] - sum(row[j] * y[j] for j in range(len(y)))
+        if pivots[i] is None:
+            if rest != 0:
+                return False
+        else:
+            if rest % row[pivots[i]] != 0:
+                return False
+            y.append(rest // row[pivots[i]])
+    return True
+
+
+#  Séparation-évaluation (variables entières)
+
+"""
+Maximise objective·x en entiers (ou cherche une solution entière si objective est None).
+Renvoie (statut, valeur, x) :
+- "optimal"    : valeur et solution entière optimales (ou une solution si objective est None),
+- "infeasible" : aucune solution entière,
+- "unbounded"  : la relaxation continue n'est pas bornée,
+- "unknown"    : max_nodes atteint ; valeur est alors un majorant sûr de l'optimum
+                 (None pour un simple test de faisabilité).
+"""
+
+
+def _branch_and_bound(
+    rows: List[Row], n: int, objective: Optional[List[int]], max_nodes: int
+) -> Tuple[str, Optional[int], Optional[List[int]]]:
+    if not _integer_solvable(rows, n):
+        return "infeasible", None, None
+    best_value: Optional[int] = None
+    best_x: Optional[List[int]] = None
+    stack: List[List[Row]] = [[]]
+    nodes = 0
+
+    while stack:
+        extra = stack.pop()
+        status, value, x = _simplex(rows + extra, n, objective)
+        if status == "infeasible":
+            continue
+        if status == "unbounded":
+            return "unbounded", None, None
+
+        bound = None if objective is None else floor(value)
+        if bound is not None and best_value is not None and bound <= best_value:
+            continue
+
+        j = next((j for j in range(n) if x[j].denominator != 1), None)
+        if j is None:
+            best_x = [int(v) for v in x]
+            if objective is None:
+                return "optimal", None, best_x
+            best_value = bound
+            continue
+
+        nodes += 1
+        if nodes > max_nodes:
+            if objective is None:
+                return "unknown", None, None
+            # Majorant : meilleur des nœuds encore ouverts et de la solution déjà trouvée
+            upper = bound
+            for other in stack:
+                status, value, _ = _simplex(rows + other, n, objective)
+                if status == "optimal":
+                    upper = max(upper, floor(value))
+            if best_value is not None:
+                upper = max(upper, best_value)
+            return "unknown", upper, best_x
+
+        v = x[j]
+        stack.append(extra + [({j: 1}, ">=", ceil(v))])
+        stack.append(extra + [({j: 1}, "<=", floor(v))])
+
+    if best_x is None:
+        return "infeasible", None, None
+    return "optimal", best_value, best_x
+
+
+#  Équation d'état d'un réseau
+
+class StateEquation:
+    def __init__(self, net: PetriNet) -> None:
+        self.net = net
+        self.place_order: List[str] = net.place_order()
+        self.initial_marking: Dict[str, int] = net.initial_marking()
+
+        pre, post = net.build_pre_post()
+        self.transition_ids: List[str] = []
+        # Incidence par place : {indice de transition gardée: variation}
+        self.incidence: Dict[str, Dict[int, int]] = {pid: {} for pid in self.place_order}
+        for tid in net.transition_ids():
+            column: Dict[str, int] = {}
+            for pid, w in pre[tid]:
+                column[pid] = column.get(pid, 0) - w
+            for pid, w in post[tid]:
+                column[pid] = column.get(pid, 0) + w
+            column = {pid: d for pid, d in column.items() if d != 0}
+            if not column:
+                continue        # boucle : sans effet sur le marquage
+            j = len(self.transition_ids)
+            self.transition_ids.append(tid)
+            for pid, d in column.items():
+                self.incidence[pid][j] = d
+
+    #Contraintes M(p) = marking(p) + C_p·σ ≥ 0 (inutile si aucune transition ne vide p), et = cible (ou ≥ si cover).
+    def _rows(self, target: Dict[str, int], marking: Dict[str, int], cover: bool) -> List[Row]:
+        rows: List[Row] = []
+        for pid in self.place_order:
+            m = int(marking.get(pid, 0))
+            if pid in target:
+                rows.append((self.incidence[pid], ">=" if cover else "==", int(target[pid]) - m))
+            elif any(d < 0 for d in self.incidence[pid].values()):
+                rows.append((self.incidence[pid], ">=", -m))
+        return rows
+
+    def _check_target(self, target: Dict[str, int]) -> None:
+        for pid in target:
+            if pid not in self.incidence:
+                raise ValueError(f"Place inconnue dans la cible: {pid}")
+
+    """
+    L'équation M = marking + C·σ (M ≥ 0, σ entier ≥ 0) a-t-elle une solution avec
+    M(p) = target[p] (ou M(p) ≥ target[p] si cover) pour les places de target ?
+    marking : marquage de départ (par défaut le marquage initial).
+    feasible : False (cible sûrement inaccessible), True (solution σ trouvée, la cible
+    n'est pas forcément accessible pour autant) ou None (max_nodes atteint).
+    firing_counts : la solution σ trouvée (transitions tirées au moins une fois).
+    """
+
+    def check(
+        self,
+        target: Dict[str, int],
+        marking: Optional[Dict[str, int]] = None,
+        cover: bool = False,
+        max_nodes: int = 1000,
+    ) -> Dict[str, Any]:
+        self._check_target(target)
+        marking = self.initial_marking if marking is None else marking
+        status, _, x = _branch_and_bound(self._rows(target, marking, cover), len(self.transition_ids), None, max_nodes)
+        feasible = {"optimal": True, "infeasible": False}.get(status)
+        counts = None
+        if x is not None:
+            counts = {tid: k for tid, k in zip(self.transition_ids, x) if k > 0}
+        return {"feasible": feasible, "firing_counts": counts}
+
+    #Majorant du nombre de jetons de la place (None si l'équation ne la borne pas).
+    def upper_bound(self, place_id: str, marking: Optional[Dict[str, int]] = None, max_nodes: int = 1000) -> Optional[int]:
+        self._check_target({place_id: 0})
+        marking = self.initial_marking if marking is None else marking
+        m = int(marking.get(place_id, 0))
+        objective = [0] * len(self.transition_ids)
+        for j, d in self.incidence[place_id].items():
+            objective[j] = d
+        status, value, _ = _branch_and_bound(self._rows({}, marking, False), len(self.transition_ids), objective, max_nodes)
+        if status == "unbounded":
+            return None
+        if status == "infeasible":
+            return m
+        return m + value
+
+    def bounds(self, marking: Optional[Dict[str, int]] = None, max_nodes: int = 1000) -> Dict[str, Optional[int]]:
+        return {pid: self.upper_bound(pid, marking, max_nodes) for pid in self.place_order}
+
+    """
+    Fonction d'élagage pour PetriNet.find_path(prune=...) : True pour un marquage depuis
+    lequel l'équation d'état exclut d'atteindre la cible (il est inutile de le développer).
+    Un résultat inconnu (max_nodes atteint) n'élague pas. Chaque appel résout un petit
+    programme linéaire : plus fort, mais plus coûteux que l'élagage par défaut.
+    """
+
+    def prune(self, target: Dict[str, int], cover: bool = False, max_nodes: int = 50) -> Callable[[Dict[str, int]], bool]:
+        self._check_target(target)
+        n = len(self.transition_ids)
+
+        def excluded(marking: Dict[str, int]) -> bool:
+            status, _, _ = _branch_and_bound(self._rows(target, marking, cover), n, None, max_nodes)
+            return status == "infeasible"
+
+        return excluded
+
+
+"""
+Cherche un marquage cible (partiel ; avec cover=True, « au moins » ces jetons) :
+1) l'équation d'état depuis le marquage initial : si elle n'a pas de solution, la
+   réponse est « inaccessible » sans aucune exploration (method = "state_equation") ;
+2) sinon PetriNet.find_path, élagué par l'équation d'état (method = "search").
+Le résultat a le format de find_path, plus method.
+"""
+
+
+def find_marking(
+    net: PetriNet,
+    target: Dict[str, int],
+    max_states: int = 10000,
+    cover: bool = False,
+) -> Dict[str, Any]:
+    equation = StateEquation(net)
+    if equation.check(target, cover=cover)["feasible"] is False:
+        return {
+            "found": False,
+            "trace": [],
+            "marking": None,
+            "length": None,
+            "states_explored": 0,
+            "states_generated": 0,
+            "truncated": False,
+            "method": "state_equation",
+        }
+
+    goal: Union[Dict[str, int], Callable[[Dict[str, int]], bool]] = target
+    if cover:
+        goal = lambda m: all(m[pid] >= k for pid, k in target.items())
+    result = net.find_path(goal, max_states=max_states, prune=equation.prune(target, cover=cover))
+    result["method"] = "search"
+    return result
@@ -0,0 +1,173 @@
+"""
+Exploration "sweep-line" : nombre d'états et deadlocks exacts, sans garder tout le graphe.
+
+On se donne une mesure de progression ψ sur les marquages qui ne décroît jamais
+quand on tire une transition (par exemple un compteur qui ne fait qu'augmenter).
+Les états sont développés par valeur de ψ croissante : une fois la couche ψ = p
+entièrement développée, aucun état futur ne peut plus avoir une progression p
+(ni moins). La couche est alors oubliée : seules les couches devant la ligne de
+balayage restent en mémoire.
+
+La mesure peut être :
+- None : dérivée automatiquement de la structure du réseau (derive_progress_measure),
+- un dict {place: poids} : mesure linéaire, dont la monotonie est vérifiée sur chaque transition,
+- une expression sur les places ("P3 + 2 * P5", même syntaxe que les prédicats),
+- une fonction Python sur les marquages (dict place -> jetons).
+
+Pour une expression ou une fonction, la monotonie est vérifiée pendant l'exploration :
+une transition qui fait reculer la mesure lève une ValueError (l'exploration ne serait
+plus exacte).
+"""
+
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from petri import PROGRESS_EVERY, PetriNet, compile_predicate
+
+
+ProgressMeasure = Union[None, Dict[str, int], str, Callable[[Dict[str, int]], Any]]
+
+
+"""
+Mesure linéaire dérivée de la structure : +1 pour chaque place qu'aucune transition ne
+vide (elle ne fait que se remplir), -1 pour chaque place qu'aucune transition ne remplit
+(elle ne fait que se vider). Chaque tir fait donc avancer la mesure ou la laisse
+inchangée ; en particulier elle est constante le long de toute séquence qui réalise
+un T-invariant (retour au même marquage), seules les parties acycliques progressent.
+Renvoie {} si aucune place n'est monotone (la mesure est alors constante : une seule
+couche, l'exploration revient à une exploration complète).
+"""
+
+
+def derive_progress_measure(net: PetriNet) -> Dict[str, int]:
+    cn = net.compile()
+    increases: Set[int] = set()
+    decreases: Set[int] = set()
+    for delta in cn.delta:
+        for i, d in delta:
+            (increases if d > 0 else decreases).add(i)
+
+    weights: Dict[str, int] = {}
+    for i, pid in enumerate(cn.place_order):
+        if i in increases and i not in decreases:
+            weights[pid] = 1
+        elif i in decreases and i not in increases:
+            weights[pid] = -1
+    return weights
+
+
+#Mesure sur les marquages-tuples (une mesure linéaire est vérifiée transition par transition).
+def _measure_function(net: PetriNet, measure: ProgressMeasure) -> Callable[[Tuple[int, ...]], Any]:
+    cn = net.compile()
+    if measure is None:
+        measure = derive_progress_measure(net)
+
+    if isinstance(measure, dict):
+        unknown = [pid for pid in measure if pid not in cn.place_index]
+        if unknown:
+            raise ValueError(f"Place inconnue dans la mesure de progression: {unknown[0]}")
+        weights = [(cn.place_index[pid], w) for pid, w in measure.items() if w != 0]
+        for t, delta in enumerate(cn.delta):
+            d = dict(delta)
+            if sum(w * d.get(i, 0) for i, w in weights) < 0:
+                raise ValueError(
+                    f"Mesure de progression non monotone: la transition {cn.transition_ids[t]} la fait reculer"
+                )
+        return lambda m: sum(w * m[i] for i, w in weights)
+
+    if isinstance(measure, str):
+        return compile_predicate(measure, cn.place_order)
+
+    return lambda m: measure(cn.to_marking(m))
+
+
+"""
+Explore tout l'espace d'états par balayage (voir l'en-tête du module).
+
+Renvoie un dict avec :
+- states, edges : nombres exacts d'états et d'arêtes,
+- deadlocks : marquages sans successeur (dans l'ordre de découverte),
+- peak_stored : nombre maximal d'états gardés en mémoire en même temps,
+- layers : nombre de valeurs de progression distinctes rencontrées,
+- truncated : True si max_states a été atteint.
+"""
+
+
+def explore_sweepline(
+    net: PetriNet,
+    measure: ProgressMeasure = None,
+    max_states: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    cn = net.compile()
+    psi = _measure_function(net, measure)
+
+    m0 = tuple(net.marking_key(net.initial_marking()))
+    p0 = psi(m0)
+    layers: Dict[Any, Set[Tuple[int, ...]]] = {p0: {m0}}      # états gardés, par progression
+    pending: Dict[Any, List[Tuple[int, ...]]] = {p0: [m0]}   # états à développer
+    heap = [p0]
+
+    states = 1
+    edges = 0
+    stored = 1
+    peak_stored = 1
+    num_layers = 1
+    deadlocks: List[Dict[str, int]] = []
+    truncated = False
+
+    while heap and not truncated:
+        p = heapq.heappop(heap)
+        work = pending.pop(p)
+        layer = layers[p]
+
+        while work and not truncated:
+            m = work.pop()
+            succ = cn.successors(m)
+            if not succ:
+                deadlocks.append(cn.to_marking(m))
+
+            for t, s in succ:
+                edges += 1
+                q = psi(s)
+                if q == p:
+                    target, todo = layer, work
+                elif q > p:
+                    target = layers.get(q)
+                    if target is None:
+                        target = layers[q] = set()
+                        pending[q] = []
+                        heapq.heappush(heap, q)
+                        num_layers += 1
+                    todo = pending[q]
+                else:
+                    raise ValueError(
+                        f"Mesure de progression non monotone: {cn.transition_ids[t]} la fait "
+                        f"passer de {p!r} à {q!r}"
+                    )
+
+                if s in target:
+                    continue
+                if max_states is not None and states >= max_states:
+                    truncated = True
+                    break
+                target.add(s)
+                todo.append(s)
+                states += 1
+                stored += 1
+                if progress is not None and states % PROGRESS_EVERY == 0:
+                    progress(states, edges)
+
+            peak_stored = max(peak_stored, stored)
+
+        # La couche p est terminée : aucun état futur n'y retombera
+        stored -= len(layers.pop(p))
+
+    return {
+        "states": states,
+        "edges": edges,
+        "deadlocks": deadlocks,
+        "peak_stored": peak_stored,
+        "layers": num_layers,
+        "truncated": truncated,
+    }
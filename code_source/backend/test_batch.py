@@ -0,0 +1,92 @@
+"""
+Tests de l'analyse en lot (backend/batch.py).
+
+Vérifie que :
+- les réseaux sont trouvés à partir de dossiers et de motifs glob,
+- chaque réseau produit ses fichiers de sortie et une ligne de résumé,
+- un réseau invalide ou trop long est signalé sans arrêter le lot,
+- avec columnar=True le graphe est écrit à part au format colonnaire.
+
+À lancer avec pytest.
+"""
+
+import csv
+import json
+import os
+
+from batch import collect_nets, run_batch
+from columnar import load_columnar
+
+
+SIMPLE = {
+    "places": [{"id": "P1", "initial_tokens": 1}, {"id": "P2"}],
+    "transitions": [{"id": "T1"}],
+    "arcs": [{"source_id": "P1", "target_id": "T1"}, {"source_id": "T1", "target_id": "P2"}],
+}
+
+# Producteur sans fin : l'espace d'états est infini
+INFINITE = {
+    "places": [{"id": "P1"}],
+    "transitions": [{"id": "T1"}],
+    "arcs": [{"source_id": "T1", "target_id": "P1"}],
+}
+
+BROKEN = {
+    "places": [{"id": "P1"}],
+    "transitions": [],
+    "arcs": [{"source_id": "P1", "target_id": "P1"}],
+}
+
+
+def _write_nets(folder):
+    os.makedirs(folder / "sub")
+    for name, data in (("simple", SIMPLE), ("infinite", INFINITE), ("broken", BROKEN)):
+        (folder / f"{name}.json").write_text(json.dumps(data), encoding="utf-8")
+    (folder / "sub" / "simple.json").write_text(json.dumps(SIMPLE), encoding="utf-8")
+    (folder / "notes.txt").write_text("pas un réseau", encoding="utf-8")
+
+
+def test_collect_nets_from_directories_and_globs(tmp_path):
+    _write_nets(tmp_path)
+
+    assert len(collect_nets([str(tmp_path)])) == 3
+    assert len(collect_nets([str(tmp_path)], recursive=True)) == 4
+    assert len(collect_nets([str(tmp_path / "**" / "simple.json")])) == 2
+
+
+def test_run_batch_writes_per_net_outputs_and_summary(tmp_path):
+    _write_nets(tmp_path)
+    out = tmp_path / "out"
+
+    files = collect_nets([str(tmp_path)], recursive=True)
+    rows = run_batch(files, str(out), jobs=2, max_states=50)
+    status = {os.path.relpath(r["file"], tmp_path): r["status"] for r in rows}
+
+    assert status == {
+        "broken.json": "error",
+        "infinite.json": "truncated",
+        "simple.json": "ok",
+        os.path.join("sub", "simple.json"): "ok",
+    }
+    # Deux fichiers "simple" : noms de sortie distincts
+    assert (out / "simple.result.json").exists()
+    assert (out / "simple_2.dot").exists()
+
+    with open(out / "summary.csv", encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 4
+    assert len((out / "summary.jsonl").read_text(encoding="utf-8").splitlines()) == 4
+
+    # Les fichiers de résultats ne sont pas repris comme réseaux d'entrée
+    assert len(collect_nets([str(out)])) == 0
+
+
+def test_run_batch_columnar_writes_reachability_apart(tmp_path):
+    (tmp_path / "simple.json").write_text(json.dumps(SIMPLE), encoding="utf-8")
+    out = tmp_path / "out"
+
+    run_batch([str(tmp_path / "simple.json")], str(out), jobs=1, columnar=True)
+
+    result = json.loads((out / "simple.result.json").read_text(encoding="utf-8"))
+    assert "reachability" not in result
+    with load_columnar(str(out / "simple.pnr")) as res:
+        assert res.num_states == result["analysis"]["num_states"] == 2
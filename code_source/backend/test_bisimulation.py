@@ -0,0 +1,74 @@
+"""
+Tests de la minimisation par bisimulation (backend/bisimulation.py).
+
+Vérifie que :
+- le raffinement distingue a.(b+c) de a.b + a.c et regroupe les états équivalents,
+- des processus symétriques dont les tirs sont cachés se réduisent à un petit quotient,
+- les prédicats observés séparent les états et les deadlocks sont conservés,
+- l'export DOT du quotient contient un nœud par bloc.
+
+À lancer avec pytest.
+"""
+
+from petri import PetriNet, Place, Transition, Arc
+from bisimulation import bisimulation_blocks, minimize, quotient_to_dot, TAU
+
+
+def test_blocks_on_labelled_transition_system():
+    # 0 -a-> 1, 1 -b-> 2, 1 -c-> 3     (a.(b+c))
+    # 4 -a-> 5, 4 -a-> 6, 5 -b-> 7, 6 -c-> 8     (a.b + a.c)
+    edges = [(0, "a", 1), (1, "b", 2), (1, "c", 3),
+             (4, "a", 5), (4, "a", 6), (5, "b", 7), (6, "c", 8)]
+    block_of = bisimulation_blocks(9, edges)
+
+    assert block_of[0] != block_of[4]
+    assert block_of[1] != block_of[5] != block_of[6]
+    # Tous les états sans successeur sont équivalents
+    assert len({block_of[s] for s in (2, 3, 7, 8)}) == 1
+
+
+def _workers(n=4):
+    """
+    n processus identiques Idle -> Busy -> Idle, partageant un compteur Jobs à vider.
+    """
+    net = PetriNet()
+    net.add_place(Place("Jobs", "Jobs", 3))
+    for i in range(n):
+        net.add_place(Place(f"Idle{i}", f"Idle{i}", 1))
+        net.add_place(Place(f"Busy{i}", f"Busy{i}", 0))
+        net.add_transition(Transition(f"Take{i}", f"Take{i}"))
+        net.add_transition(Transition(f"Done{i}", f"Done{i}"))
+        net.add_arc(Arc(f"Idle{i}", f"Take{i}"))
+        net.add_arc(Arc("Jobs", f"Take{i}"))
+        net.add_arc(Arc(f"Take{i}", f"Busy{i}"))
+        net.add_arc(Arc(f"Busy{i}", f"Done{i}"))
+        net.add_arc(Arc(f"Done{i}", f"Idle{i}"))
+    return net
+
+
+def test_hidden_symmetric_processes_collapse():
+    net = _workers()
+    res = net.reachability_bfs()
+    full = minimize(net, reachability=res)
+    hidden = minimize(net, reachability=res, observable=[])
+
+    assert full["num_blocks"] == len(res["states"])
+    # Seuls comptent les jetons restants dans Jobs et le nombre de processus occupés
+    assert hidden["num_blocks"] < len(res["states"]) // 4
+    assert {a for _, a, _ in hidden["edges"]} == {TAU}
+    assert sum(len(b) for b in hidden["blocks"]) == len(res["states"])
+    assert hidden["block_of"][0] == hidden["initial"] == 0
+
+
+def test_predicates_split_blocks_and_deadlocks_are_kept():
+    net = _workers()
+    res = net.reachability_bfs()
+    q = minimize(net, reachability=res, observable=[], predicates=["Jobs"])
+
+    for b, members in enumerate(q["blocks"]):
+        assert {res["states"][s]["Jobs"] for s in members} == {q["predicates"]["Jobs"][b]}
+    assert q["deadlocks"] == sorted({q["block_of"][s] for s in res["deadlocks"]})
+
+    dot = quotient_to_dot(q)
+    assert dot.startswith("digraph Quotient {")
+    assert dot.count("shape=") == q["num_blocks"]
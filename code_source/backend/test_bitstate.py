@@ -0,0 +1,112 @@
+"""
+Tests de l'exploration à mémoire bornée (backend/bitstate.py).
+
+Vérifie que :
+- avec assez de mémoire, bitstate et hashcompact trouvent tous les états et deadlocks,
+- le deadlock trouvé est réel et sa trace y mène,
+- avec trop peu de mémoire, des états sont omis et l'estimation l'indique,
+- l'exploration s'arrête quand la table d'empreintes est pleine ou le tableau de bits saturé,
+- max_depth borne la profondeur (états non développés comptés dans cutoff) et seuls les
+  premiers deadlocks sont gardés,
+- les paramètres invalides sont refusés.
+
+À lancer avec pytest.
+"""
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc
+from bitstate import MAX_KEPT_DEADLOCKS, explore_bitstate, bitstate_memory_for, _BitStateStore
+
+
+def _grid_net(n=30):
+    """
+    Deux compteurs A -> B et C -> D : (n+1)^2 marquages, un seul deadlock (B = D = n).
+    """
+    net = PetriNet()
+    for pid, tokens in (("A", n), ("B", 0), ("C", n), ("D", 0)):
+        net.add_place(Place(pid, pid, tokens))
+    net.add_transition(Transition("T1", "AB"))
+    net.add_transition(Transition("T2", "CD"))
+    net.add_arc(Arc("A", "T1", 1))
+    net.add_arc(Arc("T1", "B", 1))
+    net.add_arc(Arc("C", "T2", 1))
+    net.add_arc(Arc("T2", "D", 1))
+    return net
+
+
+@pytest.mark.parametrize("mode", ["bitstate", "hashcompact"])
+def test_enough_memory_covers_the_whole_state_space(mode):
+    net = _grid_net()
+    res = explore_bitstate(net, memory_bytes=1 << 16, mode=mode)
+
+    assert res["states"] == 31 * 31
+    assert res["truncated"] is False
+    assert res["deadlocks"] == [{"A": 0, "B": 30, "C": 0, "D": 30}]
+    assert res["omission_probability"] < 1e-3
+
+    # La trace mène bien au deadlock
+    m = net.initial_marking()
+    for tid in res["deadlock_trace"]:
+        m = net.fire(tid, m)
+    assert m == res["deadlocks"][0]
+
+
+def test_tiny_bit_array_omits_states_and_reports_it():
+    res = explore_bitstate(_grid_net(), memory_bytes=32, hashes=2)
+    assert res["states"] < 31 * 31
+    assert res["omission_probability"] > 0.1
+    assert res["expected_omissions"] > 1
+
+
+def test_hashcompact_stops_when_table_is_full():
+    res = explore_bitstate(_grid_net(), memory_bytes=8 * 100, mode="hashcompact")
+    assert res["truncated"] is True
+    assert res["states"] == 90
+
+
+def test_bitstate_stops_when_bit_array_is_saturated():
+    res = explore_bitstate(_grid_net(), memory_bytes=32, hashes=2)
+    assert res["truncated"] is True
+    assert res["omission_probability"] >= _BitStateStore.MAX_OMISSION
+
+    # Juste avant l'arrêt, le tableau n'était pas encore saturé
+    before = explore_bitstate(_grid_net(), memory_bytes=32, hashes=2, max_states=res["states"] - 1)
+    assert before["omission_probability"] < _BitStateStore.MAX_OMISSION
+
+
+def test_depth_limit_and_kept_deadlocks():
+    res = explore_bitstate(_grid_net(), memory_bytes=1 << 16, max_depth=10)
+    assert res["max_depth"] == res["depth_limit"] == 10
+    assert res["states"] == 11 * 12 // 2      # marquages à au plus 10 tirs de l'origine
+    assert res["cutoff"] == 11 and res["truncated"] is True
+    assert res["deadlocks"] == []
+
+    # Chaîne de 150 places où chaque tir peut aussi s'arrêter dans un deadlock
+    net = PetriNet()
+    for i in range(151):
+        net.add_place(Place(f"P{i}", f"P{i}", 1 if i == 0 else 0))
+        net.add_place(Place(f"D{i}", f"D{i}", 0))
+        net.add_transition(Transition(f"Stop{i}", f"Stop{i}"))
+        net.add_arc(Arc(f"P{i}", f"Stop{i}"))
+        net.add_arc(Arc(f"Stop{i}", f"D{i}"))
+    for i in range(150):
+        net.add_transition(Transition(f"Next{i}", f"Next{i}"))
+        net.add_arc(Arc(f"P{i}", f"Next{i}"))
+        net.add_arc(Arc(f"Next{i}", f"P{i + 1}"))
+    res = explore_bitstate(net, memory_bytes=1 << 16, max_depth=None)
+    assert res["num_deadlocks"] == 151 and len(res["deadlocks"]) == MAX_KEPT_DEADLOCKS
+    assert res["deadlocks"][0] == {**net.initial_marking(), "P0": 0, "D0": 1}
+    assert res["max_depth"] == 151 and res["truncated"] is False
+
+    with pytest.raises(ValueError):
+        explore_bitstate(net, max_depth=-1)
+
+
+def test_invalid_parameters_and_sizing():
+    with pytest.raises(ValueError):
+        explore_bitstate(_grid_net(), mode="exact")
+    with pytest.raises(ValueError):
+        explore_bitstate(_grid_net(), memory_bytes=0)
+    # ~ 28 bits par état pour 1e-3 avec 3 fonctions de hachage
+    assert 3_000_000 < bitstate_memory_for(1_000_000) < 4_000_000
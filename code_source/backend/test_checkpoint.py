@@ -0,0 +1,91 @@
+"""
+Tests des points de reprise (backend/checkpoint.py et reachability_bfs(resume=...)).
+
+Vérifie que :
+- un résultat tronqué peut être prolongé avec un max_states plus grand,
+- une exploration reprise depuis un instantané gardé en mémoire ou écrit sur disque
+  donne le même graphe,
+- un point de reprise écrit pour un autre réseau est refusé.
+
+À lancer avec pytest.
+"""
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc
+from checkpoint import explore, load_checkpoint, save_checkpoint
+
+
+def _grid_net(n=40):
+    """
+    Deux compteurs indépendants A -> B et C -> D : (n+1)^2 marquages.
+    """
+    net = PetriNet()
+    for pid, tokens in (("A", n), ("B", 0), ("C", n), ("D", 0)):
+        net.add_place(Place(pid, pid, tokens))
+    net.add_transition(Transition("T1", "AB"))
+    net.add_transition(Transition("T2", "CD"))
+    net.add_arc(Arc("A", "T1", 1))
+    net.add_arc(Arc("T1", "B", 1))
+    net.add_arc(Arc("C", "T2", 1))
+    net.add_arc(Arc("T2", "D", 1))
+    return net
+
+
+def test_truncated_result_can_be_extended():
+    net = _grid_net()
+    full = net.reachability_bfs(max_states=10000)
+    assert full["truncated"] is False and "frontier" not in full
+
+    part = net.reachability_bfs(max_states=500)
+    assert part["truncated"] is True
+    more = net.reachability_bfs(max_states=1000, resume=part)
+    assert len(part["states"]) == 500    # le résultat repris n'est pas modifié
+    assert len(more["states"]) == 1000
+    done = net.reachability_bfs(max_states=10000, resume=more)
+
+    assert done["truncated"] is False
+    assert done["states"] == full["states"]
+    assert done["edges"] == full["edges"]
+    assert done["deadlocks"] == full["deadlocks"]
+
+
+def test_explore_resumes_from_snapshot_on_disk(tmp_path):
+    net = _grid_net()
+    path = str(tmp_path / "run.pnx")
+    full = net.reachability_bfs(max_states=10000)
+
+    # Instantanés écrits pendant l'exploration (every=0 : à chaque occasion)
+    snapshots = []
+    net.reachability_bfs(max_states=10000, checkpoint=snapshots.append, checkpoint_every=0)
+    assert snapshots
+
+    # Les instantanés gardés en mémoire restent figés : reprendre le premier redonne le graphe complet
+    first = snapshots[0]
+    assert len(first["states"]) < len(full["states"])
+    resumed = net.reachability_bfs(max_states=10000, resume=first)
+    assert resumed["states"] == full["states"]
+    assert resumed["edges"] == full["edges"]
+    assert resumed["deadlocks"] == full["deadlocks"]
+
+    # Exploration "tuée" : seul un instantané intermédiaire est sur disque
+    part = net.reachability_bfs(max_states=1200)
+    save_checkpoint(path, net, part)
+    reloaded = load_checkpoint(path, net)
+    assert reloaded["states"] == part["states"] and reloaded["frontier"] == part["frontier"]
+
+    res = explore(net, path, max_states=10000, every=0)
+    assert res["truncated"] is False
+    assert res["edges"] == full["edges"]
+    # Le fichier contient maintenant le résultat complet
+    assert load_checkpoint(path, net)["truncated"] is False
+
+
+def test_checkpoint_of_another_net_is_rejected(tmp_path):
+    path = str(tmp_path / "run.pnx")
+    net = _grid_net()
+    save_checkpoint(path, net, net.reachability_bfs(max_states=10))
+
+    net.set_arc_weight("A", "T1", 2)
+    with pytest.raises(ValueError):
+        load_checkpoint(path, net)
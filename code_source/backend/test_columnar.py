@@ -0,0 +1,72 @@
+"""
+Tests du format colonnaire des graphes d'accessibilité (backend/columnar.py).
+
+Vérifie que :
+- l'aller-retour redonne exactement reachability_to_dict,
+- les accès ponctuels (état, successeurs, deadlocks) fonctionnent sur le fichier projeté,
+- un fichier qui n'est pas au bon format est refusé.
+
+À lancer avec pytest.
+"""
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc
+from columnar import ColumnarResult, load_columnar, save_columnar
+
+
+def _net():
+    """
+    P1 (2 jetons) --T1--> P2 --T2--> P3 : deux jetons à faire avancer, un deadlock.
+    """
+    net = PetriNet()
+    net.add_place(Place("P1", "P1", 2))
+    net.add_place(Place("P2", "P2", 0))
+    net.add_place(Place("P3", "P3", 0))
+    net.add_transition(Transition("T1", "T1"))
+    net.add_transition(Transition("T2", "T2"))
+    net.add_transition(Transition("T3", "Never"))
+    net.add_arc(Arc("P1", "T1"))
+    net.add_arc(Arc("T1", "P2"))
+    net.add_arc(Arc("P2", "T2"))
+    net.add_arc(Arc("T2", "P3"))
+    net.add_arc(Arc("P3", "T3", 5))
+    return net
+
+
+def test_round_trip_matches_reachability_to_dict(tmp_path):
+    net = _net()
+    expected = net.reachability_to_dict()
+    path = str(tmp_path / "graph.pnr")
+    save_columnar(expected, path, transitions=net.transition_ids())
+
+    with load_columnar(path) as res:
+        assert res.to_dict() == expected
+        assert res.transition_ids == ["T1", "T2", "T3"]
+
+
+def test_point_queries_on_mapped_file(tmp_path):
+    net = _net()
+    raw = net.reachability_bfs()
+    path = str(tmp_path / "graph.pnr")
+    save_columnar(raw, path)
+
+    res = ColumnarResult(path)
+    try:
+        assert res.num_states == len(raw["states"])
+        assert res.num_edges == len(raw["edges"])
+        assert res.state(0) == {"P1": 2, "P2": 0, "P3": 0}
+        assert res.successors(0) == [("T1", 1)]
+        assert res.deadlocks() == raw["deadlocks"]
+        assert res.state(res.deadlocks()[0]) == {"P1": 0, "P2": 0, "P3": 2}
+        with pytest.raises(IndexError):
+            res.state(res.num_states)
+    finally:
+        res.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.pnr"
+    path.write_bytes(b"PNB1" + b"\0" * 64)
+    with pytest.raises(ValueError):
+        load_columnar(str(path))
@@ -0,0 +1,135 @@
+"""
+Tests des formats d'import / export (backend/formats.py).
+
+Vérifie que :
+- un fichier PNML (avec espace de noms, pages et références) est correctement lu,
+- l'export PNML puis la relecture redonnent le même réseau,
+- le format binaire .pnb fait l'aller-retour et rejette un fichier corrompu,
+- les délais des transitions temporisées survivent aux deux formats, et un .pnb de
+  version 1 (sans délais) se relit toujours,
+- les priorités et les noms vides survivent aux deux formats,
+- load_net choisit le lecteur d'après l'extension.
+
+À lancer avec pytest.
+"""
+
+import struct
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc
+from formats import load_pnml, save_pnml, load_binary, save_binary, load_net, save_net
+
+
+PNML_SAMPLE = """<?xml version="1.0"?>
+<pnml xmlns="http://www.pnml.org/version-2009/grammar/pnml">
+  <net id="n" type="http://www.pnml.org/version-2009/grammar/ptnet">
+    <name><text>Exemple</text></name>
+    <page id="pg1">
+      <place id="p1"><name><text>Input</text></name>
+        <initialMarking><text>2</text></initialMarking></place>
+      <place id="p2"/>
+      <transition id="t1"><name><text>Move</text></name></transition>
+      <arc id="a1" source="p1" target="t1"><inscription><text>2</text></inscription></arc>
+      <page id="pg2">
+        <referencePlace id="rp2" ref="p2"/>
+        <arc id="a2" source="t1" target="rp2"/>
+      </page>
+    </page>
+  </net>
+</pnml>
+"""
+
+
+def _net():
+    net = PetriNet()
+    net.add_place(Place("P1", "Entrée <a&b>", 2))
+    net.add_place(Place("P2", "P2", 0))
+    net.add_transition(Transition("T1", "Move", priority=3))
+    net.add_arc(Arc("P1", "T1", 2))
+    net.add_arc(Arc("T1", "P2", 1))
+    return net
+
+
+def test_load_pnml_with_namespace_pages_and_references(tmp_path):
+    path = tmp_path / "net.pnml"
+    path.write_text(PNML_SAMPLE, encoding="utf-8")
+
+    net = load_pnml(str(path))
+
+    assert net.places["p1"].name == "Input"
+    assert net.places["p1"].initial_tokens == 2
+    assert net.places["p2"].name == "p2"
+    assert net.get_arc("p1", "t1").weight == 2
+    assert net.get_arc("t1", "p2").weight == 1
+
+
+def test_pnml_round_trip(tmp_path):
+    path = str(tmp_path / "net.pnml")
+    save_pnml(_net(), path)
+
+    net = load_pnml(path)
+
+    assert net.places["P1"].name == "Entrée <a&b>"
+    assert net.reachability_bfs()["deadlocks"] == [1]
+
+
+def test_binary_round_trip_and_corruption(tmp_path):
+    path = tmp_path / "net.pnb"
+    save_binary(_net(), str(path))
+
+    net = load_binary(str(path))
+    assert net.to_dict() == _net().to_dict()
+
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ValueError):
+        load_binary(str(path))
+
+
+def test_transition_delays_round_trip(tmp_path):
+    net = _net()
+    net.add_transition(Transition("Timed", "Timed", delay=2.0, max_delay=3.5))
+    net.add_transition(Transition("Fixed", "Fixed", delay=0.25))
+
+    for name, save, load in (("net.pnb", save_binary, load_binary), ("net.pnml", save_pnml, load_pnml)):
+        path = str(tmp_path / name)
+        save(net, path)
+        loaded = load(path).transitions
+        assert (loaded["Timed"].delay, loaded["Timed"].max_delay) == (2.0, 3.5)
+        assert (loaded["Fixed"].delay, loaded["Fixed"].max_delay) == (0.25, None)
+        assert not loaded["T1"].timed
+
+
+def test_binary_version_1_is_still_readable(tmp_path):
+    # Une place P (1 jeton), une transition T, l'arc P -> T ; noms vides = id
+    blob = "\0".join(["P", "", "T", ""]).encode("utf-8")
+    data = struct.pack("<4sHHIIIQ", b"PNB1", 1, 0, 1, 1, 1, len(blob)) + blob
+    data += struct.pack("<qqIIq", 1, 4, 0, 1, 1)
+    path = tmp_path / "old.pnb"
+    path.write_bytes(data)
+
+    net = load_binary(str(path))
+    assert net.transitions["T"].priority == 4 and not net.transitions["T"].timed
+    assert (net.places["P"].name, net.transitions["T"].name) == ("P", "T")
+    assert net.get_arc("P", "T").weight == 1
+
+
+def test_priorities_and_empty_names_round_trip(tmp_path):
+    net = _net()
+    net.add_place(Place("Anonyme", "", 0))
+    net.add_transition(Transition("Sans nom", "", priority=-2))
+
+    for name, save, load in (("net.pnb", save_binary, load_binary), ("net.pnml", save_pnml, load_pnml)):
+        path = str(tmp_path / name)
+        save(net, path)
+        loaded = load(path)
+        assert loaded.places["Anonyme"].name == "" and loaded.transitions["Sans nom"].name == ""
+        assert loaded.transitions["T1"].priority == 3 and loaded.transitions["Sans nom"].priority == -2
+        assert loaded.to_dict() == net.to_dict()
+
+
+def test_load_net_dispatches_on_extension(tmp_path):
+    for name in ("net.json", "net.pnml", "net.pnb"):
+        path = str(tmp_path / name)
+        save_net(_net(), path)
+        assert load_net(path).to_dict()["arcs"] == _net().to_dict()["arcs"]
@@ -7,15 +7,29 @@ Vérifie que :
 - on peut construire un petit réseau cohérent (places, transitions, arcs),
 - les tables pre/post sont correctes,
 - le tir d'une transition modifie bien le marquage sans toucher au marquage initial,
+- chaque politique de simulation choisit la même transition qu'un parcours complet,
 - le graphe d'accessibilité est correctement calculé (états, deadlocks),
-- l'export JSON et DOT contient les informations attendues.
+- l'export JSON et DOT contient les informations attendues,
+- l'index ReachabilityGraph répond aux requêtes (successeurs, prédécesseurs, distances, chemins),
+- les classes structurelles sont reconnues et leurs analyses concordent avec l'exploration,
+  la recherche de siphons reste bornée et l'analyse structurelle n'est faite qu'à la demande,
+- les fonctions de tir générées concordent avec les tables d'arcs et sont réutilisées entre réseaux identiques,
+- les stratégies d'exploration (BFS, DFS, DFS borné, approfondissement itératif) parcourent
+  le même graphe, et la recherche de deadlock en profondeur garde une frontière courte,
+- un budget (plafonds, échéance, mémoire, annulation) arrête l'exploration et dit pourquoi,
+  et couvre aussi l'analyse structurelle (une part seulement) et les exports de analyze_net,
+- les statistiques en ligne concordent avec le graphe exploré, y compris sans garder les états.
 
 À lancer avec pytest.
 """
 
+import threading
+import time
+
 import pytest
 
-from petri import PetriNet, Place, Transition, Arc
+from petri import PetriNet, Place, Transition, Arc, Simulation, analyze_from_dict, analyze_net
+from petri import Budget, CancelToken, resident_memory
 
 
 
@@ -180,3 +194,700 @@ def test_export_json_and_dot():
     assert "digraph Reachability" in dot
     assert "S0" in dot
     assert "S1" in dot
+
+
+
+# Stockage indexé des arcs / suppression / transactions
+
+
+def _small_net():
+    """
+    P1 --> T1 --> P2
+    """
+    net = PetriNet()
+    net.add_place(Place("P1", "Input", 1))
+    net.add_place(Place("P2", "Output", 0))
+    net.add_transition(Transition("T1", "Move"))
+    net.add_arc(Arc("P1", "T1", 1))
+    net.add_arc(Arc("T1", "P2", 1))
+    return net
+
+
+def test_arc_index_lookup_and_duplicates():
+    net = _small_net()
+
+    assert net.get_arc("P1", "T1").weight == 1
+    assert net.get_arc("T1", "P1") is None
+    assert [a.source_id for a in net.incoming_arcs("T1")] == ["P1"]
+
+    # Un deuxième arc P1 -> T1 est refusé
+    with pytest.raises(ValueError):
+        net.add_arc(Arc("P1", "T1", 2))
+
+
+def test_remove_place_removes_incident_arcs_and_updates_engine():
+    net = _small_net()
+    assert net.enabled("T1", net.initial_marking())
+
+    net.remove_place("P1")
+
+    assert "P1" not in net.places
+    assert [(a.source_id, a.target_id) for a in net.arcs] == [("T1", "P2")]
+    # Les tables compilées sont invalidées : T1 n'a plus de pré-condition
+    assert net.build_pre_post()[0]["T1"] == []
+    assert net.fire("T1", net.initial_marking()) == {"P2": 1}
+
+    net.remove_arc("T1", "P2")
+    assert net.arcs == []
+    with pytest.raises(ValueError):
+        net.remove_arc("T1", "P2")
+
+
+def test_set_arc_weight_invalidates_compiled_tables():
+    net = _small_net()
+    net.set_arc_weight("P1", "T1", 2)
+    assert not net.enabled("T1", net.initial_marking())
+
+
+def test_batch_validates_once_and_rolls_back_on_error():
+    net = PetriNet()
+    with net.batch():
+        # L'arc peut être ajouté avant ses extrémités
+        net.add_arc(Arc("P1", "T1", 1))
+        net.add_place(Place("P1", "Input", 1))
+        net.add_transition(Transition("T1", "Move"))
+    assert len(net.arcs) == 1
+
+    with pytest.raises(ValueError):
+        with net.batch():
+            net.add_place(Place("P2", "Output", 0))
+            net.add_arc(Arc("P2", "P1", 1))   # Place -> Place : invalide
+
+    # Rien de la transaction échouée n'a été conservé
+    assert "P2" not in net.places
+    assert len(net.arcs) == 1
+    assert net.place_ids() == ["P1"]
+    assert net.initial_marking() == {"P1": 1}
+
+
+def test_model_objects_are_immutable_and_net_is_edited_by_methods():
+    net = _small_net()
+    with pytest.raises(AttributeError):
+        net.get_arc("P1", "T1").weight = 3
+    with pytest.raises(TypeError):
+        net.places["P3"] = Place("P3", "Other", 0)
+
+    net.set_initial_tokens("P2", 4)
+    assert net.places["P2"].initial_tokens == 4
+    assert net.initial_marking() == {"P1": 1, "P2": 4}
+
+
+def test_interned_indices_are_compacted_after_removal():
+    net = _small_net()
+    net.add_place(Place("P3", "Extra", 2))
+    net.add_transition(Transition("T2", "Back"))
+    net.add_arc(Arc("P3", "T2", 2))
+    net.add_arc(Arc("T2", "P1", 1))
+
+    net.remove_place("P2")
+    net.remove_transition("T1")
+
+    # Ordre de création conservé, indices denses
+    assert net.place_ids() == ["P1", "P3"]
+    assert net.transition_ids() == ["T2"]
+    tables = net.arc_tables()
+    assert list(tables.pre_start) == [0, 1]
+    assert list(tables.pre_place) == [1] and list(tables.pre_weight) == [2]
+    assert list(tables.post_place) == [0]
+    assert net.fire("T2", net.initial_marking()) == {"P1": 2, "P3": 0}
+
+
+
+# Simulation rapide (mode turbo)
+
+
+def _cycle_net():
+    """
+    Cycle à deux transitions : P1 -> T1 -> P2 -> T2 -> P1, plus T3 (priorité 5)
+    qui consomme P1 vers P3 (puits).
+    """
+    net = PetriNet()
+    net.add_place(Place("P1", "A", 1))
+    net.add_place(Place("P2", "B", 0))
+    net.add_place(Place("P3", "Sink", 0))
+    net.add_transition(Transition("T1", "Go"))
+    net.add_transition(Transition("T2", "Back"))
+    net.add_transition(Transition("T3", "Stop", priority=5))
+    net.add_arc(Arc("P1", "T1"))
+    net.add_arc(Arc("T1", "P2"))
+    net.add_arc(Arc("P2", "T2"))
+    net.add_arc(Arc("T2", "P1"))
+    net.add_arc(Arc("P1", "T3"))
+    net.add_arc(Arc("T3", "P3"))
+    return net
+
+
+def test_simulation_runs_many_firings_per_call():
+    sim = Simulation(_cycle_net(), policy="first")
+
+    assert sim.run(10001) == 10001
+    assert sim.steps == 10001
+    # Nombre impair de tirs T1/T2 : le jeton est dans P2
+    assert sim.marking == {"P1": 0, "P2": 1, "P3": 0}
+    assert sim.deadlocked is False
+
+
+def test_simulation_priority_policy_stops_at_deadlock():
+    sim = Simulation(_cycle_net(), policy="priority")
+
+    assert sim.run(100) == 1
+    assert sim.last_fired == "T3"
+    assert sim.deadlocked is True
+    assert sim.marking == {"P1": 0, "P2": 0, "P3": 1}
+
+
+def test_simulation_policies_match_a_full_scan():
+    """
+    Les structures incrémentales (tas, liste, Fenwick) choisissent comme un parcours complet
+    des transitions franchissables, sur un anneau où beaucoup de transitions le sont.
+    """
+    n = 50
+    net = PetriNet()
+    for i in range(n):
+        net.add_place(Place(f"P{i}", f"P{i}", i % 3))
+        net.add_transition(Transition(f"T{i}", f"T{i}", priority=i % 5))
+    for i in range(n):
+        net.add_arc(Arc(f"P{i}", f"T{i}"))
+        net.add_arc(Arc(f"T{i}", f"P{(i * 7 + 3) % n}"))
+    index = {tid: i for i, tid in enumerate(net.transition_ids())}
+
+    for policy in ("first", "priority", "round_robin"):
+        sim = Simulation(net, policy=policy)
+        last = -1
+        for _ in range(300):
+            enabled = [index[tid] for tid in sim.enabled_transitions()]
+            if policy == "first":
+                expected = min(enabled)
+            elif policy == "priority":
+                expected = min(enabled, key=lambda t: (-(t % 5), t))
+            else:
+                expected = min((t for t in enabled if t > last), default=min(enabled))
+            sim.run(1)
+            assert index[sim.last_fired] == expected
+            last = expected
+
+    runs = [Simulation(net, policy="random", seed=3) for _ in range(2)]
+    for sim in runs:
+        sim.run(500)
+    assert runs[0].marking == runs[1].marking and runs[0].steps == 500
+
+
+def test_simulation_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        Simulation(_cycle_net(), policy="fastest")
+
+
+
+# Propriétés EF / AG / EG / AF vérifiées à la volée
+
+
+def _producer_net():
+    """
+    T1 sans pré-place produit sans fin dans P1 (espace d'états infini),
+    T2 consomme 2 jetons de P1 et en met 1 dans P2.
+    """
+    net = PetriNet()
+    net.add_place(Place("P1", "Buffer", 0))
+    net.add_place(Place("P2", "Done", 0))
+    net.add_transition(Transition("T1", "Produce"))
+    net.add_transition(Transition("T2", "Consume"))
+    net.add_arc(Arc("T1", "P1"))
+    net.add_arc(Arc("P1", "T2", 2))
+    net.add_arc(Arc("T2", "P2"))
+    return net
+
+
+def test_ef_stops_early_with_shortest_witness():
+    res = _producer_net().check_property("EF P2 >= 1 and P1 == 0", max_states=1000)
+
+    assert res["holds"] is True
+    assert res["trace"] == ["T1", "T1", "T2"]
+    assert res["marking"] == {"P1": 0, "P2": 1}
+    assert res["states_explored"] < 20
+
+
+def test_ag_returns_counterexample():
+    res = _producer_net().check_property("AG P1 + P2 <= 2", max_states=1000)
+
+    assert res["holds"] is False
+    assert res["trace"] == ["T1", "T1", "T1"]
+
+
+def test_ag_holds_on_finite_net_and_unknown_when_truncated():
+    net = _cycle_net()
+    assert net.check_property("AG P1 + P2 + P3 == 1")["holds"] is True
+    # Espace infini : on ne peut pas conclure
+    res = _producer_net().check_property("AG P1 >= 0", max_states=50)
+    assert res["holds"] is None
+    assert res["truncated"] is True
+
+
+def test_eg_and_af_use_lassos_and_deadlocks():
+    net = _cycle_net()
+
+    # Boucle T1 T2 sans jamais mettre de jeton dans P3
+    eg = net.check("EG", "P3 == 0")
+    assert eg["holds"] is True
+    assert eg["trace"] == ["T1", "T2"]
+    assert eg["loop_start"] == 0
+
+    # AF P3 == 1 est faux : le même lasso est un contre-exemple
+    assert net.check_property("AF P3 == 1")["holds"] is False
+
+    # Le seul deadlock est P3 = 1, donc tout chemin maximal fini y aboutit
+    assert net.check("EG", lambda m: m["P2"] == 0)["trace"] == ["T3"]
+
+
+def test_predicate_rejects_unknown_places_and_code():
+    net = _cycle_net()
+    with pytest.raises(ValueError):
+        net.check_property("EF P9 > 0")
+    with pytest.raises(ValueError):
+        net.check_property("EF __import__('os')")
+
+
+
+# Recherche guidée d'un chemin vers un marquage cible
+
+
+def test_find_path_returns_shortest_sequence_to_partial_marking():
+    res = _producer_net().find_path({"P2": 3, "P1": 0}, max_states=5000)
+
+    assert res["found"] is True
+    assert res["length"] == 9          # 6 x T1 + 3 x T2
+    assert res["trace"].count("T2") == 3
+    assert res["marking"] == {"P1": 0, "P2": 3}
+    # La cible est atteinte sans parcourir tout l'espace (infini ici)
+    assert res["truncated"] is False
+
+
+def test_find_path_with_predicate_and_pruning():
+    net = _cycle_net()
+    assert net.find_path("P3 == 1")["trace"] == ["T3"]
+
+
+    # Espace infini, mais aucune transition ne remplit P3 : l'équation d'état
+    # élague la recherche dès le marquage initial
+    net = _producer_net()
+    net.add_place(Place("P3", "Never", 0))
+    res = net.find_path({"P3": 1}, max_states=1000)
+    assert res["found"] is False
+    assert res["truncated"] is False
+    assert res["states_explored"] == 1
+
+    # Sans élagage, la recherche s'épuise sur max_states
+    assert net.find_path({"P3": 1}, max_states=1000, prune=False)["truncated"] is True
+
+
+
+# Graphe d'accessibilité indexé (CSR)
+
+
+def test_reachability_graph_queries():
+    net = _cycle_net()
+    graph = net.reachability_graph()
+
+    assert graph.num_states == 3 and graph.num_edges == 3
+    assert graph.successors(0) == [("T1", 1), ("T3", 2)]
+    assert graph.predecessors(0) == [(1, "T2")]
+    assert graph.successors(2) == []
+    assert graph.enabled_in("T3") == [0]
+    assert graph.transition_edges("T2") == [(1, 0)]
+    assert graph.enabled_in("Unknown") == []
+    assert graph.fired_transitions() == ["T1", "T2", "T3"]
+
+    assert list(graph.distances()) == [0, 1, 1]
+    assert graph.distance(0, source=2) is None
+    assert graph.path(2, source=1) == ["T2", "T3"]
+    assert graph.path(0, source=2) is None
+
+    # Les analyses acceptent l'index à la place du résultat brut
+    assert net.analyze_reachability(reachability=graph) == net.analyze_reachability()
+    assert net.reachability_to_dot(reachability=graph) == net.reachability_to_dot()
+
+
+def test_reachability_graph_paths_are_shortest():
+    net = _producer_net()
+    res = net.reachability_bfs(max_states=200)
+    graph = net.reachability_graph(reachability=res)
+    dist = graph.distances()
+    for s in range(graph.num_states):
+        path = graph.path(s)
+        assert len(path) == dist[s]
+        m = net.initial_marking()
+        for tid in path:
+            m = net.fire(tid, m)
+        assert m == res["states"][s]
+
+
+
+# Classes structurelles (analyses sans exploration)
+
+
+def _net(places, arcs):
+    """
+    places : {id: jetons} ; arcs : (source, cible), les transitions sont déduites des arcs.
+    """
+    net = PetriNet()
+    for pid, tokens in places.items():
+        net.add_place(Place(pid, pid, tokens))
+    for src, dst in arcs:
+        for node in (src, dst):
+            if node not in places and node not in net.transitions:
+                net.add_transition(Transition(node, node))
+        net.add_arc(Arc(src, dst))
+    return net
+
+
+def test_net_classes():
+    assert _cycle_net().net_class() == "state_machine"
+    assert _net({"P0": 0, "P1": 0, "P2": 1}, [
+        ("T0", "P0"), ("T0", "P1"), ("P0", "T1"), ("P1", "T1"), ("T1", "P2"), ("P2", "T0"),
+    ]).net_class() == "marked_graph"
+    assert _net({"P0": 1, "P1": 0, "P2": 0}, [
+        ("P0", "A"), ("P0", "B"), ("A", "P1"), ("B", "P2"), ("P1", "C"), ("P2", "C"),
+    ]).net_class() == "free_choice"
+    assert _net({"P0": 1, "P1": 1}, [
+        ("P0", "A"), ("P1", "A"), ("P0", "B"), ("P1", "B"),
+    ]).net_class() == "extended_free_choice"
+    assert _net({"P0": 1, "P1": 1}, [("P0", "A"), ("P1", "A"), ("P1", "B")]).net_class() == "general"
+
+    weighted = _cycle_net()
+    weighted.set_arc_weight("P1", "T1", 2)
+    assert weighted.structural_analysis()["classes"] == ["general"]
+
+
+def _check_against_exploration(net):
+    structure = net.structural_analysis()
+    res = net.reachability_bfs()
+    assert res["truncated"] is False
+    if structure["deadlock_free"] is not None:
+        assert structure["deadlock_free"] == (res["deadlocks"] == [])
+    if structure["bounds"] is not None:
+        assert structure["bounds"] == net.analyze_reachability(reachability=res)["max_tokens"]
+    return structure
+
+
+def test_state_machine_analysis():
+    # Le jeton peut partir dans le puits P3 : deadlock accessible, rien n'est vivant
+    structure = _check_against_exploration(_cycle_net())
+    assert structure["method"].startswith("state machine")
+    assert (structure["live"], structure["deadlock_free"]) == (False, False)
+
+    ring = _net({"P1": 3, "P2": 0}, [("P1", "T1"), ("T1", "P2"), ("P2", "T2"), ("T2", "P1")])
+    structure = _check_against_exploration(ring)
+    assert (structure["live"], structure["deadlock_free"]) == (True, True)
+    assert structure["bounds"] == {"P1": 3, "P2": 3}
+
+
+def test_marked_graph_analysis():
+    arcs = [("T0", "P0"), ("T0", "P1"), ("P0", "T1"), ("P1", "T1"), ("T1", "P2"), ("P2", "T0")]
+    structure = _check_against_exploration(_net({"P0": 0, "P1": 1, "P2": 2}, arcs))
+    assert structure["live"] is True
+    assert structure["bounds"] == {"P0": 2, "P1": 3, "P2": 2}
+
+    # Circuit T0 -> P0 -> T1 -> P2 -> T0 sans jeton : pas vivant
+    assert _net({"P0": 0, "P1": 1, "P2": 0}, arcs).structural_analysis()["live"] is False
+
+
+def test_free_choice_liveness_by_commoner():
+    # B envoie le jeton dans une impasse (D le détruit) : siphon sans trappe marquée
+    dead_end = _net({"P0": 1, "P1": 0, "P2": 0}, [
+        ("P0", "A"), ("A", "P1"), ("P1", "C"), ("C", "P0"), ("P0", "B"), ("B", "P2"), ("P2", "D"),
+    ])
+    structure = dead_end.structural_analysis()
+    assert structure["net_class"] == "free_choice"
+    assert structure["live"] is False
+    assert structure["siphon"] == ["P0", "P1", "P2"]
+    assert dead_end.reachability_bfs()["deadlocks"] != []
+
+    # B revient en P0 : tout siphon contient la trappe marquée {P0, P1}
+    loop = _net({"P0": 1, "P1": 0}, [("P0", "A"), ("A", "P1"), ("P1", "C"), ("C", "P0"), ("P0", "B"), ("B", "P0"), ("P1", "D"), ("D", "P1")])
+    structure = _check_against_exploration(loop)
+    assert (structure["live"], structure["deadlock_free"]) == (True, True)
+
+
+def test_analyze_skips_exploration_when_structure_decides():
+    data = _cycle_net().to_dict()
+    result = analyze_from_dict(data, explore=False)
+    assert set(result) == {"network", "structure"}
+    assert result["structure"]["deadlock_free"] is False
+
+    # Par défaut on explore toujours (graphe et DOT attendus par l'interface)
+    assert "dot" in analyze_from_dict(data)
+
+    general = _net({"P0": 1, "P1": 1}, [("P0", "A"), ("P1", "A"), ("P1", "B")]).to_dict()
+    assert "analysis" in analyze_from_dict(general, explore=False)
+
+
+def _fork_join(k):
+    """
+    Réseau free choice vivant : P0 choisit A ou B, qui lancent k branches ; J les rejoint.
+    """
+    arcs = [("P0", "A"), ("P0", "B"), ("J", "P0")]
+    for i in range(1, k + 1):
+        arcs += [("A", f"P{i}"), ("B", f"P{i}"), (f"P{i}", f"T{i}"), (f"T{i}", f"Q{i}"), (f"Q{i}", "J")]
+    tokens = {"P0": 1, **{f"P{i}": 0 for i in range(1, k + 1)}, **{f"Q{i}": 0 for i in range(1, k + 1)}}
+    return _net(tokens, arcs)
+
+
+def test_siphon_search_is_bounded_and_structure_is_opt_in():
+    net = _fork_join(100)
+    # Beaucoup de siphons : la recherche s'arrête au plafond de travail sans conclure
+    structure = net.structural_analysis()
+    assert (structure["net_class"], structure["live"], structure["stopped_by"]) == ("free_choice", None, None)
+
+    # Par défaut, pas d'analyse structurelle : seule l'exploration bornée est faite
+    out = analyze_net(net, max_states=10)
+    assert "structure" not in out and out["analysis"]["num_states"] == 10
+    assert analyze_net(_fork_join(3), explore=False)["structure"]["live"] is True
+
+
+# Fonctions de tir générées
+
+
+def test_generated_firing_functions_match_arc_tables(monkeypatch):
+    """
+    Les trois variantes (variables locales, copie en liste, boucles génériques) donnent
+    les mêmes successeurs que enabled/fire sur les tables, dans l'ordre des transitions.
+    """
+    import petri
+
+    net = _net({"P1": 2, "P2": 0, "P3": 1}, [("P1", "T1"), ("T1", "P2"), ("P2", "T2"), ("P3", "T2"), ("T2", "P1"), ("T3", "P3"), ("P3", "T4"), ("T4", "P3")])
+    net.set_arc_weight("P1", "T1", 2)
+    states = [net.marking_key(m) for m in net.reachability_bfs(max_states=50)["states"]]
+
+    for setting in ({}, {"CODEGEN_UNPACK_PLACES": 0}, {"CODEGEN_MAX_TRANSITIONS": 0}):
+        for name, value in setting.items():
+            monkeypatch.setattr(petri, name, value)
+        petri.firing_functions.cache_clear()
+        net.set_arc_weight("P1", "T1", 2)   # invalide le réseau compilé
+        cn = net.compile()
+        for m in states:
+            expected = [t for t in range(len(cn.pre)) if cn.enabled(t, m)]
+            assert cn.enabled_transitions(m) == expected
+            assert cn.successors(m) == [(t, cn.fire(t, m)) for t in expected]
+        monkeypatch.undo()
+    petri.firing_functions.cache_clear()
+
+
+def test_firing_functions_are_cached_by_structure():
+    from petri import firing_source
+
+    a, b = _small_net(), _small_net()
+    b.set_arc_weight("P1", "T1", 1)
+    assert a.compile().successors is b.compile().successors
+
+    cn = a.compile()
+    source = firing_source(len(cn.place_order), tuple(cn.pre), tuple(cn.delta))
+    assert "if p0 >= 1:" in source and "(p0 - 1, p1 + 1,)" in source
+    assert a.reachability_bfs()["states"] == [{"P1": 1, "P2": 0}, {"P1": 0, "P2": 1}]
+
+
+# Stratégies d'exploration
+
+
+def _workers(k):
+    """
+    k processus indépendants Idle_i -> Start_i -> Busy_i -> Finish_i -> Done_i :
+    3^k états, un seul deadlock (tous Done) à profondeur 2k.
+    """
+    places = {}
+    arcs = []
+    for i in range(k):
+        places.update({f"Idle{i}": 1, f"Busy{i}": 0, f"Done{i}": 0})
+        arcs += [(f"Idle{i}", f"Start{i}"), (f"Start{i}", f"Busy{i}"), (f"Busy{i}", f"Finish{i}"), (f"Finish{i}", f"Done{i}")]
+    return _net(places, arcs)
+
+
+def test_search_strategies_explore_the_same_graph():
+    net = _workers(4)
+    ref = net.reachability_bfs()
+
+    bfs = net.explore("bfs")
+    assert {key: bfs[key] for key in ref} == ref
+    assert bfs["memory"]["frontier"] == "queue"
+
+    expected = {tuple(sorted(m.items())) for m in ref["states"]}
+    for strategy in ("dfs", "iterative_deepening"):
+        res = net.explore(strategy)
+        assert {tuple(sorted(m.items())) for m in res["states"]} == expected
+        assert len(res["edges"]) == len(ref["edges"]) and len(res["deadlocks"]) == 1
+        assert res["truncated"] is False and res["memory"]["frontier"] == "stack"
+    assert net.explore("iterative_deepening")["iterations"] == 9   # profondeurs 1 à 9
+    assert net.reachability_dfs()["states"] == net.explore("dfs")["states"]
+
+    with pytest.raises(ValueError):
+        net.explore("astar")
+    with pytest.raises(ValueError):
+        net.explore("bounded_dfs")
+
+
+def test_bounded_dfs_and_deadlock_hunting():
+    net = _workers(5)
+
+    # Le deadlock est à profondeur 10 : une borne à 6 ne le voit pas
+    res = net.explore("bounded_dfs", max_depth=6)
+    assert res["deadlocks"] == [] and res["truncated"] is True and res["cutoff"] > 0
+    assert max(sum(m[f"Done{i}"] * 2 + m[f"Busy{i}"] for i in range(5)) for m in res["states"]) == 6
+
+    # La pile DFS reste au plus le chemin courant, la file BFS contient une couche entière
+    dfs = net.find_deadlock()
+    bfs = net.find_deadlock(strategy="bfs")
+    assert dfs["found"] and bfs["found"]
+    assert dfs["memory"]["peak_frontier"] <= 11 < bfs["memory"]["peak_frontier"]
+
+    for found in (dfs, bfs, net.find_deadlock(strategy="iterative_deepening")):
+        m = net.initial_marking()
+        for tid in found["trace"]:
+            m = net.fire(tid, m)
+        assert m == found["deadlock"] and net.step(m) == []
+        assert len(found["trace"]) == 10
+
+    unknown = _producer_net().find_deadlock(max_states=50)
+    assert (unknown["found"], unknown["truncated"]) == (False, True)
+
+
+# Budgets d'analyse
+
+
+def test_budget_caps_stop_exploration_with_reason():
+    net = _producer_net()
+
+    res = net.reachability_bfs(max_states=10 ** 6, budget=Budget(max_edges=10))
+    assert (res["truncated"], res["stopped_by"], len(res["edges"])) == (True, "max_edges", 10)
+    # Le résultat arrêté par le budget se reprend comme un résultat tronqué
+    assert net.reachability_bfs(max_states=50, resume=res) == net.reachability_bfs(max_states=50)
+
+    res = net.reachability_bfs(max_states=10 ** 6, budget=Budget(max_states=20))
+    assert (res["stopped_by"], len(res["states"])) == ("max_states", 20)
+    assert net.reachability_bfs(max_states=20)["stopped_by"] == "max_states"
+    assert _cycle_net().reachability_bfs()["stopped_by"] is None
+
+    assert net.find_deadlock(budget=Budget(max_states=30))["stopped_by"] == "max_states"
+    assert net.explore("dfs", budget=Budget(max_edges=5))["stopped_by"] == "max_edges"
+
+    with pytest.raises(ValueError):
+        Budget(time_limit=0)
+
+
+def test_budget_deadline_memory_and_cancellation():
+    net = _producer_net()
+
+    budget = Budget(time_limit=0.001)
+    time.sleep(0.01)
+    assert net.reachability_bfs(max_states=10 ** 6, budget=budget)["stopped_by"] == "deadline"
+
+    if resident_memory() is not None:
+        res = net.analyze_reachability(max_states=10 ** 6, budget=Budget(max_memory=1))
+        assert (res["stopped_by"], res["num_states"]) == ("memory", 1)
+
+    # Annulation depuis un autre thread pendant une exploration sans fin
+    token = CancelToken()
+    timer = threading.Timer(0.05, token.cancel)
+    timer.start()
+    res = net.reachability_bfs(max_states=10 ** 7, budget=Budget(cancel=token))
+    timer.join()
+    assert res["stopped_by"] == "cancelled" and res["truncated"] is True
+
+    out = analyze_from_dict(net.to_dict(), max_states=10 ** 6, budget=Budget(max_states=10))
+    assert out["analysis"]["stopped_by"] == "max_states"
+
+
+class _CancelAfter:
+    # Jeton annulé à partir de la n-ième lecture
+    def __init__(self, reads: int) -> None:
+        self.reads = reads
+
+    @property
+    def cancelled(self) -> bool:
+        self.reads -= 1
+        return self.reads < 0
+
+
+def test_budget_covers_structure_and_exports():
+    dead_end = _net({"P0": 1, "P1": 0, "P2": 0}, [
+        ("P0", "A"), ("A", "P1"), ("P1", "C"), ("C", "P0"), ("P0", "B"), ("B", "P2"), ("P2", "D"),
+    ])
+    assert dead_end.structural_analysis()["stopped_by"] is None
+
+    # Annulé pendant la recherche de siphons : rien n'est décidé
+    structure = dead_end.structural_analysis(budget=Budget(cancel=_CancelAfter(1)))
+    assert (structure["stopped_by"], structure["live"], structure["siphon"]) == ("cancelled", None, None)
+
+    # Annulé avant l'analyse : ni exploration ni exports
+    token = CancelToken()
+    token.cancel()
+    out = analyze_net(dead_end, explore=False, budget=Budget(cancel=token))
+    assert set(out) == {"network", "structure", "stopped_by"} and out["stopped_by"] == "cancelled"
+
+    # Annulé pendant l'exploration : analyse partielle, exports sautés
+    out = analyze_from_dict(_producer_net().to_dict(), max_states=10 ** 6, budget=Budget(cancel=_CancelAfter(1)))
+    assert out["stopped_by"] == out["analysis"]["stopped_by"] == "cancelled"
+    assert "dot" not in out and "reachability" not in out
+
+    # Budget non atteint : résultat complet, sans clé stopped_by
+    assert "stopped_by" not in analyze_from_dict(_cycle_net().to_dict(), budget=Budget(max_states=100))
+
+
+def test_structural_pass_only_gets_a_share_of_the_budget():
+    budget = Budget(time_limit=10, max_memory=1 << 40, cancel=CancelToken())
+    sub = budget.share(0.5)
+    assert sub.cancel is budget.cancel and sub.deadline < budget.deadline
+    assert 4 < sub.deadline - time.monotonic() <= 5
+    if resident_memory() is not None:
+        assert sub.max_memory < budget.max_memory
+    with pytest.raises(ValueError):
+        budget.share(0)
+
+    # La recherche de siphons épuise sa part du temps sans conclure : on explore avec le reste
+    out = analyze_net(_fork_join(300), max_states=10, explore=False, budget=Budget(time_limit=0.2))
+    assert out["structure"]["stopped_by"] == "deadline" and out["structure"]["live"] is None
+    assert out["analysis"]["num_states"] == 10 and "stopped_by" not in out and "dot" in out
+
+
+# Statistiques d'exploration
+
+
+def test_online_statistics_match_explored_graph():
+    net = _workers(2)
+    res = net.reachability_bfs(statistics=True)
+    stats = res["statistics"]
+
+    assert stats["num_states"] == 9
+    assert stats["places"]["Busy0"] == {"min": 0, "max": 1, "histogram": {0: 6, 1: 3}}
+    assert stats["safe"] is True and stats["unsafe_example"] is None
+    assert stats["out_degree"] == {0: 1, 1: 4, 2: 4}       # un seul deadlock
+    assert stats["depth_histogram"] == {0: 1, 1: 2, 2: 3, 3: 2, 4: 1}
+    assert stats["never_fired_transitions"] == []
+
+    # analyze_reachability reprend les statistiques au lieu de reparcourir les états
+    assert net.analyze_reachability(reachability=res) == net.analyze_reachability(reachability=net.reachability_bfs())
+    assert analyze_from_dict(net.to_dict())["statistics"] == stats
+
+    with pytest.raises(ValueError):
+        net.reachability_bfs(statistics=True, resume=res)
+
+
+def test_statistics_only_mode_keeps_no_states():
+    net = _producer_net()
+    full = net.reachability_bfs(max_states=30, statistics=True)
+    only = net.reachability_statistics(max_states=30)
+
+    assert "states" not in only and "edges" not in only
+    assert only["statistics"] == full["statistics"]
+    assert (only["num_states"], only["num_edges"], only["stopped_by"]) == (30, len(full["edges"]), "max_states")
+
+    stats = only["statistics"]
+    assert stats["safe"] is False and stats["unsafe_places"] == ["P1", "P2"]
+    assert stats["unsafe_example"] == {"P1": 2, "P2": 0}
@@ -0,0 +1,153 @@
+"""
+Tests des réductions structurelles (backend/reduction.py).
+
+Vérifie que :
+- une chaîne de transitions en série est fusionnée et la trace remontée la rejoue,
+- les places constantes et redondantes sont retirées et leurs bornes remontées,
+- les transitions parallèles sont fusionnées,
+- une transition boucle retirée élimine les faux deadlocks à la remontée,
+- sur le réseau d'origine, les deadlocks remontés sont exactement ceux de reachability_bfs,
+- un grand anneau se réduit entièrement (règles appliquées de proche en proche, sans tout re-parcourir).
+
+À lancer avec pytest.
+"""
+
+from petri import PetriNet, Place, Transition, Arc
+from reduction import Reduction, analyze_reduced
+
+
+def _pipeline(stages=4, tokens=2):
+    """
+    P0 (tokens) --T0--> P1 --T1--> ... --T{stages-1}--> P{stages} : chaîne de traitement.
+    """
+    net = PetriNet()
+    for i in range(stages + 1):
+        net.add_place(Place(f"P{i}", f"P{i}", tokens if i == 0 else 0))
+    for i in range(stages):
+        net.add_transition(Transition(f"T{i}", f"T{i}"))
+        net.add_arc(Arc(f"P{i}", f"T{i}"))
+        net.add_arc(Arc(f"T{i}", f"P{i + 1}"))
+    return net
+
+
+def _deadlocks(net):
+    res = net.reachability_bfs()
+    return sorted(sorted(res["states"][s].items()) for s in res["deadlocks"])
+
+
+def test_series_fusion_and_trace_lifting():
+    net = _pipeline()
+    reduction = Reduction(net)
+
+    assert list(reduction.net.transitions) == ["T0+T1+T2+T3"]
+    assert reduction.net.place_ids() == ["P0", "P4"]
+    assert reduction.lift_trace(["T0+T1+T2+T3"]) == ["T0", "T1", "T2", "T3"]
+
+    out = analyze_reduced(net)
+    assert out["num_states"] == 3    # 15 états sur le réseau d'origine
+    assert out["deadlocks"] == [{"P0": 0, "P1": 0, "P2": 0, "P3": 0, "P4": 2}]
+    assert out["max_tokens"]["P4"] == 2
+    assert out["max_tokens"]["P2"] is None
+
+    m = net.initial_marking()
+    for tid in out["deadlock_trace"]:
+        m = net.fire(tid, m)
+    assert m == out["deadlocks"][0]
+
+
+def test_constant_and_redundant_places():
+    """
+    Lock (3 jetons) est seulement lue par T ; Q est une copie de P décalée de 2 jetons.
+    Ensuite T ; U se fusionnent en une boucle, et P devient constante : il ne reste rien.
+    """
+    net = PetriNet()
+    net.add_place(Place("P", "P", 1))
+    net.add_place(Place("Q", "Q", 3))
+    net.add_place(Place("R", "R", 0))
+    net.add_place(Place("Lock", "Lock", 3))
+    net.add_transition(Transition("T", "T"))
+    net.add_transition(Transition("U", "U"))
+    for src, dst in (("P", "T"), ("Q", "T"), ("Lock", "T"), ("T", "Lock"), ("T", "R"), ("R", "U"), ("U", "P"), ("U", "Q")):
+        net.add_arc(Arc(src, dst))
+
+    reduction = Reduction(net)
+    assert reduction.rules[:2] == ["place constante retirée: Lock (3 jetons)", "place redondante retirée: Q (= P + 2)"]
+    assert reduction.net.place_ids() == [] and reduction.self_loops == ["T", "U"]
+    assert reduction.lift_marking({}) == net.initial_marking()
+
+    out = analyze_reduced(net)
+    assert out["max_tokens"] == {"P": 1, "Q": 3, "R": None, "Lock": 3}
+    assert out["deadlocks"] == _deadlocks(net) == []
+
+
+def test_parallel_transitions_are_merged():
+    net = _pipeline(stages=1, tokens=1)
+    net.add_transition(Transition("T0bis", "T0bis"))
+    net.add_arc(Arc("P0", "T0bis"))
+    net.add_arc(Arc("T0bis", "P1"))
+
+    reduction = Reduction(net)
+    assert list(reduction.net.transitions) == ["T0"]
+    assert reduction.duplicates == {"T0bis": "T0"}
+
+
+def test_self_loop_removal_filters_false_deadlocks():
+    """
+    Idle (boucle sur P) reste franchissable tant que P est marquée : pas de deadlock.
+    Une fois la boucle retirée, le réseau réduit est bloqué d'emblée ; la remontée
+    doit écarter ce faux deadlock.
+    """
+    net = PetriNet()
+    net.add_place(Place("P", "P", 1))
+    net.add_transition(Transition("Idle", "Idle"))
+    net.add_arc(Arc("P", "Idle"))
+    net.add_arc(Arc("Idle", "P"))
+
+    reduction = Reduction(net)
+    assert reduction.self_loops == ["Idle"]
+    assert reduction.lift_deadlocks(reduction.net.reachability_bfs()) == []
+    assert analyze_reduced(net)["deadlocks"] == _deadlocks(net) == []
+
+
+def test_lifted_deadlocks_match_full_exploration():
+    """
+    Deux philosophes : chacun prend sa fourchette gauche puis la droite.
+    """
+    net = PetriNet()
+    for pid, tokens in (("F0", 1), ("F1", 1), ("Think0", 1), ("Think1", 1), ("Left0", 0), ("Left1", 0), ("Eat0", 0), ("Eat1", 0)):
+        net.add_place(Place(pid, pid, tokens))
+    for i in (0, 1):
+        left, right = f"F{i}", f"F{1 - i}"
+        for tid in (f"Take{i}", f"Second{i}", f"Release{i}"):
+            net.add_transition(Transition(tid, tid))
+        for src, dst in (
+            (f"Think{i}", f"Take{i}"), (left, f"Take{i}"), (f"Take{i}", f"Left{i}"),
+            (f"Left{i}", f"Second{i}"), (right, f"Second{i}"), (f"Second{i}", f"Eat{i}"),
+            (f"Eat{i}", f"Release{i}"), (f"Release{i}", left), (f"Release{i}", right), (f"Release{i}", f"Think{i}"),
+        ):
+            net.add_arc(Arc(src, dst))
+
+    out = analyze_reduced(net)
+    assert out["rules"]
+    assert sorted(sorted(m.items()) for m in out["deadlocks"]) == _deadlocks(net)
+    assert len(out["deadlocks"]) == 1
+
+
+def test_large_ring_is_reduced_incrementally():
+    """
+    Anneau de 3000 places : 2999 fusions en série, puis la boucle restante et sa place.
+    Avec un re-parcours complet après chaque règle, cela prendrait plusieurs minutes.
+    """
+    k = 3000
+    net = PetriNet()
+    for i in range(k):
+        net.add_place(Place(f"P{i}", f"P{i}", 1 if i == 0 else 0))
+        net.add_transition(Transition(f"T{i}", f"T{i}"))
+    for i in range(k):
+        net.add_arc(Arc(f"P{i}", f"T{i}"))
+        net.add_arc(Arc(f"T{i}", f"P{(i + 1) % k}"))
+
+    reduction = Reduction(net)
+    assert reduction.net.place_ids() == [] and list(reduction.net.transitions) == []
+    assert len(reduction.rules) == k + 1
+    assert reduction.self_loops == [f"T{i}" for i in range(k)]
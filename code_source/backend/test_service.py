@@ -0,0 +1,147 @@
+"""
+Tests du service local d'analyse (backend/service.py).
+
+Vérifie, avec un vrai serveur HTTP sur un port local, que :
+- un job soumis est exécuté dans le pool et son résultat récupérable,
+- le flux d'événements se termine sur l'état final,
+- deux soumissions identiques en cours partagent le même job,
+- un job en cours peut être annulé, par le budget du moteur (résultat "stopped_by": "cancelled"),
+- la limite de durée du service arrête proprement une exploration sans fin,
+- les requêtes invalides sont refusées.
+
+À lancer avec pytest.
+"""
+
+import asyncio
+import json
+import queue
+import threading
+
+import service
+from service import AnalysisService
+
+
+SIMPLE = {
+    "places": [{"id": "P1", "initial_tokens": 1}, {"id": "P2"}],
+    "transitions": [{"id": "T1"}],
+    "arcs": [{"source_id": "P1", "target_id": "T1"}, {"source_id": "T1", "target_id": "P2"}],
+}
+
+# Producteur sans fin : l'exploration ne s'arrête qu'à max_states
+INFINITE = {
+    "places": [{"id": "P1"}],
+    "transitions": [{"id": "T1"}],
+    "arcs": [{"source_id": "T1", "target_id": "P1"}],
+}
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, data
+
+
+def _run(scenario, **options):
+    async def main():
+        service = AnalysisService(workers=2, **options)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            await asyncio.wait_for(scenario(service, port), timeout=60)
+        finally:
+            await service.close()
+    asyncio.run(main())
+
+
+def test_submit_stream_and_fetch_result():
+    async def scenario(service, port):
+        status, data = await _request(port, "POST", "/jobs", {"net": SIMPLE, "max_states": 100})
+        assert status == 202
+        job_id = json.loads(data)["id"]
+
+        status, data = await _request(port, "GET", f"/jobs/{job_id}/events")
+        events = [json.loads(line) for line in data.splitlines()]
+        assert events[-1]["status"] == "done"
+
+        status, data = await _request(port, "GET", f"/jobs/{job_id}/result")
+        assert status == 200
+        assert json.loads(data)["analysis"]["num_states"] == 2
+
+    _run(scenario)
+
+
+def test_identical_inflight_jobs_are_deduplicated_and_cancellable():
+    async def scenario(service, port):
+        job, dedup = service.submit(INFINITE, max_states=10 ** 7)
+        again, dedup_again = service.submit(INFINITE, max_states=10 ** 7)
+        assert dedup is False
+        assert dedup_again is True
+        assert again is job
+
+        # on attend que l'exploration ait vraiment commencé
+        while job.num_states == 0:
+            await asyncio.sleep(0.05)
+
+        status, data = await _request(port, "DELETE", f"/jobs/{job.id}")
+        assert status == 200
+        while job.status not in ("cancelled", "done", "failed"):
+            await asyncio.sleep(0.05)
+        assert job.status == "cancelled"
+
+        status, _ = await _request(port, "GET", f"/jobs/{job.id}/result")
+        assert status == 409
+
+    _run(scenario)
+
+
+def test_worker_cancellation_goes_through_the_budget():
+    # Côté processus de travail, sans pool : ensemble partagé remplacé par un set local
+    cancelled = set()
+    service._init_worker(queue.SimpleQueue(), cancelled)
+
+    timer = threading.Timer(0.05, cancelled.add, ("running",))
+    timer.start()
+    res = service._run_job("running", INFINITE, max_states=10 ** 8)
+    timer.join()
+    assert res["stopped_by"] == res["analysis"]["stopped_by"] == "cancelled"
+    assert "dot" not in res
+
+    cancelled.add("queued")
+    res = service._run_job("queued", INFINITE, max_states=10 ** 8)
+    # Annulé avant de démarrer : arrêt au premier contrôle, sur le marquage initial
+    assert res["stopped_by"] == "cancelled" and res["analysis"]["num_states"] == 1
+
+
+def test_time_limit_stops_job_with_partial_result():
+    async def scenario(service, port):
+        job, _ = service.submit(INFINITE, max_states=10 ** 8)
+        while job.status not in ("cancelled", "done", "failed"):
+            await asyncio.sleep(0.05)
+        assert job.status == "done"
+
+        status, data = await _request(port, "GET", f"/jobs/{job.id}/result")
+        analysis = json.loads(data)["analysis"]
+        assert analysis["stopped_by"] == "deadline" and analysis["truncated"] is True
+        assert 0 < analysis["num_states"] < 10 ** 8
+
+    _run(scenario, time_limit=0.5)
+
+
+def test_invalid_requests():
+    async def scenario(service, port):
+        status, _ = await _request(port, "POST", "/jobs", {"net": {"places": []}})
+        assert status == 400
+        status, _ = await _request(port, "GET", "/jobs/999")
+        assert status == 404
+        status, data = await _request(port, "GET", "/health")
+        assert status == 200 and json.loads(data)["status"] == "ok"
+
+    _run(scenario)
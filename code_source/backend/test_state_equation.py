@@ -0,0 +1,124 @@
+"""
+Tests de l'équation d'état en nombres entiers (backend/state_equation.py).
+
+Vérifie que :
+- le solveur en nombres entiers trouve l'optimum (et pas celui de la relaxation continue),
+- une cible exclue par l'équation est déclarée inaccessible sans exploration,
+- une cible que l'équation n'exclut pas est cherchée, et la trace trouvée la rejoue,
+- les bornes de places majorent les jetons observés (None si non bornée),
+- l'élagage de find_path par l'équation coupe une recherche sinon infinie.
+
+À lancer avec pytest.
+"""
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc
+from state_equation import StateEquation, _branch_and_bound, find_marking
+
+
+def _mutex():
+    """
+    Deux processus Idle -> Busy -> Idle qui partagent un verrou Lock (1 jeton).
+    """
+    net = PetriNet()
+    net.add_place(Place("Lock", "Lock", 1))
+    for i in (1, 2):
+        net.add_place(Place(f"Idle{i}", f"Idle{i}", 1))
+        net.add_place(Place(f"Busy{i}", f"Busy{i}", 0))
+        net.add_transition(Transition(f"Enter{i}", f"Enter{i}"))
+        net.add_transition(Transition(f"Leave{i}", f"Leave{i}"))
+        for src, dst in ((f"Idle{i}", f"Enter{i}"), ("Lock", f"Enter{i}"), (f"Enter{i}", f"Busy{i}"),
+                         (f"Busy{i}", f"Leave{i}"), (f"Leave{i}", f"Idle{i}"), (f"Leave{i}", "Lock")):
+            net.add_arc(Arc(src, dst))
+    return net
+
+
+def _producer():
+    """
+    T1 remplit P1 sans fin ; T2 échange 2 jetons de P1 contre 1 jeton de P2.
+    """
+    net = PetriNet()
+    net.add_place(Place("P1", "P1", 0))
+    net.add_place(Place("P2", "P2", 0))
+    net.add_transition(Transition("T1", "T1"))
+    net.add_transition(Transition("T2", "T2"))
+    net.add_arc(Arc("T1", "P1"))
+    net.add_arc(Arc("P1", "T2", 2))
+    net.add_arc(Arc("T2", "P2"))
+    return net
+
+
+def test_branch_and_bound_finds_integer_optimum():
+    # max x + y  sous  2x + 2y <= 3 : 1.5 en continu, 1 en entiers
+    status, value, x = _branch_and_bound([({0: 2, 1: 2}, "<=", 3)], 2, [1, 1], 100)
+    assert (status, value) == ("optimal", 1)
+    assert sum(x) == 1
+
+    # 2x = 3 n'a pas de solution entière
+    assert _branch_and_bound([({0: 2}, "==", 3)], 1, None, 100)[0] == "infeasible"
+    assert _branch_and_bound([({0: 1}, ">=", 1)], 1, [1], 100)[0] == "unbounded"
+
+
+def test_mutual_exclusion_is_proved_without_exploration():
+    net = _mutex()
+    equation = StateEquation(net)
+    assert equation.check({"Busy1": 1, "Busy2": 1})["feasible"] is False
+
+    res = find_marking(net, {"Busy1": 1, "Busy2": 1})
+    assert res["found"] is False
+    assert res["method"] == "state_equation"
+    assert res["states_explored"] == 0
+
+
+def test_feasible_target_is_searched():
+    net = _mutex()
+    equation = StateEquation(net)
+    check = equation.check({"Busy2": 1})
+    assert check["feasible"] is True
+    assert check["firing_counts"] == {"Enter2": 1}
+
+    res = find_marking(net, {"Busy2": 1, "Idle1": 1})
+    assert res["method"] == "search"
+    assert res["trace"] == ["Enter2"]
+
+    # Couverture : au moins 3 jetons en P2
+    res = find_marking(_producer(), {"P2": 3}, cover=True)
+    m = _producer().initial_marking()
+    for tid in res["trace"]:
+        m = _producer().fire(tid, m)
+    assert m["P2"] >= 3
+
+
+def test_bounds():
+    net = _mutex()
+    bounds = StateEquation(net).bounds()
+    observed = net.analyze_reachability()["max_tokens"]
+    assert all(bounds[pid] >= observed[pid] for pid in observed)
+    assert bounds["Lock"] == 1 and bounds["Busy1"] == 1
+
+    assert StateEquation(_producer()).bounds() == {"P1": None, "P2": None}
+    with pytest.raises(ValueError):
+        StateEquation(net).upper_bound("Unknown")
+
+
+def test_prune_cuts_infinite_search():
+    """
+    T1 met 2 jetons dans P1, T2 en retire 2 : P1 reste pair, la cible P1 = 1 est
+    inaccessible. L'élagage par défaut (place par place) ne le voit pas et la recherche
+    s'épuise sur un espace infini ; l'équation d'état l'exclut dès le marquage initial.
+    """
+    net = PetriNet()
+    net.add_place(Place("P1", "P1", 0))
+    net.add_place(Place("P2", "P2", 0))
+    net.add_transition(Transition("T1", "T1"))
+    net.add_transition(Transition("T2", "T2"))
+    net.add_arc(Arc("T1", "P1", 2))
+    net.add_arc(Arc("P1", "T2", 2))
+    net.add_arc(Arc("T2", "P2"))
+
+    target = {"P1": 1}
+    assert net.find_path(target, max_states=300)["truncated"] is True
+
+    res = net.find_path(target, max_states=300, prune=StateEquation(net).prune(target))
+    assert (res["found"], res["truncated"], res["states_explored"]) == (False, False, 1)
@@ -0,0 +1,64 @@
+"""
+Tests de l'exploration sweep-line (backend/sweepline.py).
+
+Vérifie que :
+- la mesure dérivée de la structure repose sur les places monotones,
+- le nombre d'états, d'arêtes et les deadlocks sont ceux de l'exploration complète,
+  avec moins d'états gardés en mémoire,
+- une mesure non monotone est refusée.
+
+À lancer avec pytest.
+"""
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc
+from sweepline import derive_progress_measure, explore_sweepline
+
+
+def _budget_net(budget=20):
+    """
+    Deux processus Idle -> Busy -> Idle ; chaque démarrage consomme un jeton de Budget
+    et incrémente Done. Deadlock quand le budget est épuisé et les processus au repos.
+    """
+    net = PetriNet()
+    net.add_place(Place("Budget", "Budget", budget))
+    net.add_place(Place("Done", "Done", 0))
+    for k in ("1", "2"):
+        net.add_place(Place("Idle" + k, "Idle" + k, 1))
+        net.add_place(Place("Busy" + k, "Busy" + k, 0))
+        net.add_transition(Transition("Start" + k, "Start" + k))
+        net.add_transition(Transition("Stop" + k, "Stop" + k))
+        net.add_arc(Arc("Idle" + k, "Start" + k, 1))
+        net.add_arc(Arc("Budget", "Start" + k, 1))
+        net.add_arc(Arc("Start" + k, "Busy" + k, 1))
+        net.add_arc(Arc("Start" + k, "Done", 1))
+        net.add_arc(Arc("Busy" + k, "Stop" + k, 1))
+        net.add_arc(Arc("Stop" + k, "Idle" + k, 1))
+    return net
+
+
+def test_derived_measure_uses_monotone_places():
+    assert derive_progress_measure(_budget_net()) == {"Budget": -1, "Done": 1}
+
+
+@pytest.mark.parametrize("measure", [None, {"Done": 1}, "Done", lambda m: m["Done"]])
+def test_sweepline_counts_are_exact_with_less_memory(measure):
+    net = _budget_net()
+    full = net.reachability_bfs(max_states=100000)
+    res = explore_sweepline(net, measure=measure)
+
+    assert res["truncated"] is False
+    assert res["states"] == len(full["states"])
+    assert res["edges"] == len(full["edges"])
+    assert sorted(map(sorted, (d.items() for d in res["deadlocks"]))) == \
+        sorted(map(sorted, (full["states"][i].items() for i in full["deadlocks"])))
+    assert res["peak_stored"] < res["states"] // 4
+
+
+def test_non_monotone_measure_is_rejected():
+    net = _budget_net()
+    with pytest.raises(ValueError):
+        explore_sweepline(net, measure={"Busy1": 1})
+    with pytest.raises(ValueError):
+        explore_sweepline(net, measure="Busy1 - Done")
@@ -0,0 +1,126 @@
+"""
+Tests de la simulation temporisée (backend/timed.py).
+
+Vérifie que :
+- sur un cycle à délais fixes, débit, temps de cycle et occupation sont exacts,
+- la mémoire d'activation annule l'échéance d'une transition désactivée,
+- les événements simultanés sont tirés par priorité et revérifiés,
+- les délais sur intervalle sont reproductibles (graine) et bornés,
+- les délais passent par to_dict / load_petri_from_dict,
+- une boucle sans délai (réseau non temporisé) lève une erreur au lieu de boucler sans fin.
+
+À lancer avec pytest.
+"""
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc, load_petri_from_dict
+from timed import TimedSimulation, simulate_timed
+
+
+def _cycle(d1=2.0, d2=3.0, max2=None):
+    """
+    P1 --T1 (d1)--> P2 --T2 (d2)--> P1, un jeton.
+    """
+    net = PetriNet()
+    net.add_place(Place("P1", "P1", 1))
+    net.add_place(Place("P2", "P2", 0))
+    net.add_transition(Transition("T1", "T1", delay=d1))
+    net.add_transition(Transition("T2", "T2", delay=d2, max_delay=max2))
+    net.add_arc(Arc("P1", "T1"))
+    net.add_arc(Arc("T1", "P2"))
+    net.add_arc(Arc("P2", "T2"))
+    net.add_arc(Arc("T2", "P1"))
+    return net
+
+
+def test_deterministic_cycle_statistics():
+    stats = simulate_timed(_cycle(), until=1000)
+
+    assert stats["time"] == 1000
+    assert stats["firings"] == {"T1": 200, "T2": 200}
+    assert stats["throughput"]["T1"] == pytest.approx(0.2)
+    assert stats["cycle_time"]["T2"] == pytest.approx(5.0)
+    assert stats["occupancy"]["P1"] == pytest.approx(0.4)
+    assert stats["occupancy"]["P2"] == pytest.approx(0.6)
+    assert stats["deadlocked"] is False
+
+
+def test_enabling_memory_resets_disabled_transitions():
+    """
+    P (1 jeton) est disputée par Fast (1) et Slow (5) ; Back (1) rend le jeton.
+    Slow est désactivée à chaque tir de Fast : son échéance repart de zéro, elle ne tire jamais.
+    """
+    net = PetriNet()
+    for pid, tokens in (("P", 1), ("Q", 0), ("R", 0)):
+        net.add_place(Place(pid, pid, tokens))
+    net.add_transition(Transition("Fast", "Fast", delay=1))
+    net.add_transition(Transition("Slow", "Slow", delay=5))
+    net.add_transition(Transition("Back", "Back", delay=1))
+    net.add_arc(Arc("P", "Fast"))
+    net.add_arc(Arc("Fast", "Q"))
+    net.add_arc(Arc("P", "Slow"))
+    net.add_arc(Arc("Slow", "R"))
+    net.add_arc(Arc("Q", "Back"))
+    net.add_arc(Arc("Back", "P"))
+
+    stats = simulate_timed(net, until=100)
+    assert stats["firings"]["Slow"] == 0
+    assert stats["firings"]["Fast"] == 50
+
+
+def test_simultaneous_events_fire_by_priority():
+    net = PetriNet()
+    net.add_place(Place("P", "P", 1))
+    net.add_place(Place("Out", "Out", 0))
+    net.add_transition(Transition("A", "A", priority=0, delay=1))
+    net.add_transition(Transition("B", "B", priority=5, delay=1))
+    for tid in ("A", "B"):
+        net.add_arc(Arc("P", tid))
+        net.add_arc(Arc(tid, "Out"))
+
+    sim = TimedSimulation(net)
+    assert sim.run(until=10) == 1
+    assert sim.stats()["firings"] == {"A": 0, "B": 1}
+    assert sim.deadlocked
+    assert sim.now == 10
+
+
+def test_interval_delays_are_seeded_and_bounded():
+    net = _cycle(d1=1.0, d2=1.0, max2=3.0)
+    a = simulate_timed(net, max_events=2000, seed=7)
+    b = simulate_timed(net, max_events=2000, seed=7)
+    assert a == b
+    assert a["events"] == 2000
+    # Un cycle dure entre 2 et 4
+    assert 2.0 < a["cycle_time"]["T1"] < 4.0
+
+    with pytest.raises(ValueError):
+        Transition("T", "T", delay=2, max_delay=1)
+    with pytest.raises(ValueError):
+        TimedSimulation(net).run()
+
+
+def test_delays_round_trip_through_dict():
+    data = _cycle(max2=4.0).to_dict()
+    assert data["transitions"][1] == {"id": "T2", "name": "T2", "priority": 0, "delay": 3.0, "max_delay": 4.0}
+    net = load_petri_from_dict(data)
+    assert net.transitions["T2"].max_delay == 4.0
+    assert net.transitions["T1"].delay == 2.0
+
+
+def test_zero_delay_loop_is_rejected_instead_of_hanging():
+    # P -> T -> P sans délai : T retire à la même date indéfiniment
+    net = PetriNet()
+    net.add_place(Place("P", "P", 1))
+    net.add_transition(Transition("T", "T"))
+    net.add_arc(Arc("P", "T"))
+    net.add_arc(Arc("T", "P"))
+
+    with pytest.raises(ValueError):
+        simulate_timed(net, until=10.0)
+    with pytest.raises(ValueError):
+        TimedSimulation(net).run(until=10.0, max_events_per_date=50)
+
+    # Avec max_events seul, la limite est atteinte avant
+    assert TimedSimulation(net).run(max_events=30) == 30
@@ -0,0 +1,116 @@
+"""
+Tests du dépliage (backend/unfolding.py).
+
+Vérifie que :
+- le deadlock des philosophes est trouvé sur le préfixe, avec une trace valide,
+- un réseau sans deadlock (exclusion mutuelle) est reconnu comme tel,
+- pour des processus indépendants le préfixe reste linéaire (le graphe est exponentiel),
+- les réseaux non saufs sont refusés.
+
+À lancer avec pytest.
+"""
+
+import pytest
+
+from petri import PetriNet, Place, Transition, Arc
+from unfolding import Unfolding, unfold_deadlock
+
+
+def _philosophers(n=3):
+    """
+    n philosophes ; chacun prend la fourchette gauche puis la droite, mange, les repose.
+    """
+    net = PetriNet()
+    for i in range(n):
+        net.add_place(Place(f"F{i}", f"F{i}", 1))
+        net.add_place(Place(f"Think{i}", f"Think{i}", 1))
+        net.add_place(Place(f"Left{i}", f"Left{i}", 0))
+        net.add_place(Place(f"Eat{i}", f"Eat{i}", 0))
+    for i in range(n):
+        right = f"F{(i + 1) % n}"
+        for tid in (f"TakeL{i}", f"TakeR{i}", f"Release{i}"):
+            net.add_transition(Transition(tid, tid))
+        net.add_arc(Arc(f"Think{i}", f"TakeL{i}"))
+        net.add_arc(Arc(f"F{i}", f"TakeL{i}"))
+        net.add_arc(Arc(f"TakeL{i}", f"Left{i}"))
+        net.add_arc(Arc(f"Left{i}", f"TakeR{i}"))
+        net.add_arc(Arc(right, f"TakeR{i}"))
+        net.add_arc(Arc(f"TakeR{i}", f"Eat{i}"))
+        net.add_arc(Arc(f"Eat{i}", f"Release{i}"))
+        net.add_arc(Arc(f"Release{i}", f"Think{i}"))
+        net.add_arc(Arc(f"Release{i}", f"F{i}"))
+        net.add_arc(Arc(f"Release{i}", right))
+    return net
+
+
+def _mutex():
+    net = PetriNet()
+    net.add_place(Place("Lock", "Lock", 1))
+    for k in ("1", "2"):
+        net.add_place(Place("Idle" + k, "Idle" + k, 1))
+        net.add_place(Place("Crit" + k, "Crit" + k, 0))
+        net.add_transition(Transition("Enter" + k, "Enter" + k))
+        net.add_transition(Transition("Leave" + k, "Leave" + k))
+        net.add_arc(Arc("Idle" + k, "Enter" + k))
+        net.add_arc(Arc("Lock", "Enter" + k))
+        net.add_arc(Arc("Enter" + k, "Crit" + k))
+        net.add_arc(Arc("Crit" + k, "Leave" + k))
+        net.add_arc(Arc("Leave" + k, "Idle" + k))
+        net.add_arc(Arc("Leave" + k, "Lock"))
+    return net
+
+
+def _independent(n):
+    """
+    n processus A -> B indépendants, puis chacun s'arrête : 2^n marquages.
+    """
+    net = PetriNet()
+    for i in range(n):
+        net.add_place(Place(f"A{i}", f"A{i}", 1))
+        net.add_place(Place(f"B{i}", f"B{i}", 0))
+        net.add_transition(Transition(f"T{i}", f"T{i}"))
+        net.add_arc(Arc(f"A{i}", f"T{i}"))
+        net.add_arc(Arc(f"T{i}", f"B{i}"))
+    return net
+
+
+def test_philosophers_deadlock_found_on_prefix():
+    net = _philosophers(3)
+    res = unfold_deadlock(net)
+    assert res["deadlock"] is True
+    assert res["cutoffs"] > 0
+
+    m = net.initial_marking()
+    for tid in res["trace"]:
+        assert net.enabled(tid, m)
+        m = net.fire(tid, m)
+    assert m == res["deadlock_marking"]
+    assert net.step(m) == []
+
+
+def test_mutex_has_no_deadlock():
+    res = unfold_deadlock(_mutex())
+    assert res["deadlock"] is False
+    assert res["truncated"] is False
+
+
+def test_prefix_is_linear_for_independent_processes():
+    net = _independent(12)
+    unfolding = Unfolding(net)
+    assert unfolding.summary()["events"] == 12
+    res = unfold_deadlock(net)
+    assert res["deadlock"] is True
+    assert res["deadlock_marking"] == {**{f"A{i}": 0 for i in range(12)}, **{f"B{i}": 1 for i in range(12)}}
+
+
+def test_non_safe_nets_are_rejected():
+    net = _mutex()
+    net.set_initial_tokens("Lock", 2)
+    with pytest.raises(ValueError):
+        Unfolding(net)
+
+    net = _mutex()
+    net.add_place(Place("Extra", "Extra", 0))
+    net.add_arc(Arc("Enter1", "Extra"))
+    with pytest.raises(ValueError):
+        Unfolding(net)
@@ -0,0 +1,245 @@
+"""
+Simulation à événements discrets d'un réseau de Petri temporisé.
+
+Chaque transition a un délai de tir (Transition.delay, ou un intervalle
+[delay, max_delay] dans lequel le délai est tiré uniformément) :
+- quand une transition devient franchissable, on tire son délai et on inscrit son
+  tir à la date now + délai dans un calendrier (tas binaire) ;
+- sémantique à mémoire d'activation (enabling memory) : tant qu'elle reste
+  continûment franchissable, son échéance est conservée ; si un autre tir la
+  désactive, l'échéance est annulée et un nouveau délai sera tiré à la prochaine
+  activation ;
+- le tir est atomique à l'échéance (jetons consommés et produits à cet instant), puis
+  la transition, si elle est encore franchissable, repart avec un nouveau délai ;
+- les événements de même date sont traités en lot : l'horloge n'avance qu'une fois,
+  ils sont tirés par priorité décroissante (puis ordre d'inscription), et chacun est
+  revérifié au moment de son tir (un tir du lot peut en désactiver un autre).
+
+Un réseau dont un cycle de transitions ne fait pas avancer l'horloge (délais nuls,
+le délai par défaut) tirerait indéfiniment à la même date : au-delà de
+MAX_EVENTS_PER_DATE tirs à une même date, run lève ValueError (comportement Zénon)
+au lieu de boucler sans fin.
+
+Les annulations sont paresseuses : chaque transition a un numéro de génération,
+une entrée du calendrier dont la génération est périmée est simplement ignorée.
+
+Statistiques sur le temps simulé : débit et temps de cycle par transition,
+occupation moyenne et maximale des places (intégrale des jetons dans le temps, mise
+à jour seulement quand une place change).
+"""
+
+import heapq
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from petri import PetriNet
+
+
+MAX_EVENTS_PER_DATE = 100000
+
+class TimedSimulation:
+    def __init__(
+        self,
+        net: PetriNet,
+        marking: Optional[Dict[str, int]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.rng = random.Random(seed)
+        tables = net.arc_tables()
+        self.place_ids: List[str] = net.place_ids()
+        self.transition_ids: List[str] = net.transition_ids()
+        n_trans = len(self.transition_ids)
+
+        self._pre: List[List[Tuple[int, int]]] = []
+        self._delta: List[List[Tuple[int, int]]] = []
+        for t in range(n_trans):
+            lo, hi = tables.pre_start[t], tables.pre_start[t + 1]
+            pairs = list(zip(tables.pre_place[lo:hi], tables.pre_weight[lo:hi]))
+            self._pre.append(pairs)
+            d: Dict[int, int] = {}
+            for i, w in pairs:
+                d[i] = d.get(i, 0) - w
+            lo, hi = tables.post_start[t], tables.post_start[t + 1]
+            for i, w in zip(tables.post_place[lo:hi], tables.post_weight[lo:hi]):
+                d[i] = d.get(i, 0) + w
+            self._delta.append([(i, v) for i, v in d.items() if v != 0])
+
+        consumers: List[List[int]] = [[] for _ in self.place_ids]
+        for t, pairs in enumerate(self._pre):
+            for i, _ in pairs:
+                consumers[i].append(t)
+        self._affected = [sorted({u for i, _ in d for u in consumers[i]}) for d in self._delta]
+
+        transitions = [net.transitions[tid] for tid in self.transition_ids]
+        self._delay = [(tr.delay, tr.max_delay) for tr in transitions]
+        self._priority = [-tr.priority for tr in transitions]
+
+        source = net.initial_marking() if marking is None else marking
+        self._marking = [int(source.get(pid, 0)) for pid in self.place_ids]
+
+        self.now = 0.0
+        self.events = 0
+        self._seq = 0
+        self._calendar: List[Tuple[float, int, int, int, int]] = []   # (date, -priorité, ordre, t, génération)
+        self._generation = [0] * n_trans
+        self._scheduled = [False] * n_trans
+
+        # Statistiques
+        self._firings = [0] * n_trans
+        self._first_fire: List[Optional[float]] = [None] * n_trans
+        self._last_fire: List[Optional[float]] = [None] * n_trans
+        self._area = [0.0] * len(self.place_ids)       # intégrale des jetons jusqu'à _since
+        self._since = [0.0] * len(self.place_ids)
+        self._max_tokens = list(self._marking)
+
+        for t in range(n_trans):
+            if self._is_enabled(t):
+                self._schedule(t)
+
+    def _is_enabled(self, t: int) -> bool:
+        m = self._marking
+        for i, w in self._pre[t]:
+            if m[i] < w:
+                return False
+        return True
+
+    def _schedule(self, t: int) -> None:
+        low, high = self._delay[t]
+        delay = low if high is None else self.rng.uniform(low, high)
+        self._seq += 1
+        heapq.heappush(self._calendar, (self.now + delay, self._priority[t], self._seq, t, self._generation[t]))
+        self._scheduled[t] = True
+
+    def _cancel(self, t: int) -> None:
+        self._generation[t] += 1
+        self._scheduled[t] = False
+
+    def _fire(self, t: int) -> None:
+        m = self._marking
+        now = self.now
+        area, since, max_tokens = self._area, self._since, self._max_tokens
+        for i, d in self._delta[t]:
+            area[i] += m[i] * (now - since[i])
+            since[i] = now
+            m[i] += d
+            if m[i] > max_tokens[i]:
+                max_tokens[i] = m[i]
+
+        self._firings[t] += 1
+        if self._first_fire[t] is None:
+            self._first_fire[t] = now
+        self._last_fire[t] = now
+        self.events += 1
+
+        # L'échéance de t est consommée ; mémoire d'activation pour les autres
+        self._scheduled[t] = False
+        self._generation[t] += 1
+        for u in self._affected[t]:
+            if u == t:
+                continue
+            enabled = self._is_enabled(u)
+            if enabled and not self._scheduled[u]:
+                self._schedule(u)
+            elif not enabled and self._scheduled[u]:
+                self._cancel(u)
+        if self._is_enabled(t):
+            self._schedule(t)
+
+    """
+    Fait avancer la simulation jusqu'à la date until (None = sans limite de temps)
+    ou jusqu'à max_events tirs. S'arrête avant si plus rien n'est inscrit au
+    calendrier (deadlock) ; avec until, l'horloge est alors portée à until.
+    Lève ValueError si plus de max_events_per_date tirs ont lieu à une même date
+    (boucle de transitions sans délai). Renvoie le nombre de tirs effectués.
+    """
+
+    def run(
+        self,
+        until: Optional[float] = None,
+        max_events: Optional[int] = None,
+        max_events_per_date: int = MAX_EVENTS_PER_DATE,
+    ) -> int:
+        if until is None and max_events is None:
+            raise ValueError("Il faut une limite : until et/ou max_events")
+        if max_events_per_date <= 0:
+            raise ValueError("max_events_per_date doit être > 0")
+        calendar = self._calendar
+        generation = self._generation
+        start = self.events
+
+        while calendar:
+            date = calendar[0][0]
+            if until is not None and date > until:
+                break
+            if max_events is not None and self.events - start >= max_events:
+                return self.events - start
+            self.now = date
+            # Lot des événements de même date
+            batch_start = self.events
+            while calendar and calendar[0][0] == date:
+                _, _, _, t, gen = heapq.heappop(calendar)
+                if gen != generation[t]:
+                    continue          # échéance annulée
+                if not self._is_enabled(t):
+                    self._cancel(t)   # désactivée par un tir du même lot
+                    continue
+                self._fire(t)
+                if max_events is not None and self.events - start >= max_events:
+                    break
+                if self.events - batch_start >= max_events_per_date:
+                    raise ValueError(
+                        f"Comportement Zénon : plus de {max_events_per_date} tirs à la date {date} "
+                        f"(boucle de transitions sans délai, dernière tirée : {self.transition_ids[t]})"
+                    )
+
+        if until is not None and until > self.now:
+            self.now = until
+        return self.events - start
+
+    #True si aucune transition n'est inscrite au calendrier.
+    @property
+    def deadlocked(self) -> bool:
+        return not any(self._scheduled)
+
+    @property
+    def marking(self) -> Dict[str, int]:
+        return dict(zip(self.place_ids, self._marking))
+
+    #Statistiques depuis la date 0.
+    def stats(self) -> Dict[str, Any]:
+        now = self.now
+        occupancy: Dict[str, float] = {}
+        for i, pid in enumerate(self.place_ids):
+            area = self._area[i] + self._marking[i] * (now - self._since[i])
+            occupancy[pid] = area / now if now > 0 else float(self._marking[i])
+
+        throughput: Dict[str, float] = {}
+        cycle_time: Dict[str, Optional[float]] = {}
+        for t, tid in enumerate(self.transition_ids):
+            n = self._firings[t]
+            throughput[tid] = n / now if now > 0 else 0.0
+            # Temps moyen entre deux tirs successifs
+            cycle_time[tid] = (self._last_fire[t] - self._first_fire[t]) / (n - 1) if n > 1 else None
+
+        return {
+            "time": now,
+            "events": self.events,
+            "firings": dict(zip(self.transition_ids, self._firings)),
+            "throughput": throughput,
+            "cycle_time": cycle_time,
+            "occupancy": occupancy,
+            "max_tokens": dict(zip(self.place_ids, self._max_tokens)),
+            "deadlocked": self.deadlocked,
+        }
+
+
+#Simule jusqu'à until (et/ou max_events) et renvoie les statistiques.
+def simulate_timed(
+    net: PetriNet,
+    until: Optional[float] = None,
+    max_events: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    sim = TimedSimulation(net, seed=seed)
+    sim.run(until=until, max_events=max_events)
+    return sim.stats()
@@ -0,0 +1,304 @@
+"""
+Dépliage (unfolding) d'un réseau sauf : préfixe fini complet du processus arborescent.
+
+Le graphe d'accessibilité énumère tous les entrelacements : n processus indépendants
+donnent 2^n marquages. Le dépliage représente au contraire la concurrence telle quelle :
+- une condition = un jeton dans une place, produit par un événement (ou initial),
+- un événement = un tir d'une transition, qui consomme un ensemble de conditions
+  deux à deux concurrentes (co-ensemble) et produit ses propres conditions.
+Pour n processus indépendants, le préfixe a seulement O(n) événements.
+
+Construction (Esparza, Römer, Vogler) :
+- les extensions possibles sont rangées dans une file de priorité selon l'ordre adéquat
+  total de ERV sur les configurations locales [e] : taille, puis vecteur de Parikh
+  (mot trié des transitions), puis forme normale de Foata ;
+- un événement est un cut-off si le marquage Mark([e]) a déjà été atteint par une
+  configuration plus petite : on ne prolonge pas le préfixe après lui ;
+- la relation de concurrence (co) entre conditions est tenue à jour à chaque ajout,
+  les extensions possibles sont cherchées seulement autour des nouvelles conditions.
+
+La recherche de deadlock se fait ensuite sur le préfixe (find_deadlock).
+
+Limites : réseaux saufs seulement (au plus un jeton par place, arcs de poids 1,
+transitions avec au moins une place d'entrée). Un réseau qui se révèle non sauf
+pendant le dépliage lève une ValueError.
+"""
+
+import heapq
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from petri import PetriNet
+
+
+class Unfolding:
+    def __init__(self, net: PetriNet, max_events: Optional[int] = None) -> None:
+        cn = net.compile()
+        self.cn = cn
+        self.place_order = cn.place_order
+        self.transition_ids = cn.transition_ids
+        n_trans = len(cn.transition_ids)
+
+        # Présets / postsets des transitions (indices de places dans place_order)
+        self.t_pre: List[Tuple[int, ...]] = []
+        self.t_post: List[Tuple[int, ...]] = []
+        for tid in cn.transition_ids:
+            for arc in net.incoming_arcs(tid) + net.outgoing_arcs(tid):
+                if arc.weight != 1:
+                    raise ValueError(f"Dépliage : arc de poids {arc.weight} ({arc.source_id} -> {arc.target_id}), réseau sauf attendu")
+            pre = tuple(sorted(cn.place_index[a.source_id] for a in net.incoming_arcs(tid)))
+            if not pre:
+                raise ValueError(f"Dépliage : la transition {tid} n'a pas de place d'entrée")
+            self.t_pre.append(pre)
+            self.t_post.append(tuple(sorted(cn.place_index[a.target_id] for a in net.outgoing_arcs(tid))))
+        self.consumers: List[List[int]] = [[] for _ in self.place_order]
+        for t in range(n_trans):
+            for p in self.t_pre[t]:
+                self.consumers[p].append(t)
+
+        self.m0 = tuple(net.marking_key(net.initial_marking()))
+        if any(v > 1 for v in self.m0):
+            raise ValueError("Dépliage : marquage initial non sauf (plus d'un jeton dans une place)")
+
+        # Conditions
+        self.cond_place: List[int] = []
+        self.cond_event: List[int] = []            # événement producteur (-1 = initiale)
+        self.co: List[Set[int]] = []               # conditions concurrentes
+        self.cond_consumers: List[List[int]] = []  # événements du préfixe qui la consomment
+
+        # Événements (extensions possibles comprises ; in_prefix dit s'ils ont été ajoutés)
+        self.ev_trans: List[int] = []
+        self.ev_pre: List[Tuple[int, ...]] = []
+        self.ev_post: List[Tuple[int, ...]] = []
+        self.ev_config: List[int] = []             # configuration locale (ensemble de bits)
+        self.ev_depth: List[int] = []
+        self.in_prefix: List[bool] = []
+        self.cutoff: List[bool] = []
+
+        self.initial_conditions: List[int] = []
+        self.truncated = False
+        self._generated: Set[Tuple[int, Tuple[int, ...]]] = set()
+        self._queue: List[Tuple[Any, int]] = []
+
+        self._build(max_events)
+
+    # Construction du préfixe
+
+    def _build(self, max_events: Optional[int]) -> None:
+        for p, tokens in enumerate(self.m0):
+            if tokens:
+                self.initial_conditions.append(self._new_condition(p, -1))
+        for c in self.initial_conditions:
+            self.co[c] = set(self.initial_conditions) - {c}
+        self._extend_from(self.initial_conditions)
+
+        # Marquage -> premier événement qui l'atteint (-1 = configuration vide)
+        seen: Dict[Tuple[int, ...], int] = {self.m0: -1}
+        added = 0
+        while self._queue:
+            if max_events is not None and added >= max_events:
+                self.truncated = True
+                break
+            _, e = heapq.heappop(self._queue)
+            self.in_prefix[e] = True
+            added += 1
+            for c in self.ev_pre[e]:
+                self.cond_consumers[c].append(e)
+
+            marking = self._marking(self.ev_config[e])
+            is_cutoff = marking in seen
+            self.cutoff[e] = is_cutoff
+            if not is_cutoff:
+                seen[marking] = e
+
+            post = [self._new_condition(p, e) for p in self.t_post[self.ev_trans[e]]]
+            self.ev_post[e] = tuple(post)
+            if is_cutoff:
+                continue
+
+            # Relation co des nouvelles conditions
+            common = set.intersection(*(self.co[c] for c in self.ev_pre[e]))
+            for c in post:
+                self.co[c] = (common | set(post)) - {c}
+                place = self.cond_place[c]
+                for d in self.co[c]:
+                    if self.cond_place[d] == place:
+                        raise ValueError(
+                            f"Dépliage : le réseau n'est pas sauf (deux jetons dans {self.place_order[place]})"
+                        )
+            for c in post:
+                for d in self.co[c]:
+                    self.co[d].add(c)
+
+            self._extend_from(post)
+
+    def _new_condition(self, place: int, event: int) -> int:
+        self.cond_place.append(place)
+        self.cond_event.append(event)
+        self.co.append(set())
+        self.cond_consumers.append([])
+        return len(self.cond_place) - 1
+
+    #Cherche les extensions possibles dont le préset contient une des conditions new.
+    def _extend_from(self, new: List[int]) -> None:
+        for c in new:
+            place = self.cond_place[c]
+            for t in self.consumers[place]:
+                others = [p for p in self.t_pre[t] if p != place]
+                candidates: Dict[int, List[int]] = {p: [] for p in others}
+                for d in self.co[c]:
+                    bucket = candidates.get(self.cond_place[d])
+                    if bucket is not None:
+                        bucket.append(d)
+                self._choose(t, others, candidates, [c])
+
+    def _choose(self, t: int, places: List[int], candidates: Dict[int, List[int]], chosen: List[int]) -> None:
+        if not places:
+            preset = tuple(sorted(chosen))
+            if (t, preset) not in self._generated:
+                self._generated.add((t, preset))
+                self._add_extension(t, preset)
+            return
+        for d in candidates[places[0]]:
+            if all(d in self.co[x] for x in chosen[1:]):
+                chosen.append(d)
+                self._choose(t, places[1:], candidates, chosen)
+                chosen.pop()
+
+    def _add_extension(self, t: int, preset: Tuple[int, ...]) -> None:
+        e = len(self.ev_trans)
+        config = 1 << e
+        depth = 1
+        for c in preset:
+            producer = self.cond_event[c]
+            if producer >= 0:
+                config |= self.ev_config[producer]
+                depth = max(depth, self.ev_depth[producer] + 1)
+        self.ev_trans.append(t)
+        self.ev_pre.append(preset)
+        self.ev_post.append(())
+        self.ev_config.append(config)
+        self.ev_depth.append(depth)
+        self.in_prefix.append(False)
+        self.cutoff.append(False)
+        heapq.heappush(self._queue, (self._erv_key(config), e))
+
+    def _events_of(self, config: int) -> List[int]:
+        events = []
+        while config:
+            low = config & -config
+            events.append(low.bit_length() - 1)
+            config ^= low
+        return events
+
+    #Clé de l'ordre ERV : (|C|, mot de Parikh trié, forme normale de Foata).
+    def _erv_key(self, config: int) -> Tuple[Any, ...]:
+        events = self._events_of(config)
+        levels: Dict[int, List[int]] = {}
+        for j in events:
+            levels.setdefault(self.ev_depth[j], []).append(self.ev_trans[j])
+        parikh = tuple(sorted(self.ev_trans[j] for j in events))
+        foata = tuple(tuple(sorted(levels[d])) for d in sorted(levels))
+        return (len(events), parikh, foata)
+
+    #Mark(C) = M0 + somme des variations des transitions de C.
+    def _marking(self, config: int) -> Tuple[int, ...]:
+        m = list(self.m0)
+        for j in self._events_of(config):
+            for i, d in self.cn.delta[self.ev_trans[j]]:
+                m[i] += d
+        return tuple(m)
+
+    # Statistiques / recherche de deadlock
+
+    def events(self) -> List[int]:
+        return [e for e, inside in enumerate(self.in_prefix) if inside]
+
+    def summary(self) -> Dict[str, Any]:
+        events = self.events()
+        return {
+            "events": len(events),
+            "conditions": len(self.cond_place),
+            "cutoffs": sum(1 for e in events if self.cutoff[e]),
+            "truncated": self.truncated,
+        }
+
+    """
+    Cherche une configuration du préfixe (sans cut-off) dont le marquage est mort.
+
+    Exploration par cuts, sans entrelacements : à chaque pas on prend le premier
+    événement activé et on distingue deux cas, « il est dans la configuration » (on le
+    tire) ou « il n'y sera pas » (on l'exclut ; il faudra alors qu'un événement en
+    conflit le désactive). Les événements cut-off sont exclus d'office : un marquage
+    où l'un d'eux reste activé n'est pas mort. Des événements concurrents sans conflit
+    ne sont donc jamais permutés.
+
+    Renvoie (marquage mort, séquence de tirs qui y mène) ou None.
+    """
+
+    def find_deadlock(self) -> Optional[Tuple[Dict[str, int], List[str]]]:
+        events = self.events()
+        conflicts: Dict[int, Set[int]] = {e: set() for e in events}
+        for e in events:
+            for c in self.ev_pre[e]:
+                conflicts[e].update(f for f in self.cond_consumers[c] if f != e)
+
+        start_excluded = frozenset(e for e in events if self.cutoff[e])
+        stack: List[Tuple[FrozenSet[int], FrozenSet[int], Tuple[int, ...]]] = [
+            (frozenset(self.initial_conditions), start_excluded, ())
+        ]
+        seen: Set[Tuple[FrozenSet[int], FrozenSet[int]]] = set()
+
+        while stack:
+            cut, excluded, fired = stack.pop()
+            if (cut, excluded) in seen:
+                continue
+            seen.add((cut, excluded))
+
+            enabled = sorted({
+                e for c in cut for e in self.cond_consumers[c]
+                if all(x in cut for x in self.ev_pre[e])
+            })
+            if not enabled:
+                places = {self.cond_place[c] for c in cut}
+                m = tuple(int(i in places) for i in range(len(self.place_order)))
+                # Toujours vrai sur un préfixe complet ; sur un préfixe tronqué des
+                # extensions non ajoutées peuvent encore être activées
+                if not self.cn.successors(m):
+                    return self.cn.to_marking(m), [self.transition_ids[self.ev_trans[e]] for e in fired]
+                continue
+
+            # Un événement exclu encore activé doit pouvoir être désactivé plus tard
+            if any(
+                e in excluded and all(f in excluded for f in conflicts[e])
+                for e in enabled
+            ):
+                continue
+            free = [e for e in enabled if e not in excluded]
+            if not free:
+                continue
+
+            e = free[0]
+            if any(f not in excluded for f in conflicts[e]):
+                stack.append((cut, excluded | {e}, fired))
+            stack.append(((cut - set(self.ev_pre[e])) | set(self.ev_post[e]), excluded, fired + (e,)))
+
+        return None
+
+
+"""
+Déplie le réseau et cherche un deadlock sur le préfixe.
+Renvoie le résumé du préfixe (events, conditions, cutoffs, truncated) avec :
+- deadlock : True / False (None si le préfixe est tronqué et qu'aucun deadlock n'a été trouvé),
+- deadlock_marking, trace : un marquage mort et une séquence de tirs qui y mène.
+"""
+
+
+def unfold_deadlock(net: PetriNet, max_events: Optional[int] = None) -> Dict[str, Any]:
+    unfolding = Unfolding(net, max_events=max_events)
+    res = unfolding.summary()
+    found = unfolding.find_deadlock()
+    if found is not None:
+        res.update(deadlock=True, deadlock_marking=found[0], trace=found[1])
+    else:
+        res.update(deadlock=None if unfolding.truncated else False, deadlock_marking=None, trace=None)
+    return res